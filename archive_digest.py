@@ -0,0 +1,151 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import asyncio
+import atomic_file
+import json
+from typing import Dict, List, Optional
+import discord
+import settings
+from logger import Logger
+from rest_scheduler import moderate
+
+log = Logger("DIGEST")
+
+# Discord's limits for a single message
+MAX_EMBEDS = 10
+MAX_EMBED_CHARS = 6000
+
+
+class ArchiveDigest:
+    """
+    Buffers archive embeds per channel and posts them as multi-embed messages.
+
+    A channel is flushed as soon as it holds `size` entries, and every buffer is flushed
+    every `interval` seconds. The buffer is written to disk on every change and an entry
+    is only dropped after its message was sent, so a restart can repeat an entry but never lose one.
+    """
+
+    def __init__(self, path: str, size: int = MAX_EMBEDS, interval: float = 300):
+        self.path = path
+        self.size = size
+        self.interval = interval
+
+        self.buffers: Dict[int, List[dict]] = {}
+        self.locks: Dict[int, asyncio.Lock] = {}
+        self.client: Optional[discord.Client] = None
+        self.timer: Optional[asyncio.Task] = None
+        self.flushing = set()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        except (OSError, ValueError) as e:
+            log.error(f"Could not read the archive digest from {self.path}: {e}")
+            data = {}
+
+        self.buffers = {int(channel_id): entries for channel_id, entries in data.items() if entries}
+        if self.buffers:
+            log.info(f"Restored {self.pending()} buffered archive entries")
+
+    def save(self):
+        atomic_file.write_json(self.path, {str(channel_id): entries for channel_id, entries in self.buffers.items()})
+
+    def pending(self) -> int:
+        return sum(len(entries) for entries in self.buffers.values())
+
+    def start(self, client: discord.Client):
+        """Starts the flush timer; restored entries go out on its first tick."""
+        self.client = client
+        if self.timer is None:
+            self.timer = asyncio.create_task(self._run())
+
+    async def _run(self):
+        await self.client.wait_until_ready()
+        while True:
+            await self.flush_all()
+            await asyncio.sleep(self.interval)
+
+    async def add(self, channel: discord.abc.Messageable, embed: discord.Embed):
+        """Buffers an archive embed for `channel`. A full batch is flushed in the background, not by the caller."""
+        entries = self.buffers.setdefault(channel.id, [])
+        entries.append(embed.to_dict())
+        self.save()
+
+        if len(entries) >= self.size:
+            task = asyncio.create_task(self._flush_logged(channel.id, channel))
+            self.flushing.add(task)
+            task.add_done_callback(self.flushing.discard)
+
+    async def _flush_logged(self, channel_id: int, channel: Optional[discord.abc.Messageable] = None):
+        try:
+            await self.flush(channel_id, channel)
+        except Exception as e:
+            # Left buffered, the timer tries again
+            log.error(f"Error flushing the archive digest of channel {channel_id}: {e!r}")
+
+    async def flush_all(self):
+        await asyncio.gather(*(self._flush_logged(channel_id) for channel_id in list(self.buffers)))
+
+    async def flush(self, channel_id: int, channel: Optional[discord.abc.Messageable] = None):
+        """Sends every buffered entry of a channel, at most 10 embeds (and 6000 characters) per message."""
+        lock = self.locks.setdefault(channel_id, asyncio.Lock())
+        async with lock:
+            entries = self.buffers.get(channel_id)
+            if not entries:
+                return
+
+            try:
+                if channel is None:
+                    channel = self.client.get_channel(channel_id)
+                    if channel is None:
+                        channel = await moderate("channel_fetch", lambda: self.client.fetch_channel(channel_id))
+
+                while entries:
+                    embeds = _batch(entries)
+                    await moderate("archive_digest", lambda: channel.send(embeds=embeds), bucket=f"channel:{channel_id}")
+                    # Entries added while sending were appended, so the sent ones are still at the front
+                    del entries[:len(embeds)]
+                    self.save()
+            except (discord.NotFound, discord.Forbidden) as e:
+                # The channel is gone or out of reach, retrying would fail on every flush forever
+                titles = ", ".join(entry.get("title", "?") for entry in entries)
+                log.error(f"Dropping {len(entries)} archive entries for channel {channel_id}: {e}. Entries: {titles}")
+
+            self.buffers.pop(channel_id, None)
+            self.save()
+
+    async def close(self):
+        """Stops the timer and background flushes. Anything still buffered is already on disk."""
+        tasks = [*self.flushing, *([self.timer] if self.timer else [])]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.timer = None
+
+
+def _batch(entries: List[dict]) -> List[discord.Embed]:
+    embeds, chars = [], 0
+    for entry in entries[:MAX_EMBEDS]:
+        embed = discord.Embed.from_dict(entry)
+        if embeds and chars + len(embed) > MAX_EMBED_CHARS:
+            break
+        embeds.append(embed)
+        chars += len(embed)
+    return embeds
+
+
+def _apply_settings(old, new):
+    digest.size = new.archive_digest_size
+    digest.interval = new.archive_digest_interval
+
+
+digest = ArchiveDigest(
+    settings.get().archive_digest_file,
+    size=settings.get().archive_digest_size,
+    interval=settings.get().archive_digest_interval
+)
+settings.subscribe(_apply_settings)
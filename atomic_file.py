@@ -0,0 +1,23 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import json
+import os
+from typing import Any, Optional
+
+# Blocking, call these from a worker thread when on the event loop
+
+
+def write_text(path: str, text: str):
+    """Replaces the file at `path` with `text`, creating its directory if needed."""
+    # Write to a temporary file first so a crash never leaves a half written file behind
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+def write_json(path: str, data: Any, indent: Optional[int] = None):
+    write_text(path, json.dumps(data, indent=indent))
@@ -0,0 +1 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
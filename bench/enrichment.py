@@ -0,0 +1,91 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+"""
+Runs the link enrichment worker pool against the local oEmbed stand-in.
+
+Submissions arrive open-loop at `--rate` per second, drawing links from a pool of `--unique`
+distinct tracks written in several equivalent forms, so the report shows how much the
+canonicalization, cache and in-flight sharing save next to the lookup latency.
+
+    $ python -m bench.enrichment --ops 500 --rate 50 --unique 100 --workers 4
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import settings
+from bench.mock_oembed import MockOEmbed, add_server_args
+
+# Equivalent ways people paste the same video
+LINK_FORMS = [
+    "https://www.youtube.com/watch?v={id}",
+    "https://youtu.be/{id}?si=share",
+    "youtube.com/watch?v={id}&utm_source=discord",
+    "https://m.youtube.com/watch?v={id}",
+]
+
+
+async def main(args):
+    server = MockOEmbed(args.latency_ms / 1000, args.failure_ratio, args.rate_limit, seed=args.seed)
+    runner = await server.start()
+    settings.swap(settings.Settings.from_env({
+        "LINK_ENRICHMENT": "true",
+        "ENRICHMENT_WORKERS": str(args.workers),
+        "ENRICHMENT_HOST_INTERVAL": str(args.host_interval),
+        "OEMBED_URL": f"http://127.0.0.1:{server.port}/oembed",
+    }))
+
+    from link_enrichment import enricher
+    rng = random.Random(args.seed)
+    latencies, failures = [], 0
+
+    async def submit(i):
+        nonlocal failures
+        link = rng.choice(LINK_FORMS).format(id=f"track{rng.randrange(args.unique)}")
+        if rng.random() < args.broken_ratio:
+            link = f"https://example.com/broken/{i}"
+        started = time.perf_counter()
+        result = await enricher.enrich(link)
+        latencies.append(time.perf_counter() - started)
+        failures += not result.ok
+
+    started = time.perf_counter()
+    tasks = []
+    for i in range(args.ops):
+        tasks.append(asyncio.create_task(submit(i)))
+        next_start = started + (i + 1) / args.rate
+        await asyncio.sleep(max(0.0, next_start - time.perf_counter()))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    await enricher.close()
+    await runner.cleanup()
+
+    latencies.sort()
+    lookups = sum(server.requests.values())
+    print(f"Enriched {args.ops} link(s) in {elapsed:.1f}s with {args.workers} worker(s)")
+    print(f"Latency: p50 {statistics.median(latencies) * 1000:.1f}ms, "
+          f"p99 {latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000:.1f}ms")
+    print(f"oEmbed requests: {lookups} ({lookups / args.ops:.2f} per link), {failures} failed lookup(s)")
+    for status, count in sorted(server.responses.items()):
+        print(f"  {status}: {count}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=500, help="Links to enrich")
+    parser.add_argument("--rate", type=float, default=50, help="Submissions per second")
+    parser.add_argument("--unique", type=int, default=100, help="Distinct tracks in the link pool")
+    parser.add_argument("--broken-ratio", type=float, default=0.05, help="Share of links that answer 404")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--host-interval", type=float, default=0.02, help="Seconds between requests to one host")
+    parser.add_argument("--seed", type=int, default=None)
+    add_server_args(parser)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,251 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+"""
+In-process stand-ins for the parts of discord.py the cogs touch.
+
+Every outbound REST call goes through `FakeRest.call`, which injects latency and 429s
+and counts calls per route, so the cogs can be driven without a token or network.
+"""
+
+import asyncio
+import itertools
+import random
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import discord
+
+_ids = itertools.count(10**17)
+
+
+def snowflake():
+    return next(_ids)
+
+
+class FakeRest:
+    """
+    Simulated Discord REST surface.
+
+    Args:
+        latency: Mean latency per call in seconds
+        jitter: Uniform +/- jitter added to the latency in seconds
+        rate_limit_ratio: Fraction of calls answered with a 429 first
+        retry_after: Seconds a 429 makes the caller wait before the retry, as discord.py does
+    """
+
+    def __init__(self, latency=0.05, jitter=0.02, rate_limit_ratio=0.0, retry_after=0.5, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.calls = Counter()
+        self.rate_limited = Counter()
+
+    def reset(self):
+        self.calls.clear()
+        self.rate_limited.clear()
+
+    @property
+    def total(self):
+        return sum(self.calls.values())
+
+    async def call(self, route):
+        self.calls[route] += 1
+        # discord.py retries 429s transparently, the caller only sees the extra wait
+        while self.random.random() < self.rate_limit_ratio:
+            self.rate_limited[route] += 1
+            await asyncio.sleep(self.retry_after)
+            self.calls[route] += 1
+        await asyncio.sleep(max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter)))
+
+
+class FakeUser:
+    def __init__(self, rest, user_id=None, name="user", bot=False):
+        self.rest = rest
+        self.id = user_id or snowflake()
+        self.name = name
+        self.display_name = name
+        self.global_name = name
+        self.bot = bot
+        self.avatar = None
+        self.mention = f"<@{self.id}>"
+
+    def __str__(self):
+        return self.name
+
+    async def send(self, content=None, **kwargs):
+        await self.rest.call("POST /users/@me/channels + POST /channels/{dm}/messages")
+        return FakeMessage(self.rest, content=content, embeds=_embeds(kwargs))
+
+
+class FakeMessage:
+    def __init__(self, rest, content="", author=None, channel=None, guild=None, embeds=None):
+        self.rest = rest
+        self.id = snowflake()
+        self.content = content or ""
+        self.author = author
+        self.channel = channel
+        self.guild = guild
+        self.embeds = embeds or []
+
+    async def reply(self, content=None, **kwargs):
+        await self.rest.call("POST /channels/{id}/messages")
+        return FakeMessage(self.rest, content=content, channel=self.channel, guild=self.guild, embeds=_embeds(kwargs))
+
+    async def edit(self, **kwargs):
+        await self.rest.call("PATCH /channels/{id}/messages/{id}")
+        if "embed" in kwargs:
+            self.embeds = _embeds(kwargs)
+        return self
+
+    async def delete(self):
+        await self.rest.call("DELETE /channels/{id}/messages/{id}")
+
+
+class FakeChannel:
+    def __init__(self, rest, guild=None, channel_id=None, name="channel"):
+        self.rest = rest
+        self.id = channel_id or snowflake()
+        self.name = name
+        self.guild = guild
+        self.mention = f"<#{self.id}>"
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        await self.rest.call("POST /channels/{id}/messages")
+        message = FakeMessage(self.rest, content=content, channel=self, guild=self.guild, embeds=_embeds(kwargs))
+        self.sent.append(message)
+        return message
+
+
+class FakeGuild:
+    def __init__(self, rest, guild_id=None, name="guild"):
+        self.rest = rest
+        self.id = guild_id or snowflake()
+        self.name = name
+        self.shard_id = 0
+        self.icon = None
+        self.channels = {}
+
+    def add_channel(self, channel_id=None, name="channel"):
+        channel = FakeChannel(self.rest, guild=self, channel_id=channel_id, name=name)
+        self.channels[channel.id] = channel
+        return channel
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    async def fetch_sticker(self, sticker_id):
+        await self.rest.call("GET /guilds/{id}/stickers/{id}")
+        return SimpleNamespace(id=sticker_id)
+
+
+class FakeClient:
+    """Stands in for both the bot passed to cogs and `interaction.client`."""
+
+    def __init__(self, rest):
+        self.rest = rest
+        self.user = FakeUser(rest, name="Silliana", bot=True)
+        self.latency = 0.0
+        self.guilds = []
+        self.users = {}
+
+    def add_guild(self, guild_id=None):
+        guild = FakeGuild(self.rest, guild_id=guild_id)
+        self.guilds.append(guild)
+        return guild
+
+    def get_channel(self, channel_id):
+        for guild in self.guilds:
+            channel = guild.get_channel(channel_id)
+            if channel:
+                return channel
+        return None
+
+    def get_sticker(self, sticker_id):
+        return None
+
+    async def fetch_sticker(self, sticker_id):
+        await self.rest.call("GET /stickers/{id}")
+        return SimpleNamespace(id=sticker_id)
+
+    async def fetch_channel(self, channel_id):
+        await self.rest.call("GET /channels/{id}")
+        channel = self.get_channel(channel_id)
+        if channel is None:
+            raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Channel")
+        return channel
+
+    async def fetch_user(self, user_id):
+        await self.rest.call("GET /users/{id}")
+        return self.users.get(user_id) or FakeUser(self.rest, user_id=user_id)
+
+    async def wait_until_ready(self):
+        return
+
+    def dispatch(self, event_name, *args, **kwargs):
+        return
+
+
+class FakeInteractionResponse:
+    def __init__(self, interaction):
+        self.interaction = interaction
+        self._done = False
+        # perf_counter() when the interaction was acknowledged, the bench reports time-to-ack from it
+        self.acked_at = None
+
+    def is_done(self):
+        return self._done
+
+    async def _respond(self):
+        if self._done:
+            raise discord.InteractionResponded(self.interaction)
+        self._done = True
+        await self.interaction.rest.call("POST /interactions/{id}/{token}/callback")
+        self.acked_at = time.perf_counter()
+
+    async def send_message(self, content=None, **kwargs):
+        await self._respond()
+
+    async def edit_message(self, **kwargs):
+        await self._respond()
+        if self.interaction.message is not None and "embed" in kwargs:
+            self.interaction.message.embeds = _embeds(kwargs)
+
+    async def send_modal(self, modal):
+        await self._respond()
+
+    async def defer(self, **kwargs):
+        await self._respond()
+
+
+class FakeFollowup:
+    def __init__(self, rest):
+        self.rest = rest
+
+    async def send(self, content=None, **kwargs):
+        await self.rest.call("POST /webhooks/{id}/{token}")
+        return FakeMessage(self.rest, content=content, embeds=_embeds(kwargs))
+
+
+class FakeInteraction:
+    def __init__(self, client, user, guild=None, channel=None, message=None):
+        self.rest = client.rest
+        self.id = snowflake()
+        self.client = client
+        self.user = user
+        self.guild = guild
+        self.guild_id = guild.id if guild else None
+        self.channel = channel
+        self.message = message
+        self.created_at = discord.utils.utcnow()
+        self.response = FakeInteractionResponse(self)
+        self.followup = FakeFollowup(client.rest)
+
+
+def _embeds(kwargs):
+    if kwargs.get("embed") is not None:
+        return [kwargs["embed"]]
+    return list(kwargs.get("embeds") or [])
@@ -0,0 +1,281 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+"""
+Offline load test for the cogs, driven through the fakes in `bench.fakes`.
+
+Operations are started open-loop at `--rate` per second (so slow operations pile up the
+way they would live) and the report shows throughput, p50/p99 latency, p99 time until the interaction
+was acknowledged (submit and review) and REST calls per operation.
+
+    $ python -m bench.load --scenario all --rate 200 --ops 2000 --latency-ms 50 --rate-limit-ratio 0.01
+    $ python -m bench.load --scenario review --archive-digest
+
+With any of the `--max-*` budgets set, the run exits with status 1 when a scenario goes over it,
+so CI can gate on the numbers:
+
+    $ python -m bench.load --max-p99-ms 500 --max-rest-per-op 3 --max-errors 0
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import settings
+from bench.fakes import FakeClient, FakeInteraction, FakeMessage, FakeRest, FakeUser
+
+SUBMISSION_CHANNELID = 900
+ACCEPTED_CHANNELID = 901
+REJECTED_CHANNELID = 902
+HELD_CHANNELID = 903
+TWITCH_CHANNELID = 904
+
+TRIGGERS = ["bwaa", "meow", "pluh", "fumo", "get real"]
+
+
+DIGEST_FILE = os.path.join(tempfile.gettempdir(), "silliana-bench-digest.json")
+SUBMISSIONS_FILE = os.path.join(tempfile.gettempdir(), "silliana-bench-submissions.sqlite3")
+
+
+def bench_settings(archive_digest=False):
+    return settings.Settings.from_env({
+        "OWNER_ID": "1",
+        "SUBMISSION_CHANNELID": str(SUBMISSION_CHANNELID),
+        "ACCEPTED_CHANNELID": str(ACCEPTED_CHANNELID),
+        "REJECTED_CHANNELID": str(REJECTED_CHANNELID),
+        "HELD_CHANNELID": str(HELD_CHANNELID),
+        "BWAA_STICKERIDS": "11,12",
+        "MEOW_STICKERIDS": "13",
+        "PLUH_STICKERIDS": "14",
+        "FUMO_STICKERIDS": "15",
+        "FUMO_GIFS": "https://example.com/fumo.gif",
+        "GET_REAL_GIFS": "https://example.com/get-real.gif",
+        # No Twitch credentials so the cog's own polling loop never starts; the harness drives it
+        "TWITCH_USERNAME": "silliana_bench",
+        "TWITCH_NOTIFICATION_CHANNELID": str(TWITCH_CHANNELID),
+        # Never pick up the real per-guild overrides
+        "GUILD_SETTINGS_FILE": os.path.join(tempfile.gettempdir(), "silliana-bench-guilds.json"),
+        "ARCHIVE_DIGEST": str(archive_digest),
+        "ARCHIVE_DIGEST_FILE": DIGEST_FILE,
+        "SUBMISSIONS_FILE": SUBMISSIONS_FILE,
+        "REACTION_STATS_FILE": os.path.join(tempfile.gettempdir(), "silliana-bench-reaction-stats.sqlite3"),
+    })
+
+
+class Bench:
+    def __init__(self, args):
+        # Settings must be in place before the cogs (and tracing) are imported
+        settings.swap(bench_settings(args.archive_digest))
+        # Start every run with an empty digest buffer and no submissions
+        for path in (DIGEST_FILE, SUBMISSIONS_FILE):
+            if os.path.exists(path):
+                os.remove(path)
+
+        self.args = args
+        self.rest = FakeRest(
+            latency=args.latency_ms / 1000,
+            jitter=args.jitter_ms / 1000,
+            rate_limit_ratio=args.rate_limit_ratio,
+            retry_after=args.retry_after_ms / 1000,
+            seed=args.seed,
+        )
+        self.client = FakeClient(self.rest)
+        self.guilds = [self.client.add_guild() for _ in range(args.guilds)]
+        home = self.guilds[0]
+        for channel_id in (SUBMISSION_CHANNELID, ACCEPTED_CHANNELID, REJECTED_CHANNELID, HELD_CHANNELID, TWITCH_CHANNELID):
+            home.add_channel(channel_id)
+        self.random = random.Random(args.seed)
+
+    # Operations, one call each
+
+    async def react(self, i):
+        from cogs.reacts import MessageReacts
+        if not hasattr(self, "reacts"):
+            self.reacts = MessageReacts(self.client)
+
+        guild = self.guilds[i % len(self.guilds)]
+        channel = guild.add_channel() if not guild.channels else next(iter(guild.channels.values()))
+        content = f"{self.random.choice(TRIGGERS)} :3" if self.random.random() < self.args.trigger_ratio else "hello"
+        message = FakeMessage(self.rest, content=content, author=FakeUser(self.rest), channel=channel, guild=guild)
+        await self.reacts.on_message(message)
+
+    async def submit(self, i):
+        from cogs.forms import SubmissionForm
+        form = SubmissionForm()
+        for field, value in (
+            (form.artist_name, f"Artist {i}"),
+            (form.song_name, f"Song {i}"),
+            (form.song_link, f"https://example.com/song/{i}"),
+            (form.genre, "Hyperpop"),
+            (form.socials, "@artist"),
+        ):
+            field._value = value
+
+        interaction = FakeInteraction(self.client, FakeUser(self.rest), guild=self.guilds[0])
+        await form.on_submit(interaction)
+        return interaction
+
+    async def review(self, i):
+        import submissions
+        from cogs.forms import SubmissionForm, shared_review_view, ACCEPTED_COLOR, DENIED_COLOR, HOLD_COLOR
+        submitter = FakeUser(self.rest)
+        self.client.users[submitter.id] = submitter
+
+        # Build the pending submission the same way the form does
+        form = SubmissionForm()
+        for field, value in (
+            (form.artist_name, f"Artist {i}"),
+            (form.song_name, f"Song {i}"),
+            (form.song_link, f"https://example.com/song/{i}"),
+            (form.genre, "Hyperpop"),
+            (form.socials, "@artist"),
+        ):
+            field._value = value
+        embed = form._create_submission_embed(FakeInteraction(self.client, submitter))
+
+        channel = self.guilds[0].get_channel(SUBMISSION_CHANNELID)
+        message = FakeMessage(self.rest, author=self.client.user, channel=channel, guild=self.guilds[0], embeds=[embed])
+        submission = submissions.store.create(self.guilds[0].id, submitter.id, f"Artist {i}", f"Song {i}", f"https://example.com/song/{i}")
+        submissions.store.attach_message(submission.id, channel.id, message.id)
+        interaction = FakeInteraction(self.client, FakeUser(self.rest, name="reviewer"), guild=self.guilds[0], message=message)
+
+        status, color, reason = self.random.choice([
+            ("accepted", ACCEPTED_COLOR, None),
+            ("denied", DENIED_COLOR, "Not a fit"),
+            ("held for questions", HOLD_COLOR, None),
+        ])
+        await shared_review_view().handle_review(interaction, status, color, rejection_reason=reason, submission=submission)
+        return interaction
+
+    async def twitch(self, i):
+        from cogs.twitch_notifications import TwitchNotifications
+        if not hasattr(self, "notifier"):
+            self.notifier = TwitchNotifications(self.client)
+            self.notifier.access_token = "bench"
+
+            # Scripted Helix responses; like the real call this one blocks, in the worker thread it runs in
+            def make_api_request(logins):
+                time.sleep(self.args.twitch_latency_ms / 1000)
+                return {"data": [
+                    {"user_login": login, "user_name": login, "title": "Bench stream", "game_name": "Just Chatting", "viewer_count": 1}
+                    for login in logins if self.random.random() < 0.5
+                ]}
+            self.notifier._make_api_request = make_api_request
+
+        await self.notifier._check_stream_status()
+
+    # Driver
+
+    async def run(self, name, operation):
+        self.rest.reset()
+        latencies = []
+        ack_latencies = []
+        errors = 0
+
+        async def timed(i):
+            nonlocal errors
+            started = time.perf_counter()
+            try:
+                interaction = await operation(i)
+            except Exception:
+                errors += 1
+            else:
+                # Interaction scenarios return their interaction, what counts for Discord's 3s deadline is the ack
+                if interaction is not None and interaction.response.acked_at is not None:
+                    ack_latencies.append(interaction.response.acked_at - started)
+            latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        tasks = []
+        for i in range(self.args.ops):
+            tasks.append(asyncio.create_task(timed(i)))
+            # Open-loop arrivals at the configured rate
+            next_start = started + (i + 1) / self.args.rate
+            await asyncio.sleep(max(0.0, next_start - time.perf_counter()))
+        await asyncio.gather(*tasks)
+        if name == "review" and self.args.archive_digest:
+            # Count the partial batches the timer would have sent too
+            from archive_digest import digest
+            digest.client = self.client
+            await digest.flush_all()
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        ack_latencies.sort()
+        return {
+            "scenario": name,
+            "ops": self.args.ops,
+            "throughput": self.args.ops / elapsed,
+            "p50_ms": statistics.median(latencies) * 1000,
+            "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+            "ack_p99_ms": ack_latencies[min(len(ack_latencies) - 1, int(len(ack_latencies) * 0.99))] * 1000 if ack_latencies else None,
+            "rest_per_op": self.rest.total / self.args.ops,
+            "rate_limited": sum(self.rest.rate_limited.values()),
+            "errors": errors,
+        }
+
+
+SCENARIOS = ["react", "submit", "review", "twitch"]
+
+# Report field, budget argument and value format, for every budget a run can be gated on
+BUDGETS = [
+    ("p99_ms", "max_p99_ms", "{:.1f}ms"),
+    ("ack_p99_ms", "max_ack_p99_ms", "{:.1f}ms"),
+    ("rest_per_op", "max_rest_per_op", "{:.2f}"),
+    ("errors", "max_errors", "{}"),
+]
+
+
+def over_budget(result, args):
+    """Describes every budget `result` went over."""
+    return [
+        f"{result['scenario']}: {field} {value.format(result[field])} over the budget of {value.format(getattr(args, budget))}"
+        for field, budget, value in BUDGETS
+        if getattr(args, budget) is not None and result[field] is not None and result[field] > getattr(args, budget)
+    ]
+
+
+async def main(args):
+    bench = Bench(args)
+    names = list(SCENARIOS) if args.scenario == "all" else [args.scenario]
+
+    failures = []
+    print(f"{'scenario':<8} {'ops':>6} {'ops/s':>8} {'p50 (ms)':>9} {'p99 (ms)':>9} {'ack p99':>8} {'REST/op':>8} {'429s':>5} {'errors':>6}")
+    for name in names:
+        r = await bench.run(name, getattr(bench, name))
+        print(f"{r['scenario']:<8} {r['ops']:>6} {r['throughput']:>8.1f} {r['p50_ms']:>9.1f} {r['p99_ms']:>9.1f} "
+              f"{'-' if r['ack_p99_ms'] is None else format(r['ack_p99_ms'], '.1f'):>8} {r['rest_per_op']:>8.2f} {r['rate_limited']:>5} {r['errors']:>6}")
+        failures.extend(over_budget(r, args))
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=["all", *SCENARIOS], default="all")
+    parser.add_argument("--ops", type=int, default=500, help="Operations per scenario")
+    parser.add_argument("--rate", type=float, default=100, help="Operations started per second")
+    parser.add_argument("--guilds", type=int, default=50, help="Guilds the react scenario spreads messages over")
+    parser.add_argument("--trigger-ratio", type=float, default=0.3, help="Share of messages containing a trigger")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Mean injected REST latency")
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="Share of REST calls answered with a 429")
+    parser.add_argument("--retry-after-ms", type=float, default=500)
+    parser.add_argument("--archive-digest", action="store_true", help="Batch rejected/held archive posts")
+    parser.add_argument("--twitch-latency-ms", type=float, default=100, help="Blocking latency of the Helix stand-in")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--max-p99-ms", type=float, default=None, help="Fail if a scenario's p99 latency is higher")
+    parser.add_argument("--max-ack-p99-ms", type=float, default=None, help="Fail if an interaction scenario's p99 time-to-ack is higher")
+    parser.add_argument("--max-rest-per-op", type=float, default=None, help="Fail if a scenario makes more REST calls per operation")
+    parser.add_argument("--max-errors", type=int, default=None, help="Fail if a scenario has more failed operations")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
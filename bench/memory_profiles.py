@@ -0,0 +1,176 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+"""
+Compares resident memory and time-to-ready of the client cache profiles.
+
+Each profile runs in its own subprocess, which feeds a synthetic READY, GUILD_CREATE
+and MESSAGE_CREATE stream straight into the client's connection state (no network).
+
+    $ python -m bench.memory_profiles --guilds 5 --channels 200 --members 5000 --messages 20000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import discord
+from discord.ext import commands
+
+from cache_profiles import PROFILES, client_options
+
+READY_TIMEOUT = 0.05
+
+
+def rss_kib() -> int:
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        # Peak instead of current RSS, still comparable between profiles
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def user(user_id):
+    return {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0", "avatar": None, "global_name": None}
+
+
+def member(user_id):
+    return {"user": user(user_id), "roles": [], "joined_at": "2025-01-01T00:00:00+00:00", "deaf": False, "mute": False, "flags": 0}
+
+
+def guild(guild_id, channels, members):
+    return {
+        "id": str(guild_id),
+        "name": f"Synthetic {guild_id}",
+        "unavailable": False,
+        "large": members > 250,
+        "member_count": members,
+        "features": [],
+        "emojis": [],
+        "stickers": [],
+        "threads": [],
+        "stage_instances": [],
+        "guild_scheduled_events": [],
+        "voice_states": [],
+        "presences": [],
+        "roles": [{
+            "id": str(guild_id), "name": "@everyone", "permissions": "0", "position": 0,
+            "color": 0, "hoist": False, "managed": False, "mentionable": False,
+        }],
+        "channels": [{
+            "id": str(guild_id + 1 + i), "type": 0, "name": f"channel-{i}", "position": i,
+            "guild_id": str(guild_id), "permission_overwrites": [],
+        } for i in range(channels)],
+        "members": [member(guild_id + 1_000_000 + i) for i in range(members)],
+    }
+
+
+def message(message_id, guild_id, channel_id, author_id):
+    return {
+        "id": str(message_id),
+        "channel_id": str(channel_id),
+        "guild_id": str(guild_id),
+        "author": user(author_id),
+        "member": {k: v for k, v in member(author_id).items() if k != "user"},
+        "content": "bwaa" if message_id % 7 == 0 else "hello there",
+        "timestamp": "2025-01-01T00:00:00+00:00",
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0,
+    }
+
+
+async def run_profile(profile, args):
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.guilds = True
+    intents.guild_messages = True
+
+    baseline = rss_kib()
+    bot = commands.Bot(command_prefix=None, guild_ready_timeout=READY_TIMEOUT, **client_options(profile, intents))
+    # Private API: the same setup discord.py does on login, minus the HTTP session
+    await bot._async_setup_hook()
+    state = bot._connection
+
+    guild_ids = [(i + 1) * 10_000_000 for i in range(args.guilds)]
+    guilds = [guild(guild_id, args.channels, args.members) for guild_id in guild_ids]
+
+    started = time.perf_counter()
+    state.parse_ready({
+        "v": 10,
+        "user": user(1),
+        "application": {"id": "1", "flags": 0},
+        "session_id": "synthetic",
+        "guilds": [{"id": str(guild_id), "unavailable": True} for guild_id in guild_ids],
+    })
+    for data in guilds:
+        state.parse_guild_create(data)
+    await asyncio.wait_for(bot.wait_until_ready(), timeout=60)
+    ready = time.perf_counter() - started - READY_TIMEOUT
+    del guilds
+
+    started = time.perf_counter()
+    for i in range(args.messages):
+        guild_id = guild_ids[i % len(guild_ids)]
+        channel_id = guild_id + 1 + i % args.channels
+        state.parse_message_create(message(10**15 + i, guild_id, channel_id, guild_id + 1_000_000 + i % args.members))
+    messages = time.perf_counter() - started
+
+    # Let dispatched events run before sampling memory
+    await asyncio.sleep(0)
+    return {
+        "profile": profile,
+        "ready_s": round(ready, 4),
+        "messages_s": round(messages, 4),
+        "rss_kib": rss_kib() - baseline,
+        "cached_messages": len(bot.cached_messages),
+        "cached_members": sum(len(g.members) for g in bot.guilds),
+    }
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=sorted(PROFILES), help="Run a single profile in this process")
+    parser.add_argument("--guilds", type=positive_int, default=5)
+    parser.add_argument("--channels", type=positive_int, default=200)
+    parser.add_argument("--members", type=positive_int, default=5000)
+    parser.add_argument("--messages", type=positive_int, default=20000)
+    args = parser.parse_args()
+
+    if args.profile:
+        print(json.dumps(asyncio.run(run_profile(args.profile, args))))
+        return
+
+    forwarded = ["--guilds", str(args.guilds), "--channels", str(args.channels),
+                 "--members", str(args.members), "--messages", str(args.messages)]
+    print(f"{'profile':<10} {'ready (s)':>10} {'messages (s)':>13} {'RSS (KiB)':>10} {'msg cache':>10} {'members':>8}")
+    for profile in PROFILES:
+        output = subprocess.run(
+            [sys.executable, "-m", "bench.memory_profiles", "--profile", profile, *forwarded],
+            check=True, capture_output=True, text=True
+        ).stdout
+        r = json.loads(output.strip().splitlines()[-1])
+        print(f"{r['profile']:<10} {r['ready_s']:>10} {r['messages_s']:>13} {r['rss_kib']:>10} {r['cached_messages']:>10} {r['cached_members']:>8}")
+
+
+if __name__ == "__main__":
+    main()
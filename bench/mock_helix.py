@@ -0,0 +1,252 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+"""
+Local stand-in for the Twitch OAuth and Helix `streams` endpoints.
+
+A timeline scripts what the server does, as comma separated `<seconds>:<event>` steps counted
+from server start:
+
+    live / offline   stream state returned by /helix/streams
+    slow=<seconds>   delay every response (fast resets it)
+    outage           answer 503 until the next live/offline event
+    expire           revoke every issued token, the next call gets a 401
+
+Tokens also expire on their own after `--token-ttl` seconds, and /helix/streams enforces a
+points bucket with Twitch's Ratelimit-* headers, answering 429 when it's empty.
+
+    $ python -m bench.mock_helix --port 8787 --timeline "0:offline,10:live,20:expire,40:offline"
+
+Point the bot at it with TWITCH_API_URL=http://127.0.0.1:8787/helix and
+TWITCH_AUTH_URL=http://127.0.0.1:8787/oauth2 (any client ID/secret is accepted).
+"""
+
+import argparse
+import asyncio
+import itertools
+import threading
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from aiohttp import web
+
+DEFAULT_TIMELINE = "0:offline,10:live,20:expire,25:slow=2,30:fast,35:outage,40:live,50:offline"
+
+
+def parse_timeline(text: str) -> List[Tuple[float, str]]:
+    steps = []
+    for step in filter(None, (x.strip() for x in text.split(","))):
+        at, event = step.split(":", 1)
+        steps.append((float(at), event.strip()))
+    return sorted(steps)
+
+
+class MockHelix:
+    """
+    Scripted Twitch API. `state_at` and `go_live_times` let a benchmark line
+    notifications up against the moment the stream actually went live.
+    """
+
+    def __init__(self, timeline: str = DEFAULT_TIMELINE, token_ttl: float = 3600, rate_limit: int = 800,
+                 rate_window: float = 60, stream_title: str = "Mock stream"):
+        self.timeline = parse_timeline(timeline)
+        self.token_ttl = token_ttl
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.stream_title = stream_title
+
+        self.started = time.monotonic()
+        self.tokens = {}
+        self.token_ids = itertools.count(1)
+        self.revoked_before = 0.0
+        self.bucket = rate_limit
+        self.bucket_reset = self.started + rate_window
+        self.requests = Counter()
+        self.responses = Counter()
+
+    # Timeline
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def state_at(self, elapsed: float):
+        """Returns (live, delay, outage) as scripted at `elapsed` seconds."""
+        live, delay, outage = False, 0.0, False
+        for at, event in self.timeline:
+            if at > elapsed:
+                break
+            if event in ("live", "offline"):
+                live, outage = event == "live", False
+            elif event.startswith("slow="):
+                delay = float(event.split("=", 1)[1])
+            elif event == "fast":
+                delay = 0.0
+            elif event == "outage":
+                outage = True
+        return live, delay, outage
+
+    def revoked_at(self, elapsed: float) -> float:
+        return max((at for at, event in self.timeline if event == "expire" and at <= elapsed), default=0.0)
+
+    def go_live_times(self) -> List[float]:
+        """Seconds since start at which the stream went from offline to live."""
+        times, live = [], False
+        for at, event in self.timeline:
+            if event == "live" and not live:
+                times.append(at)
+            if event in ("live", "offline"):
+                live = event == "live"
+        return times
+
+    # Handlers
+
+    async def token(self, request: web.Request) -> web.Response:
+        self.requests["token"] += 1
+        live, delay, outage = self.state_at(self.elapsed())
+        if outage:
+            return self._respond("token", web.json_response({"message": "Service Unavailable"}, status=503))
+        if delay:
+            await asyncio.sleep(delay)
+
+        token = f"mock-token-{next(self.token_ids)}"
+        self.tokens[token] = self.elapsed()
+        return self._respond("token", web.json_response({
+            "access_token": token,
+            "expires_in": int(self.token_ttl),
+            "token_type": "bearer",
+        }))
+
+    async def streams(self, request: web.Request) -> web.Response:
+        self.requests["streams"] += 1
+        elapsed = self.elapsed()
+        live, delay, outage = self.state_at(elapsed)
+        if delay:
+            await asyncio.sleep(delay)
+        if outage:
+            return self._respond("streams", web.json_response({"message": "Service Unavailable"}, status=503))
+
+        token = self._bearer(request)
+        issued = self.tokens.get(token)
+        if issued is None or elapsed - issued > self.token_ttl or issued < self.revoked_at(elapsed):
+            return self._respond("streams", web.json_response(
+                {"error": "Unauthorized", "status": 401, "message": "Invalid OAuth token"}, status=401
+            ))
+
+        headers = self._take_rate_limit_point()
+        if headers is None:
+            return self._respond("streams", web.json_response(
+                {"error": "Too Many Requests", "status": 429, "message": ""}, status=429, headers=self._rate_limit_headers()
+            ))
+
+        data = []
+        if live:
+            # Every requested login follows the same script
+            data.extend({
+                "id": str(index),
+                "user_login": user_login,
+                "user_name": user_login,
+                "type": "live",
+                "title": self.stream_title,
+                "game_name": "Just Chatting",
+                "viewer_count": 42,
+                "started_at": "2025-01-01T00:00:00Z",
+                "thumbnail_url": "https://static-cdn.jtvnw.net/previews-ttv/live_user_mock-{width}x{height}.jpg",
+            } for index, user_login in enumerate(request.query.getall("user_login", []), 1))
+        return self._respond("streams", web.json_response({"data": data, "pagination": {}}, headers=headers))
+
+    # Helpers
+
+    @staticmethod
+    def _bearer(request: web.Request) -> Optional[str]:
+        auth = request.headers.get("Authorization", "")
+        return auth[len("Bearer "):] if auth.startswith("Bearer ") else None
+
+    def _take_rate_limit_point(self):
+        now = time.monotonic()
+        if now >= self.bucket_reset:
+            self.bucket = self.rate_limit
+            self.bucket_reset = now + self.rate_window
+        if self.bucket <= 0:
+            return None
+        self.bucket -= 1
+        return self._rate_limit_headers()
+
+    def _rate_limit_headers(self):
+        return {
+            "Ratelimit-Limit": str(self.rate_limit),
+            "Ratelimit-Remaining": str(self.bucket),
+            "Ratelimit-Reset": str(int(time.time() + max(0.0, self.bucket_reset - time.monotonic()))),
+        }
+
+    def _respond(self, endpoint: str, response: web.Response) -> web.Response:
+        self.responses[(endpoint, response.status)] += 1
+        return response
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/oauth2/token", self.token)
+        app.router.add_get("/helix/streams", self.streams)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> web.AppRunner:
+        """Starts serving in the current event loop. `self.port` holds the bound port."""
+        runner = web.AppRunner(self.app(), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        self.started = time.monotonic()
+        self.bucket_reset = self.started + self.rate_window
+        return runner
+
+    def start_in_thread(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Serves from a background thread with its own event loop, so a client that
+        blocks the caller's loop (like the synchronous `requests` calls) can't stall the server.
+        """
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            runner = self._loop.run_until_complete(self.start(host, port))
+            ready.set()
+            try:
+                self._loop.run_forever()
+            finally:
+                self._loop.run_until_complete(runner.cleanup())
+                self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="mock-helix", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def stop_thread(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+async def serve(args):
+    helix = MockHelix(args.timeline, token_ttl=args.token_ttl, rate_limit=args.rate_limit)
+    runner = await helix.start(args.host, args.port)
+    print(f"Mock Helix listening on http://{args.host}:{helix.port} (timeline: {args.timeline})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def add_server_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--timeline", default=DEFAULT_TIMELINE)
+    parser.add_argument("--token-ttl", type=float, default=3600, help="Seconds until an issued token answers 401")
+    parser.add_argument("--rate-limit", type=int, default=800, help="Helix points per minute")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    add_server_args(parser)
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,112 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+"""
+Local stand-in for an oEmbed endpoint, answering for any link.
+
+Responses are derived from the requested link so they're stable across runs: links containing
+`broken` answer 404, `--failure-ratio` of the others answer 503, and more than `--rate-limit`
+requests per second answer 429. Every response is delayed by `--latency-ms`.
+
+    $ python -m bench.mock_oembed --port 8788 --latency-ms 150
+
+Point the bot at it with OEMBED_URL=http://127.0.0.1:8788/oembed and LINK_ENRICHMENT=true.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+import time
+from collections import Counter
+
+from aiohttp import web
+
+
+class MockOEmbed:
+    """Scripted oEmbed provider. `requests` counts lookups per link, `responses` counts status codes."""
+
+    def __init__(self, latency: float = 0.15, failure_ratio: float = 0.0, rate_limit: int = 50, seed=None):
+        self.latency = latency
+        self.failure_ratio = failure_ratio
+        self.rate_limit = rate_limit
+        self.random = random.Random(seed)
+
+        self.window = int(time.monotonic())
+        self.window_count = 0
+        self.requests = Counter()
+        self.responses = Counter()
+
+    async def oembed(self, request: web.Request) -> web.Response:
+        url = request.query.get("url", "")
+        self.requests[url] += 1
+
+        now = int(time.monotonic())
+        if now != self.window:
+            self.window, self.window_count = now, 0
+        self.window_count += 1
+        if self.window_count > self.rate_limit:
+            return self._respond(web.json_response({"error": "Too Many Requests"}, status=429, headers={"Retry-After": "1"}))
+
+        await asyncio.sleep(self.latency)
+        if not url:
+            return self._respond(web.json_response({"error": "Missing url"}, status=400))
+        if "broken" in url:
+            return self._respond(web.json_response({"error": "Not Found"}, status=404))
+        if self.random.random() < self.failure_ratio:
+            return self._respond(web.json_response({"error": "Service Unavailable"}, status=503))
+
+        digest = int(hashlib.sha1(url.encode("utf-8")).hexdigest(), 16)
+        return self._respond(web.json_response({
+            "version": "1.0",
+            "type": "video",
+            "title": f"Mock track {digest % 10000}",
+            "author_name": f"Mock artist {digest % 97}",
+            "provider_name": "Mock oEmbed",
+            "duration": 60 + digest % 240,
+            "thumbnail_url": f"https://example.com/thumbnails/{digest % 10000}.jpg",
+        }))
+
+    def _respond(self, response: web.Response) -> web.Response:
+        self.responses[response.status] += 1
+        return response
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/oembed", self.oembed)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> web.AppRunner:
+        """Starts serving in the current event loop. `self.port` holds the bound port."""
+        runner = web.AppRunner(self.app(), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return runner
+
+
+async def serve(args):
+    server = MockOEmbed(args.latency_ms / 1000, args.failure_ratio, args.rate_limit)
+    runner = await server.start(args.host, args.port)
+    print(f"Mock oEmbed listening on http://{args.host}:{server.port}/oembed")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def add_server_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--failure-ratio", type=float, default=0.0, help="Share of lookups answered with a 503")
+    parser.add_argument("--rate-limit", type=int, default=50, help="Requests per second before answering 429")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8788)
+    add_server_args(parser)
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
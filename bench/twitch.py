@@ -0,0 +1,120 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+"""
+Runs the real TwitchNotifications polling loop against the local Helix stand-in.
+
+Reports notification latency (scripted go-live to the @here message), Helix/OAuth
+requests per hour and how long the polling blocked the event loop.
+
+    $ python -m bench.twitch --duration 60 --poll-interval 1 --timeline "0:offline,10:live,20:expire,40:offline"
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import settings
+from bench.fakes import FakeClient, FakeRest
+from bench.mock_helix import MockHelix, add_server_args
+
+TWITCH_CHANNELID = 904
+
+
+class LoopMonitor:
+    """Measures event-loop lag by timing a short sleep over and over."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lags = []
+        self.task = None
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, time.perf_counter() - started - self.interval))
+
+    def start(self):
+        self.task = asyncio.create_task(self._run())
+
+    def stop(self):
+        self.task.cancel()
+
+
+async def main(args):
+    helix = MockHelix(args.timeline, token_ttl=args.token_ttl, rate_limit=args.rate_limit)
+    helix.start_in_thread()
+    base = f"http://127.0.0.1:{helix.port}"
+
+    settings.swap(settings.Settings.from_env({
+        "TWITCH_CLIENT_ID": "bench",
+        "TWITCH_CLIENT_SECRET": "bench",
+        "TWITCH_USERNAME": "silliana_bench",
+        "TWITCH_NOTIFICATION_CHANNELID": str(TWITCH_CHANNELID),
+        "TWITCH_API_URL": f"{base}/helix",
+        "TWITCH_AUTH_URL": f"{base}/oauth2",
+    }))
+
+    client = FakeClient(FakeRest(latency=args.discord_latency_ms / 1000))
+    channel = client.add_guild().add_channel(TWITCH_CHANNELID)
+
+    # Record when each notification goes out, on the server's clock
+    notified = []
+    send = channel.send
+
+    async def timed_send(*a, **kw):
+        notified.append(helix.elapsed())
+        return await send(*a, **kw)
+    channel.send = timed_send
+
+    from cogs.twitch_notifications import TwitchNotifications
+    # The copy bound to the cog picks up the class-level interval
+    TwitchNotifications.check_stream_status.change_interval(seconds=args.poll_interval)
+
+    monitor = LoopMonitor()
+    monitor.start()
+    cog = TwitchNotifications(client)
+    await asyncio.sleep(args.duration)
+    cog.cog_unload()
+    monitor.stop()
+    elapsed = helix.elapsed()
+    helix.stop_thread()
+
+    # Pair every scripted go-live with the first notification after it
+    latencies, missed = [], 0
+    for went_live in (t for t in helix.go_live_times() if t < args.duration):
+        sent = next((t for t in notified if t >= went_live), None)
+        if sent is None:
+            missed += 1
+        else:
+            latencies.append(sent - went_live)
+
+    lags = sorted(monitor.lags) or [0.0]
+    blocked = sum(lag for lag in lags if lag > args.block_threshold_ms / 1000)
+
+    print(f"Ran {elapsed:.1f}s, polling every {args.poll_interval}s")
+    print(f"Notifications: {len(notified)} sent, {len(latencies)} go-live(s) matched, {missed} missed")
+    if latencies:
+        print(f"Notification latency: mean {statistics.mean(latencies):.2f}s, max {max(latencies):.2f}s")
+    for endpoint, count in sorted(helix.requests.items()):
+        print(f"Requests to {endpoint}: {count} ({count / elapsed * 3600:.0f}/hour)")
+    for (endpoint, status), count in sorted(helix.responses.items()):
+        print(f"  {endpoint} {status}: {count}")
+    print(f"Event loop lag: p50 {statistics.median(lags) * 1000:.1f}ms, "
+          f"p99 {lags[int((len(lags) - 1) * 0.99)] * 1000:.1f}ms, max {lags[-1] * 1000:.1f}ms, "
+          f"blocked {blocked:.2f}s ({blocked / elapsed:.1%} of the run)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=60, help="Seconds to run")
+    parser.add_argument("--poll-interval", type=float, default=1, help="Seconds between stream checks")
+    parser.add_argument("--discord-latency-ms", type=float, default=50)
+    parser.add_argument("--block-threshold-ms", type=float, default=20, help="Lag counted as blocking")
+    add_server_args(parser)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,64 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import discord
+from typing import Any, Dict
+from logger import Logger
+
+log = Logger("CACHE")
+
+DEFAULT_PROFILE = "default"
+
+
+def _default(intents: discord.Intents) -> Dict[str, Any]:
+    # discord.py defaults: 1000 message cache, member caching and chunking as far as intents allow
+    return {
+        "intents": intents,
+        "max_messages": 1000,
+        "member_cache_flags": discord.MemberCacheFlags.from_intents(intents),
+        "chunk_guilds_at_startup": intents.members,
+    }
+
+
+def _lean(intents: discord.Intents) -> Dict[str, Any]:
+    # The cogs only read message content as it arrives, interaction payloads and a few channels by ID,
+    # so the message cache, member cache and startup chunking are all dead weight.
+    # Gateway events no cog listens to are dropped as well so they are never parsed or cached.
+    intents = discord.Intents(intents.value)
+    intents.typing = False
+    intents.voice_states = False
+    intents.invites = False
+    intents.reactions = False
+    intents.integrations = False
+    intents.webhooks = False
+    intents.guild_scheduled_events = False
+    intents.auto_moderation = False
+    return {
+        "intents": intents,
+        "max_messages": None,
+        "member_cache_flags": discord.MemberCacheFlags.none(),
+        "chunk_guilds_at_startup": False,
+    }
+
+
+PROFILES = {
+    "default": _default,
+    "lean": _lean,
+}
+
+
+def client_options(profile: str, intents: discord.Intents) -> Dict[str, Any]:
+    """
+    Returns the cache related `commands.Bot` keyword arguments for a memory profile.
+
+    Args:
+        profile: Profile name, one of `PROFILES`
+        intents: The intents the bot needs; profiles may only narrow them
+
+    Returns:
+        Dict[str, Any]: Keyword arguments for the client constructor
+    """
+    builder = PROFILES.get(profile)
+    if builder is None:
+        log.warn(f"Unknown memory profile '{profile}', using '{DEFAULT_PROFILE}'")
+        builder = PROFILES[DEFAULT_PROFILE]
+    return builder(intents)
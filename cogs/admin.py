@@ -0,0 +1,126 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import discord
+import guild_settings
+import settings
+from discord import app_commands
+from discord.ext import commands
+from typing import Literal, Optional
+from logger import Logger
+from rest_scheduler import ack
+
+log = Logger("ADMIN")
+
+class Admin(commands.Cog):
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @app_commands.command(name="reload_config", description="Reload the bot configuration without restarting")
+    async def reload_config(self, interaction: discord.Interaction) -> None:
+        owner_id = settings.get().owner_id
+        if not owner_id or interaction.user.id != owner_id:
+            await ack(interaction, "response", lambda: interaction.response.send_message(
+                "❌ You don't have permission to use this command. Only the bot owner can use this command.",
+                ephemeral=True
+            ))
+            return
+
+        try:
+            settings.reload()
+        except settings.SettingsError as e:
+            log.error(f"Invalid configuration, keeping the current settings: {e}")
+            message = f"❌ Invalid configuration, nothing changed:\n{e}"
+            await ack(interaction, "response", lambda: interaction.response.send_message(message, ephemeral=True))
+            return
+
+        log.info(f"Configuration reloaded by {interaction.user} (ID: {interaction.user.id})")
+        await ack(interaction, "response", lambda: interaction.response.send_message("✅ Configuration reloaded.", ephemeral=True))
+
+    # Per-guild settings, editable by anyone with Manage Server in that guild
+    guild_config = app_commands.Group(
+        name="guild_config",
+        description="View and edit this server's bot settings",
+        guild_only=True,
+        default_permissions=discord.Permissions(manage_guild=True)
+    )
+
+    async def _reply(self, interaction: discord.Interaction, message: str):
+        await ack(interaction, "response", lambda: interaction.response.send_message(message, ephemeral=True))
+
+    @guild_config.command(name="show", description="Show this server's effective settings")
+    async def guild_config_show(self, interaction: discord.Interaction) -> None:
+        config = guild_settings.get(interaction.guild_id)
+        lines = ["**Channels**"]
+        for kind in guild_settings.CHANNEL_KINDS:
+            channel_id = getattr(config, f"{kind}_channel_id")
+            lines.append(f"{kind}: {f'<#{channel_id}>' if channel_id else 'not set'}")
+
+        lines.append("**Reactions**")
+        for trigger, responses in config.reactions:
+            lines.append(f"{trigger}: {len(responses)} response(s)" if responses else f"{trigger}: disabled")
+
+        lines.append("**Twitch**")
+        lines.extend(f"{login}: <#{channel_id}>" for login, channel_id in config.twitch_targets)
+        if not config.twitch_targets:
+            lines.append("no streamers watched")
+
+        await self._reply(interaction, "\n".join(lines))
+
+    @guild_config.command(name="channel", description="Set or clear one of this server's submission channels")
+    @app_commands.describe(kind="Which channel to set", channel="The channel to use, leave empty to clear it")
+    async def guild_config_channel(self, interaction: discord.Interaction,
+                                   kind: Literal["submission", "accepted", "rejected", "held"],
+                                   channel: Optional[discord.TextChannel] = None) -> None:
+        # Global channels of this server stay in use for the kinds it doesn't set
+        await guild_settings.store.set_channel(interaction.guild_id, kind, channel.id if channel else None,
+                                               owns=lambda channel_id: interaction.guild.get_channel(channel_id) is not None)
+        log.info(f"{kind} channel of guild {interaction.guild_id} set to {channel.id if channel else None} by {interaction.user}")
+        await self._reply(interaction, f"✅ The {kind} channel is now {channel.mention if channel else 'not set'}.")
+
+    @guild_config.command(name="reaction", description="Set the stickers/GIFs a trigger replies with")
+    @app_commands.describe(
+        trigger="Word that triggers the reply",
+        responses="Comma separated sticker IDs or links, leave empty to disable the trigger"
+    )
+    async def guild_config_reaction(self, interaction: discord.Interaction, trigger: str, responses: str = "") -> None:
+        parsed = tuple(int(x) if x.isdigit() else x for x in (x.strip() for x in responses.split(",")) if x)
+        try:
+            trigger = guild_settings.normalize_trigger(trigger)
+        except ValueError as e:
+            await self._reply(interaction, f"❌ {e}.")
+            return
+
+        await guild_settings.store.set_reaction(interaction.guild_id, trigger, parsed)
+        log.info(f"Reaction '{trigger}' of guild {interaction.guild_id} set to {len(parsed)} response(s) by {interaction.user}")
+        if parsed:
+            await self._reply(interaction, f"✅ `{trigger}` now replies with {len(parsed)} response(s).")
+        else:
+            await self._reply(interaction, f"✅ `{trigger}` is disabled in this server.")
+
+    @guild_config.command(name="twitch_add", description="Announce a Twitch streamer going live in a channel")
+    @app_commands.describe(login="Twitch username", channel="Channel to announce in")
+    async def guild_config_twitch_add(self, interaction: discord.Interaction, login: str, channel: discord.TextChannel) -> None:
+        await guild_settings.store.add_twitch_target(interaction.guild_id, login, channel.id)
+        log.info(f"Guild {interaction.guild_id} now watches {login} in {channel.id} (by {interaction.user})")
+        await self._reply(interaction, f"✅ {channel.mention} will be notified when **{login}** goes live.")
+
+    @guild_config.command(name="twitch_remove", description="Stop announcing a Twitch streamer")
+    @app_commands.describe(login="Twitch username")
+    async def guild_config_twitch_remove(self, interaction: discord.Interaction, login: str) -> None:
+        if not await guild_settings.store.remove_twitch_target(interaction.guild_id, login):
+            await self._reply(interaction, f"❌ **{login}** isn't watched in this server.")
+            return
+
+        log.info(f"Guild {interaction.guild_id} stopped watching {login} (by {interaction.user})")
+        await self._reply(interaction, f"✅ No longer announcing **{login}**.")
+
+    @guild_config.command(name="reset", description="Drop every override of this server and use the defaults")
+    async def guild_config_reset(self, interaction: discord.Interaction) -> None:
+        await guild_settings.store.reset(interaction.guild_id)
+        log.info(f"Guild {interaction.guild_id} settings reset by {interaction.user}")
+        await self._reply(interaction, "✅ This server now uses the default settings.")
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Admin(bot))
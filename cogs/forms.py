@@ -1,12 +1,18 @@
 # (C) 2025 Hexa Vibes. Licensed under the MIT License.
 
 import discord
-import os
+import guild_settings
 import re
+import settings
+import submissions
 from discord.ext import commands
 from discord import app_commands
 from typing import Optional
 from logger import Logger
+from archive_digest import digest
+from link_enrichment import enricher, format_duration
+from rest_scheduler import ack, moderate
+from tracing import trace
 
 log = Logger("FORMS")
 
@@ -21,15 +27,63 @@ HOLD_COLOR = 0xf1c40f
 SUCCESS_MESSAGE = "Your submission has been received!"
 ERROR_MESSAGE = "An error occurred while submitting your form."
 
+#====================
+# REST HELPERS
+#====================
+# Use the gateway cache when possible and only fall back to a REST fetch
+async def get_channel(client: discord.Client, channel_id: int):
+    channel = client.get_channel(channel_id)
+    if channel is None:
+        channel = await moderate("channel_fetch", lambda: client.fetch_channel(channel_id))
+    return channel
+
+# Rejected/held entries go through the digest when it's enabled, accepted ones carry a view and are always posted directly
+# Returns how the reviewer should be told where the entry went
+async def archive_send(channel, embed: discord.Embed) -> str:
+    if settings.get().archive_digest:
+        await digest.add(channel, embed)
+        return "queued for"
+    await moderate("archive_send", lambda: channel.send(embed=embed), bucket=f"channel:{channel.id}")
+    return "moved to"
+
+#====================
+# LINK ENRICHMENT
+#====================
+# Check the submitted link in the background and add what we found to the pending submission
+async def enrich_submission(message: discord.Message, embed: discord.Embed, link: str) -> None:
+    result = await enricher.enrich(link)
+    if result.ok:
+        embed.set_field_at(2, name="Link", value=result.url, inline=False)
+        details = [
+            f"**{result.title[:200]}**" if result.title else None,
+            f"by {result.author[:100]}" if result.author else None,
+            format_duration(result.duration) if result.duration else None,
+            result.provider,
+        ]
+        embed.add_field(name="Link Check", value="✅ " + " · ".join(x for x in details if x), inline=False)
+        if result.thumbnail:
+            embed.set_thumbnail(url=result.thumbnail)
+    else:
+        embed.add_field(name="Link Check", value=f"⚠️ {result.error}", inline=False)
+
+    # The submission may have been reviewed and its message deleted in the meantime
+    try:
+        await moderate("enrich_edit", lambda: message.edit(embed=embed), bucket=f"channel:{message.channel.id}")
+    except discord.NotFound:
+        log.info(f"Submission message {message.id} is gone, skipping its link check")
+    except discord.HTTPException as e:
+        log.error(f"Could not add the link check to submission message {message.id}: {e}")
+
 #====================
 # MODALS
 #====================
 # Rejection reason embed
 class RejectionReasonModal(discord.ui.Modal, title='Rejection Reason'):
-    def __init__(self, original_view, message):
+    def __init__(self, original_view, message, submission=None):
         super().__init__()
         self.original_view = original_view
         self.message = message
+        self.submission = submission
 
     rejection_reason = discord.ui.TextInput(
         label='Why are you rejecting this submission?',
@@ -44,7 +98,8 @@ class RejectionReasonModal(discord.ui.Modal, title='Rejection Reason'):
             interaction, 
             "denied", 
             DENIED_COLOR, 
-            rejection_reason=self.rejection_reason.value
+            rejection_reason=self.rejection_reason.value,
+            submission=self.submission
         )
 
 # Modal form for music submissions.
@@ -93,9 +148,13 @@ class SubmissionForm(discord.ui.Modal, title='🎵 Music Submission Form'):
 # Handle form submission
     async def on_submit(self, interaction: discord.Interaction) -> None:
         try:
+            # Acknowledge first, the post can queue behind other sends to the submission channel
+            await ack(interaction, "defer", lambda: interaction.response.defer(ephemeral=True, thinking=True))
             embed = self._create_submission_embed(interaction)
-            await self._send_to_submission_channel(interaction, embed)
-            await interaction.response.send_message(SUCCESS_MESSAGE, ephemeral=True)
+            message = await self._send_to_submission_channel(interaction, embed)
+            if message and settings.get().link_enrichment:
+                enricher.track(message.id, enrich_submission(message, embed, self.song_link.value))
+            await ack(interaction, "followup", lambda: interaction.followup.send(SUCCESS_MESSAGE, ephemeral=True))
         except Exception as e:
             await self.on_error(interaction, e)
 # Create the submission embed
@@ -122,28 +181,42 @@ class SubmissionForm(discord.ui.Modal, title='🎵 Music Submission Form'):
 
         return embed
 # Send the submission embed to the configured submission channel.
-    async def _send_to_submission_channel(self, interaction: discord.Interaction, embed: discord.Embed) -> None:
-        submission_channel_id = os.getenv("SUBMISSION_CHANNELID")
+    async def _send_to_submission_channel(self, interaction: discord.Interaction, embed: discord.Embed) -> Optional[discord.Message]:
+        submission_channel_id = guild_settings.get(interaction.guild_id).submission_channel_id
         if not submission_channel_id:
-            return
+            return None
 
         try:
-            channel = interaction.guild.get_channel(int(submission_channel_id))
+            channel = interaction.guild.get_channel(submission_channel_id)
             if channel:
-                # Create review buttons for the submission message
-                review_buttons = SubmissionReviewButtons()
-                await channel.send(embed=embed, view=review_buttons)
+                # The record's ID goes into the review buttons' custom IDs, so it's created first
+                submission = submissions.store.create(
+                    interaction.guild_id,
+                    interaction.user.id,
+                    self.artist_name.value,
+                    self.song_name.value,
+                    self.song_link.value
+                )
+                try:
+                    message = await moderate("submission_send", lambda: channel.send(embed=embed, view=review_view_for(submission.id)), bucket=f"channel:{channel.id}")
+                except Exception:
+                    submissions.store.discard(submission.id)
+                    raise
+                submissions.store.attach_message(submission.id, channel.id, message.id)
+                interaction.client.dispatch("submission_created", submission)
+                return message
         except (ValueError, AttributeError) as e:
             log.error(f"Error sending to submission channel: {e}")
+        return None
 # Handle errors during form submission
     async def on_error(self, interaction: discord.Interaction, error: Exception) -> None:
         log.error(f"Form submission error: {error}")
 
         try:
             if not interaction.response.is_done():
-                await interaction.response.send_message(ERROR_MESSAGE, ephemeral=True)
+                await ack(interaction, "response", lambda: interaction.response.send_message(ERROR_MESSAGE, ephemeral=True))
             else:
-                await interaction.followup.send(ERROR_MESSAGE, ephemeral=True)
+                await ack(interaction, "followup", lambda: interaction.followup.send(ERROR_MESSAGE, ephemeral=True))
         except Exception as e:
             print(f"Error sending error message: {e}")
 
@@ -173,8 +246,8 @@ class PostedButton(discord.ui.View):
         button.label = "Posted"
         
         
-        await interaction.response.edit_message(embed=embed, view=self)
-        await interaction.followup.send("Track marked as posted.", ephemeral=True)
+        await ack(interaction, "response", lambda: interaction.response.edit_message(embed=embed, view=self))
+        await ack(interaction, "followup", lambda: interaction.followup.send("Track marked as posted.", ephemeral=True))
 
 # Submission button view
 class SubmissionButton(discord.ui.View):
@@ -191,16 +264,39 @@ class SubmissionButton(discord.ui.View):
     )
     # Handle submission button click.
     async def submit_button(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
-        await interaction.response.send_modal(SubmissionForm())
+        await ack(interaction, "response", lambda: interaction.response.send_modal(SubmissionForm()))
 
 # Review buttons for submission management
+# New submissions use the ReviewButton dynamic items below, these fixed custom IDs only serve older messages
 class SubmissionReviewButtons(discord.ui.View):
     def __init__(self):
         super().__init__(timeout=None)
-        # Get the channel IDs from environment variables
-        self.accepted_channel_id = os.getenv("ACCEPTED_CHANNELID")
-        self.rejected_channel_id = os.getenv("REJECTED_CHANNELID")
-        self.held_channel_id = os.getenv("HELD_CHANNELID")
+
+    # Route a ReviewButton click to the stored submission
+    async def route(self, interaction: discord.Interaction, action: str, submission_id: int) -> None:
+        submission = submissions.store.get(submission_id)
+        if submission is not None and not submission.pending:
+            await self._already_reviewed(interaction, submission)
+            return
+
+        if action == "accept":
+            await self.handle_review(interaction, "accepted", ACCEPTED_COLOR, submission=submission)
+        elif action == "deny":
+            modal = RejectionReasonModal(self, interaction.message, submission)
+            await ack(interaction, "response", lambda: interaction.response.send_modal(modal))
+        elif action == "hold":
+            await self.handle_review(interaction, "held for questions", HOLD_COLOR, submission=submission)
+
+    @classmethod
+    async def _already_reviewed(cls, interaction: discord.Interaction, submission: submissions.Submission) -> None:
+        await cls._reply(interaction, f"This submission was already marked as {submission.status} by <@{submission.reviewer_id}>.")
+
+    @staticmethod
+    async def _reply(interaction: discord.Interaction, message: str) -> None:
+        if interaction.response.is_done():
+            await ack(interaction, "followup", lambda: interaction.followup.send(message, ephemeral=True))
+        else:
+            await ack(interaction, "response", lambda: interaction.response.send_message(message, ephemeral=True))
 
     @staticmethod
     def _extract_submitter_id(embed: discord.Embed) -> Optional[int]:
@@ -233,7 +329,7 @@ class SubmissionReviewButtons(discord.ui.View):
     async def deny_button(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
         
         modal = RejectionReasonModal(self, interaction.message)
-        await interaction.response.send_modal(modal)
+        await ack(interaction, "response", lambda: interaction.response.send_modal(modal))
 
     @discord.ui.button(
         label='Hold for Questions',
@@ -243,7 +339,65 @@ class SubmissionReviewButtons(discord.ui.View):
     async def hold_button(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
         await self.handle_review(interaction, "held for questions", HOLD_COLOR)
 
-    async def handle_review(self, interaction: discord.Interaction, status: str, color: int, rejection_reason: str = None) -> None:
+    async def handle_review(self, interaction: discord.Interaction, status: str, color: int, rejection_reason: str = None,
+                            submission: Optional[submissions.Submission] = None) -> None:
+        # Trace every REST call made for this click under one trace ID
+        with trace("review", interaction_id=interaction.id, status=status):
+            await self._handle_review(interaction, status, color, rejection_reason, submission)
+
+    async def _handle_review(self, interaction: discord.Interaction, status: str, color: int, rejection_reason: str = None,
+                             submission: Optional[submissions.Submission] = None) -> None:
+        if submission is not None:
+            # Claim the submission before any await, so two reviewers can't both review it
+            if not submission.pending:
+                await self._already_reviewed(interaction, submission)
+                return
+            if not submissions.store.claim(submission.id):
+                await self._reply(interaction, "Another reviewer is handling this submission right now.")
+                return
+
+        # The review is recorded once its archive post is out (or the message was handled, when there's none),
+        # a failure before that leaves it open for a retry
+        try:
+            # Acknowledge first, the archive and move sends can queue behind a busy channel
+            await self._defer(interaction)
+            await self._apply_review(interaction, status, color, rejection_reason, submission)
+            self._record(interaction, status, submission)
+        except BaseException as e:
+            if submission is not None and submission.pending:
+                submissions.store.release(submission.id)
+            if not isinstance(e, Exception):
+                raise
+            log.error(f"Error reviewing submission {submission.id if submission else interaction.message.id}: {e!r}")
+            if submission is None or submission.pending:
+                message = "An error occurred while reviewing the submission. It is still pending, please try again."
+            else:
+                message = f"The submission was marked as {status}, but an error occurred while finishing the review."
+            try:
+                await self._reply(interaction, message)
+            except discord.HTTPException as e:
+                log.error(f"Could not report the review error: {e}")
+        finally:
+            if submission is not None and not submission.pending:
+                interaction.client.dispatch("submission_reviewed", submission)
+
+    @staticmethod
+    def _record(interaction: discord.Interaction, status: str, submission: Optional[submissions.Submission]) -> None:
+        # Once the archive post is out the review has happened, a retry must not post it again
+        if submission is not None and submission.pending:
+            submissions.store.mark_reviewed(submission.id, status, interaction.user.id)
+
+    @staticmethod
+    async def _defer(interaction: discord.Interaction) -> None:
+        if not interaction.response.is_done():
+            await ack(interaction, "defer", lambda: interaction.response.defer(ephemeral=True, thinking=True))
+
+    async def _apply_review(self, interaction: discord.Interaction, status: str, color: int, rejection_reason: str = None,
+                            submission: Optional[submissions.Submission] = None) -> None:
+        # A late link check must not overwrite the review
+        enricher.cancel(interaction.message.id)
+        # Archive channels are configured per guild
+        config = guild_settings.get(interaction.guild_id)
         # Update the embed with the review status
         embed = interaction.message.embeds[0]
         embed.color = color
@@ -261,16 +415,13 @@ class SubmissionReviewButtons(discord.ui.View):
         )
         
         
-        for item in self.children:
-            item.disabled = True
-        
         response_sent = False
         
         # Handle accepted submissions
-        if status == "accepted" and self.accepted_channel_id:
+        if status == "accepted" and config.accepted_channel_id:
             try:
                 
-                accepted_channel = await interaction.client.fetch_channel(int(self.accepted_channel_id))
+                accepted_channel = await get_channel(interaction.client, config.accepted_channel_id)
                 if accepted_channel:
                     
                     accepted_embed = discord.Embed(
@@ -286,67 +437,68 @@ class SubmissionReviewButtons(discord.ui.View):
                     accepted_embed.add_field(name="Socials", value=embed.fields[4].value, inline=True)  # Socials
                     
 
-                    posted_view = PostedButton()
+                    posted_view = detached_view(PostedItem(submission.id)) if submission else PostedButton()
                     
 
-                    await accepted_channel.send(embed=accepted_embed, view=posted_view)
+                    await moderate("archive_send", lambda: accepted_channel.send(embed=accepted_embed, view=posted_view), bucket=f"channel:{accepted_channel.id}")
+                    self._record(interaction, status, submission)
                     
                     # Send confirmation to reviewer
                     if interaction.response.is_done():
-                        await interaction.followup.send(
-                            f"Submission accepted and moved to <#{self.accepted_channel_id}>. Original message will be deleted.", 
+                        await ack(interaction, "followup", lambda: interaction.followup.send(
+                            f"Submission accepted and moved to <#{config.accepted_channel_id}>. Original message will be deleted.", 
                             ephemeral=True
-                        )
+                        ))
                     else:
-                        await interaction.response.send_message(
-                            f"Submission accepted and moved to <#{self.accepted_channel_id}>. Original message will be deleted.", 
+                        await ack(interaction, "response", lambda: interaction.response.send_message(
+                            f"Submission accepted and moved to <#{config.accepted_channel_id}>. Original message will be deleted.", 
                             ephemeral=True
-                        )
+                        ))
                         response_sent = True
                     
                     # Delete the original message
-                    await interaction.message.delete()
+                    await moderate("delete", lambda: interaction.message.delete(), bucket=f"channel:{interaction.message.channel.id}")
                     
                 else:
                     # Send error message if the channel couldn't be found
                     if not response_sent:
                         if interaction.response.is_done():
-                            await interaction.followup.send(
+                            await ack(interaction, "followup", lambda: interaction.followup.send(
                                 "Could not find the accepted submissions channel. The submission has been marked as accepted, but was not moved.",
                                 ephemeral=True
-                            )
+                            ))
                         else:
-                            await interaction.response.send_message(
+                            await ack(interaction, "response", lambda: interaction.response.send_message(
                                 "Could not find the accepted submissions channel. The submission has been marked as accepted, but was not moved.",
                                 ephemeral=True
-                            )
+                            ))
                             response_sent = True
                             
 
-                    await interaction.message.edit(embed=embed, view=None)
+                    await moderate("edit", lambda: interaction.message.edit(embed=embed, view=None), bucket=f"channel:{interaction.message.channel.id}")
                     
             except (ValueError, AttributeError, discord.NotFound, discord.Forbidden) as e:
                 print(f"Error moving accepted submission: {e}")
                 if not response_sent:
                     if interaction.response.is_done():
-                        await interaction.followup.send(
+                        await ack(interaction, "followup", lambda: interaction.followup.send(
                             "An error occurred while moving the submission. The submission has been marked as accepted, but was not moved.",
                             ephemeral=True
-                        )
+                        ))
                     else:
-                        await interaction.response.send_message(
+                        await ack(interaction, "response", lambda: interaction.response.send_message(
                             "An error occurred while moving the submission. The submission has been marked as accepted, but was not moved.",
                             ephemeral=True
-                        )
+                        ))
                         response_sent = True
                         
                 
-                await interaction.message.edit(embed=embed, view=None)
+                await moderate("edit", lambda: interaction.message.edit(embed=embed, view=None), bucket=f"channel:{interaction.message.channel.id}")
         
-        elif status == "denied" and self.rejected_channel_id:
+        elif status == "denied" and config.rejected_channel_id:
             try:
                 # Get the rejected channel
-                rejected_channel = await interaction.client.fetch_channel(int(self.rejected_channel_id))
+                rejected_channel = await get_channel(interaction.client, config.rejected_channel_id)
                 if rejected_channel:
                     # Create a new embed for the rejected channel
                     rejected_embed = discord.Embed(
@@ -376,64 +528,65 @@ class SubmissionReviewButtons(discord.ui.View):
                     )
                     
                     # Send to the rejected channel
-                    await rejected_channel.send(embed=rejected_embed)
+                    moved = await archive_send(rejected_channel, rejected_embed)
+                    self._record(interaction, status, submission)
                     
                     
                     if interaction.response.is_done():
-                        await interaction.followup.send(
-                            f"Submission rejected and moved to <#{self.rejected_channel_id}>. Original message will be deleted.", 
+                        await ack(interaction, "followup", lambda: interaction.followup.send(
+                            f"Submission rejected and {moved} <#{config.rejected_channel_id}>. Original message will be deleted.", 
                             ephemeral=True
-                        )
+                        ))
                     else:
-                        await interaction.response.send_message(
-                            f"Submission rejected and moved to <#{self.rejected_channel_id}>. Original message will be deleted.", 
+                        await ack(interaction, "response", lambda: interaction.response.send_message(
+                            f"Submission rejected and {moved} <#{config.rejected_channel_id}>. Original message will be deleted.", 
                             ephemeral=True
-                        )
+                        ))
                         response_sent = True
                     
 
-                    await interaction.message.delete()
+                    await moderate("delete", lambda: interaction.message.delete(), bucket=f"channel:{interaction.message.channel.id}")
                     
                 else:
                     
                     if not response_sent:
                         if interaction.response.is_done():
-                            await interaction.followup.send(
+                            await ack(interaction, "followup", lambda: interaction.followup.send(
                                 "Could not find the rejected submissions channel. The submission has been marked as rejected, but was not moved.",
                                 ephemeral=True
-                            )
+                            ))
                         else:
-                            await interaction.response.send_message(
+                            await ack(interaction, "response", lambda: interaction.response.send_message(
                                 "Could not find the rejected submissions channel. The submission has been marked as rejected, but was not moved.",
                                 ephemeral=True
-                            )
+                            ))
                             response_sent = True
                             
 
-                    await interaction.message.edit(embed=embed, view=None)
+                    await moderate("edit", lambda: interaction.message.edit(embed=embed, view=None), bucket=f"channel:{interaction.message.channel.id}")
                     
             except (ValueError, AttributeError, discord.NotFound, discord.Forbidden) as e:
                 log.error(f"Error moving rejected submission: {e}")
                 if not response_sent:
                     if interaction.response.is_done():
-                        await interaction.followup.send(
+                        await ack(interaction, "followup", lambda: interaction.followup.send(
                             "An error occurred while moving the submission. The submission has been marked as rejected, but was not moved.",
                             ephemeral=True
-                        )
+                        ))
                     else:
-                        await interaction.response.send_message(
+                        await ack(interaction, "response", lambda: interaction.response.send_message(
                             "An error occurred while moving the submission. The submission has been marked as rejected, but was not moved.",
                             ephemeral=True
-                        )
+                        ))
                         response_sent = True
                         
                 
-                await interaction.message.edit(embed=embed, view=None)
+                await moderate("edit", lambda: interaction.message.edit(embed=embed, view=None), bucket=f"channel:{interaction.message.channel.id}")
         # Handle held for questions submissions
-        elif status == "held for questions" and self.held_channel_id:
+        elif status == "held for questions" and config.held_channel_id:
             try:
                 
-                held_channel = await interaction.client.fetch_channel(int(self.held_channel_id))
+                held_channel = await get_channel(interaction.client, config.held_channel_id)
                 if held_channel:
                     # Create a new embed for the held channel
                     held_embed = discord.Embed(
@@ -455,78 +608,79 @@ class SubmissionReviewButtons(discord.ui.View):
                     )
                     
                     
-                    await held_channel.send(embed=held_embed)
+                    moved = await archive_send(held_channel, held_embed)
+                    self._record(interaction, status, submission)
                     
                     
                     if interaction.response.is_done():
-                        await interaction.followup.send(
-                            f"Submission held for questions and moved to <#{self.held_channel_id}>. Original message will be deleted.", 
+                        await ack(interaction, "followup", lambda: interaction.followup.send(
+                            f"Submission held for questions and {moved} <#{config.held_channel_id}>. Original message will be deleted.", 
                             ephemeral=True
-                        )
+                        ))
                     else:
-                        await interaction.response.send_message(
-                            f"Submission held for questions and moved to <#{self.held_channel_id}>. Original message will be deleted.", 
+                        await ack(interaction, "response", lambda: interaction.response.send_message(
+                            f"Submission held for questions and {moved} <#{config.held_channel_id}>. Original message will be deleted.", 
                             ephemeral=True
-                        )
+                        ))
                         response_sent = True
                     
                     # Delete the original message
-                    await interaction.message.delete()
+                    await moderate("delete", lambda: interaction.message.delete(), bucket=f"channel:{interaction.message.channel.id}")
                     
                 else:
                     
                     if not response_sent:
                         if interaction.response.is_done():
-                            await interaction.followup.send(
+                            await ack(interaction, "followup", lambda: interaction.followup.send(
                                 "Could not find the held submissions channel. The submission has been marked as held for questions, but was not moved.",
                                 ephemeral=True
-                            )
+                            ))
                         else:
-                            await interaction.response.send_message(
+                            await ack(interaction, "response", lambda: interaction.response.send_message(
                                 "Could not find the held submissions channel. The submission has been marked as held for questions, but was not moved.",
                                 ephemeral=True
-                            )
+                            ))
                             response_sent = True
                             
 
-                    await interaction.message.edit(embed=embed, view=None)
+                    await moderate("edit", lambda: interaction.message.edit(embed=embed, view=None), bucket=f"channel:{interaction.message.channel.id}")
                     
             except (ValueError, AttributeError, discord.NotFound, discord.Forbidden) as e:
                 log.error(f"Error moving held submission: {e}")
                 if not response_sent:
                     if interaction.response.is_done():
-                        await interaction.followup.send(
+                        await ack(interaction, "followup", lambda: interaction.followup.send(
                             "An error occurred while moving the submission. The submission has been marked as held for questions, but was not moved.",
                             ephemeral=True
-                        )
+                        ))
                     else:
-                        await interaction.response.send_message(
+                        await ack(interaction, "response", lambda: interaction.response.send_message(
                             "An error occurred while moving the submission. The submission has been marked as held for questions, but was not moved.",
                             ephemeral=True
-                        )
+                        ))
                         response_sent = True
                         
                 
-                await interaction.message.edit(embed=embed, view=None)
+                await moderate("edit", lambda: interaction.message.edit(embed=embed, view=None), bucket=f"channel:{interaction.message.channel.id}")
         else:
             # For submissions or if channel isn't set, just update the message
             # If this is called from the modal, interaction.response is already used
             if interaction.response.is_done():
-                await interaction.message.edit(embed=embed, view=None)
+                await moderate("edit", lambda: interaction.message.edit(embed=embed, view=None), bucket=f"channel:{interaction.message.channel.id}")
                 if not response_sent:
-                    await interaction.followup.send(f"Submission has been marked as {status}.", ephemeral=True)
+                    await ack(interaction, "followup", lambda: interaction.followup.send(f"Submission has been marked as {status}.", ephemeral=True))
             else:
-                await interaction.response.edit_message(embed=embed, view=None)
-                await interaction.followup.send(f"Submission has been marked as {status}.", ephemeral=True)
+                await ack(interaction, "response", lambda: interaction.response.edit_message(embed=embed, view=None))
+                await ack(interaction, "followup", lambda: interaction.followup.send(f"Submission has been marked as {status}.", ephemeral=True))
         
         
         try:
-            submitter_id = self._extract_submitter_id(embed)
+            submitter_id = submission.submitter_id if submission else self._extract_submitter_id(embed)
             if not submitter_id:
-                await interaction.followup.send("Could not determine the submitter to notify.", ephemeral=True)
+                await ack(interaction, "followup", lambda: interaction.followup.send("Could not determine the submitter to notify.", ephemeral=True))
                 return
 
-            submitter = await interaction.client.fetch_user(submitter_id)
+            submitter = await moderate("user_fetch", lambda: interaction.client.fetch_user(submitter_id))
             if submitter:
                 
                 notification_embed = discord.Embed(
@@ -557,15 +711,86 @@ class SubmissionReviewButtons(discord.ui.View):
                     icon_url=interaction.user.avatar.url if interaction.user.avatar else None
                 )
                 
-                await submitter.send(embed=notification_embed)
-                await interaction.followup.send("Notification sent to the submitter.", ephemeral=True)
+                await moderate("dm", lambda: submitter.send(embed=notification_embed), bucket=f"user:{submitter.id}")
+                await ack(interaction, "followup", lambda: interaction.followup.send("Notification sent to the submitter.", ephemeral=True))
             else:
-                await interaction.followup.send("Could not find the submitter to notify.", ephemeral=True)
+                await ack(interaction, "followup", lambda: interaction.followup.send("Could not find the submitter to notify.", ephemeral=True))
         except discord.Forbidden:
-            await interaction.followup.send("Could not send DM to the submitter (DMs closed or blocked).", ephemeral=True)
+            await ack(interaction, "followup", lambda: interaction.followup.send("Could not send DM to the submitter (DMs closed or blocked).", ephemeral=True))
         except Exception as e:
             log.error(f"Error notifying submitter: {e}")
-            await interaction.followup.send("Error notifying the submitter.", ephemeral=True)
+            await ack(interaction, "followup", lambda: interaction.followup.send("Error notifying the submitter.", ephemeral=True))
+
+#====================
+# DYNAMIC ITEMS
+#====================
+# Buttons that carry the submission ID in their custom ID. discord.py routes clicks by pattern,
+# so no view is kept per message and every review goes through one shared view instance.
+REVIEW_ACTIONS = {
+    "accept": ("Accept", discord.ButtonStyle.success),
+    "deny": ("Deny", discord.ButtonStyle.danger),
+    "hold": ("Hold for Questions", discord.ButtonStyle.secondary),
+}
+
+_review_view: Optional[SubmissionReviewButtons] = None
+
+def shared_review_view() -> SubmissionReviewButtons:
+    global _review_view
+    if _review_view is None:
+        _review_view = SubmissionReviewButtons()
+    return _review_view
+
+# A view that only carries components; it's stopped so discord.py doesn't store it for the message
+def detached_view(*items: discord.ui.Item) -> discord.ui.View:
+    view = discord.ui.View(timeout=None)
+    for item in items:
+        view.add_item(item)
+    view.stop()
+    return view
+
+def review_view_for(submission_id: int) -> discord.ui.View:
+    return detached_view(*(ReviewButton(action, submission_id) for action in REVIEW_ACTIONS))
+
+# Accept/Deny/Hold for one submission
+class ReviewButton(discord.ui.DynamicItem[discord.ui.Button], template=r"review:(?P<action>accept|deny|hold):(?P<id>[0-9]+)"):
+    def __init__(self, action: str, submission_id: int):
+        label, style = REVIEW_ACTIONS[action]
+        super().__init__(discord.ui.Button(label=label, style=style, custom_id=f"review:{action}:{submission_id}"))
+        self.action = action
+        self.submission_id = submission_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match["action"], int(match["id"]))
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        await shared_review_view().route(interaction, self.action, self.submission_id)
+
+# Mark as Posted for one accepted submission
+class PostedItem(discord.ui.DynamicItem[discord.ui.Button], template=r"posted:(?P<id>[0-9]+)"):
+    def __init__(self, submission_id: int, posted: bool = False):
+        super().__init__(discord.ui.Button(
+            label="Posted" if posted else "Mark as Posted",
+            style=discord.ButtonStyle.primary,
+            custom_id=f"posted:{submission_id}",
+            disabled=posted
+        ))
+        self.submission_id = submission_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match["id"]))
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        submissions.store.mark_posted(self.submission_id)
+
+        embed = interaction.message.embeds[0]
+        if not embed.title.startswith("**POSTED**"):
+            embed.title = f"**POSTED** - {embed.title}"
+
+        view = detached_view(PostedItem(self.submission_id, posted=True))
+        await ack(interaction, "response", lambda: interaction.response.edit_message(embed=embed, view=view))
+        await ack(interaction, "followup", lambda: interaction.followup.send("Track marked as posted.", ephemeral=True))
 
 #====================
 # MAIN COG
@@ -583,12 +808,12 @@ class Forms(commands.Cog):
         channel: Optional[discord.TextChannel] = None
     ) -> None:
         # Check if user is the bot owner
-        owner_id = os.getenv("OWNER_ID")
-        if not owner_id or interaction.user.id != int(owner_id):
-            await interaction.response.send_message(
+        owner_id = settings.get().owner_id
+        if not owner_id or interaction.user.id != owner_id:
+            await ack(interaction, "response", lambda: interaction.response.send_message(
                 "❌ You don't have permission to use this command. Only the bot owner can use this command.",
                 ephemeral=True
-            )
+            ))
             return
 
         # Send the submission form embed with button to a channel.
@@ -597,11 +822,11 @@ class Forms(commands.Cog):
         embed = self._create_welcome_embed(interaction)
         view = SubmissionButton()
 
-        await target_channel.send(embed=embed, view=view)
-        await interaction.response.send_message(
+        await moderate("form_send", lambda: target_channel.send(embed=embed, view=view), bucket=f"channel:{target_channel.id}")
+        await ack(interaction, "response", lambda: interaction.response.send_message(
             f"✅ Submission form sent to {target_channel.mention}!", 
             ephemeral=True
-        )
+        ))
 
     def _create_welcome_embed(self, interaction: discord.Interaction) -> discord.Embed:
         # Create the welcome embed for the submission form.
@@ -1,92 +1,186 @@
 # (C) 2025 Hexa Vibes. Licensed under the MIT License.
 
+import asyncio
 import discord
-from discord.ext import commands
+import guild_settings
+import reaction_stats
+import settings
+import sqlite3
+from discord import app_commands
+from discord.ext import commands, tasks
 from time import time
-from os import getenv
 from random import choice
 from logger import Logger
+from rest_scheduler import LoadShed, Priority, ack, submit
 
 log = Logger("REACTS")
 
-BWAA_STICKERIDS = getenv("BWAA_STICKERIDS").split(",")
-MEOW_STICKERIDS = getenv("MEOW_STICKERIDS").split(",")
-PLUH_STICKERIDS = getenv("PLUH_STICKERIDS").split(",")
-FUMO_STICKERIDS = getenv("FUMO_STICKERIDS").split(",")
-FUMO_GIFS = getenv("FUMO_GIFS").split(",")
-GET_REAL_GIFS = getenv("GET_REAL_GIFS").split(",")
+COOLDOWN = 15  # seconds between replies, per guild
+
+def cooldown_key(message):
+    return message.guild.id if message.guild else message.channel.id
 
 class MessageReacts(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.message_ts = 0
+        # Cooldowns are per guild so that with sharding every guild (and shard) is throttled independently
+        self.message_ts = {}
+        self.stickers = {}
+
+        # Trigger counters are kept in memory and written in batches, off the message path
+        self.stats = reaction_stats.ReactionStats(settings.get().reaction_stats_file)
+        self.flush_stats.change_interval(seconds=settings.get().reaction_stats_interval)
+        self.flush_stats.start()
+
+    # Cooldowns still running survive a graceful restart
+    def save_state(self):
+        now = time()
+        return {str(key): ts for key, ts in self.message_ts.items() if now - ts < COOLDOWN}
+
+    def restore_state(self, state):
+        self.message_ts.update((int(key), ts) for key, ts in state.items())
+
+    async def cog_load(self):
+        self.warm_up_task = asyncio.create_task(self.warm_up())
+
+    async def cog_unload(self):
+        self.warm_up_task.cancel()
+        self.flush_stats.cancel()
+        await self.write_stats()
+
+    @tasks.loop(seconds=60)
+    async def flush_stats(self):
+        await self.write_stats()
+
+    async def write_stats(self):
+        rows = self.stats.take()
+        if not rows:
+            return
+        try:
+            await asyncio.to_thread(self.stats.write, rows)
+        except (OSError, sqlite3.Error) as e:
+            log.error(f"Could not write reaction stats, keeping them for the next flush: {e}")
+            self.stats.give_back(rows)
+
+    async def warm_up(self):
+        # Fill the sticker cache once connected so replies don't need a fetch first
+        await self.bot.wait_until_ready()
+        sticker_ids = {
+            response
+            for guild_id in [None, *(guild.id for guild in self.bot.guilds)]
+            for trigger, responses in guild_settings.get(guild_id).reactions
+            for response in responses if isinstance(response, int)
+        }
+        await asyncio.gather(*(self.get_sticker(x) for x in sticker_ids), return_exceptions=True)
+        log.info(f"Cached {len(self.stickers)}/{len(sticker_ids)} sticker(s)")
+
+    async def get_sticker(self, sticker_id):
+        sticker = self.stickers.get(sticker_id) or self.bot.get_sticker(sticker_id)
+        if sticker is None:
+            sticker = await submit(Priority.FUN, "sticker_fetch", lambda: self.bot.fetch_sticker(sticker_id))
+        self.stickers[sticker_id] = sticker
+        return sticker
 
     async def reply_sticker(self, message, sticker_id):
         try:
-            await message.reply(stickers=[await message.guild.fetch_sticker(sticker_id)])
+            sticker = await self.get_sticker(sticker_id)
+            await submit(Priority.FUN, "reply", lambda: message.reply(stickers=[sticker]), bucket=f"channel:{message.channel.id}")
+        except LoadShed:
+            return False
         except discord.Forbidden:
             log.error(f"Not allowed to reply (Message ID: {message.id})")
-            return
+            return False
         except discord.HTTPException as e:
             log.error(
                 f"HTTP Exception when replying (Message ID: {message.id}\n   {e}")
-            return
-        self.message_ts = time()
+            return False
+        self.message_ts[cooldown_key(message)] = time()
+        return True
 
     async def reply_text(self, message, text):
         try:
-            await message.reply(text)
+            await submit(Priority.FUN, "reply", lambda: message.reply(text), bucket=f"channel:{message.channel.id}")
+        except LoadShed:
+            return False
         except discord.Forbidden:
             log.error(f"Not allowed to reply (Message ID: {message.id})")
-            return
+            return False
         except discord.HTTPException as e:
             log.error(
                 f"HTTP Exception when replying (Message ID: {message.id}\n   {e}")
-            return
-        self.message_ts = time()
+            return False
+        self.message_ts[cooldown_key(message)] = time()
+        return True
 
-    async def fumo_reaction(self, message):
-        fumo_reacton_list = FUMO_STICKERIDS + FUMO_GIFS
-        selected_reaction = choice(fumo_reacton_list)
-        try:
-            int(selected_reaction[0])
-        except ValueError:
-            # can't convert to number so it's a link -> gif
-            await self.reply_text(message, selected_reaction)
-            return
+    async def react(self, message, responses):
+        selected_reaction = choice(responses)
+        if isinstance(selected_reaction, str):
+            # not an ID so it's a link -> gif
+            return await self.reply_text(message, selected_reaction)
 
-        # could convert so it's a number/ID -> sticker
-        await self.reply_sticker(message, selected_reaction)
+        # it's a number/ID -> sticker
+        return await self.reply_sticker(message, selected_reaction)
 
     @commands.Cog.listener()
     async def on_message(self, message):
-        if message.author.bot or (time() - self.message_ts < 15):
+        if message.author.bot:
             return
 
-        term = ""
-        terms = ["bwaa", "pluh", "fumo", "get real", "meow"]
+        # Triggers and their stickers/gifs are per guild, triggers without responses are disabled
+        config = guild_settings.get(message.guild.id if message.guild else None)
         text = message.content.lower()
 
         # parse implementation
-        term = next((x for x in terms if x in text), False)
-        if term == False:
+        match = next(((trigger, responses) for trigger, responses in config.reactions if responses and trigger in text), None)
+        if match is None:
             return
 
-        match term:
-            case "bwaa":  # sticker
-                await self.reply_sticker(message, choice(BWAA_STICKERIDS))
-            case "meow":  # sticker
-                await self.reply_sticker(message, choice(MEOW_STICKERIDS))
-            case "pluh":  # sticker
-                await self.reply_sticker(message, choice(PLUH_STICKERIDS))
-            case "fumo":  # sticker/gif
-                await self.fumo_reaction(message)
-            case "get real":
-                await self.reply_text(message, choice(GET_REAL_GIFS))
-            case "ban dami":  # regular messgae/embed
-                pass
-            case "fish":  # emoji reaction
-                pass
+        # Matched before the cooldown check so the stats show how often the cooldown swallows a trigger
+        trigger, responses = match
+        self.stats.record(trigger, message.channel.id, reaction_stats.MATCHED)
+        if time() - self.message_ts.get(cooldown_key(message), 0) < COOLDOWN:
+            self.stats.record(trigger, message.channel.id, reaction_stats.COOLDOWN)
+            return
+
+        if await self.react(message, responses):
+            self.stats.record(trigger, message.channel.id, reaction_stats.REPLIED)
+
+    @app_commands.command(name="reaction_stats", description="Show the most used reaction triggers and their reply rates")
+    @app_commands.describe(hours="How many hours back to look")
+    async def show_reaction_stats(self, interaction: discord.Interaction, hours: app_commands.Range[int, 1, 24 * 90] = 24) -> None:
+        owner_id = settings.get().owner_id
+        if not owner_id or interaction.user.id != owner_id:
+            await ack(interaction, "response", lambda: interaction.response.send_message(
+                "❌ You don't have permission to use this command. Only the bot owner can use this command.",
+                ephemeral=True
+            ))
+            return
+
+        # Acknowledge first, the flush and the queries can take a while on a large table
+        await ack(interaction, "defer", lambda: interaction.response.defer(ephemeral=True, thinking=True))
+        await self.write_stats()
+        since_hour = int(time()) // 3600 - hours + 1
+        try:
+            triggers = await asyncio.to_thread(self.stats.top_triggers, since_hour)
+            channels = await asyncio.to_thread(self.stats.top_channels, since_hour)
+        except (OSError, sqlite3.Error) as e:
+            log.error(f"Could not read reaction stats: {e}")
+            await ack(interaction, "followup", lambda: interaction.followup.send("❌ Could not read the reaction stats.", ephemeral=True))
+            return
+
+        lines = [f"**Top triggers, last {hours}h**"]
+        for trigger, matched, replied, cooldown in triggers:
+            lines.append(
+                f"`{trigger}`: {matched} matched, {replied} replied ({replied / matched:.0%}), "
+                f"{cooldown} on cooldown ({cooldown / matched:.0%})"
+            )
+        if not triggers:
+            lines.append("No triggers matched yet.")
+        else:
+            lines.append("**Top channels**")
+            lines.extend(f"<#{channel_id}>: {matched} matched, {replied} replied" for channel_id, matched, replied in channels)
+
+        await ack(interaction, "followup", lambda: interaction.followup.send("\n".join(lines), ephemeral=True))
 
 
 async def setup(bot: commands.Bot):
@@ -0,0 +1,229 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import discord
+import settings
+import submissions
+import time
+from collections import defaultdict
+from discord import app_commands
+from discord.ext import commands
+from typing import Any, Dict, Hashable, List, Optional
+from deadline_scheduler import DeadlineScheduler
+from logger import Logger
+from rest_scheduler import ack, moderate
+
+log = Logger("REVIEWS")
+
+HOUR = 3600
+SUMMARY = "summary"
+REMINDER_COLOR = 0xf1c40f
+SUMMARY_COLOR = 0x9b59b6
+# Submissions listed per message, the rest are only counted
+MAX_LISTED = 10
+# Reminders coming due this close together go out as one message
+REMINDER_SLACK = 15 * 60
+# Seconds before a reminder that failed to send is tried again
+RETRY_DELAY = 10 * 60
+# Reviews the time-to-first-review figures are computed over
+REVIEW_WINDOW = 30 * 24 * HOUR
+
+
+def format_age(seconds: float) -> str:
+    minutes = int(seconds) // 60
+    days, minutes = divmod(minutes, 24 * 60)
+    hours, minutes = divmod(minutes, 60)
+    if days:
+        return f"{days}d {hours}h"
+    if hours:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m"
+
+
+def describe(submission: submissions.Submission, now: float) -> str:
+    # Brackets would break out of the masked link
+    song = discord.utils.escape_markdown(submission.song[:60].translate(str.maketrans("[]", "()")))
+    artist = discord.utils.escape_markdown(submission.artist[:60])
+    link = f"https://discord.com/channels/{submission.guild_id or '@me'}/{submission.channel_id}/{submission.message_id}"
+    return f"• [{song}]({link}) by {artist}, waiting {format_age(now - submission.created_at)}"
+
+
+class ReviewQueue(commands.Cog):
+    """
+    Reminds reviewers of submissions left pending and posts a periodic summary of the queue.
+
+    Every pending submission and the summary are entries of one DeadlineScheduler, so the queue
+    costs a single timer however many submissions are waiting. Reminders that come due together
+    are posted as one message per submission channel.
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.deadlines = DeadlineScheduler(self.on_due, slack=REMINDER_SLACK, retry_delay=RETRY_DELAY)
+        settings.subscribe(self._on_settings_reload)
+
+    async def cog_load(self):
+        self.schedule_all()
+        self.deadlines.start()
+
+    async def cog_unload(self):
+        settings.unsubscribe(self._on_settings_reload)
+        await self.deadlines.close()
+
+    def _on_settings_reload(self, old: settings.Settings, new: settings.Settings):
+        if (old.review_reminder_hours, old.review_summary_hours) != (new.review_reminder_hours, new.review_summary_hours):
+            self.schedule_all()
+
+    # The next summary keeps its time across a graceful restart instead of starting a new interval
+    def save_state(self) -> Dict[str, Any]:
+        return {"summary_at": self.deadlines.get(SUMMARY)}
+
+    def restore_state(self, state: Dict[str, Any]):
+        if state.get("summary_at") and settings.get().review_summary_hours:
+            self.deadlines.schedule(SUMMARY, state["summary_at"])
+
+    #====================
+    # SCHEDULING
+    #====================
+    def schedule_all(self):
+        for submission in submissions.store.pending():
+            self.schedule_reminder(submission)
+        self.schedule_summary()
+
+    @staticmethod
+    def reminder_age() -> float:
+        return settings.get().review_reminder_hours * HOUR
+
+    def schedule_reminder(self, submission: submissions.Submission):
+        age = self.reminder_age()
+        if age:
+            self.deadlines.schedule(submission.id, submission.created_at + age * (submission.reminders + 1))
+        else:
+            self.deadlines.cancel(submission.id)
+
+    def schedule_summary(self):
+        interval = settings.get().review_summary_hours * HOUR
+        if interval:
+            self.deadlines.schedule(SUMMARY, time.time() + interval)
+        else:
+            self.deadlines.cancel(SUMMARY)
+
+    @commands.Cog.listener()
+    async def on_submission_created(self, submission: submissions.Submission):
+        self.schedule_reminder(submission)
+
+    @commands.Cog.listener()
+    async def on_submission_reviewed(self, submission: submissions.Submission):
+        self.deadlines.cancel(submission.id)
+        log.info(f"Submission {submission.id} {submission.status} {format_age(submission.reviewed_at - submission.created_at)} after it was sent")
+
+    async def on_due(self, keys: List[Hashable]):
+        await self.bot.wait_until_ready()
+        now = time.time()
+        age = self.reminder_age()
+
+        due = defaultdict(list)
+        for key in keys:
+            submission = submissions.store.get(key) if key != SUMMARY else None
+            if submission is None or not submission.pending or not age:
+                continue
+            due[submission.channel_id].append(submission)
+
+        for channel_id, batch in due.items():
+            # One channel failing must not hold up the reminders of the others
+            try:
+                await self.send_reminder(channel_id, batch, now)
+            except (discord.NotFound, discord.Forbidden) as e:
+                # Retrying won't help, count the period as reminded and try again next period
+                log.error(f"Could not send a review reminder to channel {channel_id}: {e}")
+            except Exception as e:
+                log.error(f"Could not send a review reminder to channel {channel_id}, retrying in {RETRY_DELAY // 60}m: {e!r}")
+                for submission in batch:
+                    self.deadlines.schedule(submission.id, now + RETRY_DELAY)
+                continue
+            # Count every period that has passed, so a submission that waited through several
+            # (e.g. while the bot was offline) gets one reminder rather than one per period
+            submissions.store.mark_reminded({x.id: max(x.reminders + 1, int((now - x.created_at) // age)) for x in batch})
+            for submission in batch:
+                self.schedule_reminder(submission)
+
+        if SUMMARY in keys:
+            self.schedule_summary()
+            await self.post_summaries(now)
+
+    #====================
+    # MESSAGES
+    #====================
+    async def get_channel(self, channel_id: int):
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            channel = await moderate("channel_fetch", lambda: self.bot.fetch_channel(channel_id))
+        return channel
+
+    async def send_reminder(self, channel_id: int, batch: List[submissions.Submission], now: float):
+        channel = await self.get_channel(channel_id)
+
+        batch.sort(key=lambda x: x.created_at)
+        lines = [describe(x, now) for x in batch[:MAX_LISTED]]
+        if len(batch) > MAX_LISTED:
+            lines.append(f"…and {len(batch) - MAX_LISTED} more, see `/review_queue`")
+        embed = discord.Embed(
+            title=f"⏰ {len(batch)} submission(s) waiting for review",
+            description="\n".join(lines),
+            color=REMINDER_COLOR
+        )
+
+        # Only ping the reviewer role in the server it belongs to
+        role_id = settings.get().reviewer_role_id
+        role = channel.guild.get_role(role_id) if role_id and getattr(channel, "guild", None) else None
+        content = role.mention if role else None
+        await moderate("review_reminder", lambda: channel.send(content=content, embed=embed), bucket=f"channel:{channel.id}")
+
+    def summary_embed(self, pending: List[submissions.Submission], guild_id: Optional[int], now: float) -> discord.Embed:
+        pending = sorted(pending, key=lambda x: x.created_at)
+        age = self.reminder_age()
+        overview = f"**{len(pending)}** pending"
+        if pending:
+            overview += f", the oldest waiting {format_age(now - pending[0].created_at)}"
+        if pending and age:
+            overdue = sum(now - x.created_at >= age for x in pending)
+            overview += f", {overdue} past {format_age(age)}"
+
+        # Time to first review, measured from when the submission was sent until a reviewer clicked
+        times = sorted(x.reviewed_at - x.created_at for x in submissions.store.reviewed(now - REVIEW_WINDOW) if x.guild_id == guild_id)
+        if times:
+            median = times[len(times) // 2]
+            p90 = times[min(len(times) - 1, int(len(times) * 0.9))]
+            review_times = f"Time to first review (30 days, {len(times)} reviewed): median {format_age(median)}, p90 {format_age(p90)}"
+        else:
+            review_times = "No submissions reviewed in the last 30 days"
+
+        lines = [overview, review_times]
+        lines.extend(describe(x, now) for x in pending[:MAX_LISTED])
+        if len(pending) > MAX_LISTED:
+            lines.append(f"…and {len(pending) - MAX_LISTED} more")
+        return discord.Embed(title="📋 Review queue", description="\n".join(lines), color=SUMMARY_COLOR)
+
+    async def post_summaries(self, now: float):
+        by_channel = defaultdict(list)
+        for submission in submissions.store.pending():
+            by_channel[submission.channel_id].append(submission)
+
+        for channel_id, pending in by_channel.items():
+            try:
+                channel = await self.get_channel(channel_id)
+                embed = self.summary_embed(pending, pending[0].guild_id, now)
+                await moderate("review_summary", lambda: channel.send(embed=embed), bucket=f"channel:{channel.id}")
+            except Exception as e:
+                log.error(f"Could not post the review queue summary to channel {channel_id}: {e!r}")
+
+    @app_commands.command(name="review_queue", description="Show the pending submissions and how fast they get reviewed")
+    @app_commands.guild_only()
+    @app_commands.default_permissions(manage_messages=True)
+    async def show_review_queue(self, interaction: discord.Interaction) -> None:
+        pending = [x for x in submissions.store.pending() if x.guild_id == interaction.guild_id]
+        embed = self.summary_embed(pending, interaction.guild_id, time.time())
+        await ack(interaction, "response", lambda: interaction.response.send_message(embed=embed, ephemeral=True))
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(ReviewQueue(bot))
@@ -0,0 +1,105 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import discord
+import math
+import settings
+import time
+from collections import defaultdict
+from discord import app_commands
+from discord.ext import commands, tasks
+from logger import Logger
+from rest_scheduler import ack
+
+log = Logger("SHARDS")
+
+class ShardStats(commands.Cog):
+    """
+    Tracks per-shard gateway latency and event rates.
+    Works the same for a plain Bot, which is reported as shard 0.
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.events = defaultdict(int)
+        self.window_events = defaultdict(int)
+        self.window_started = time.monotonic()
+        self.report_stats.start()
+
+    def cog_unload(self):
+        self.report_stats.cancel()
+
+    def count(self, guild):
+        shard_id = guild.shard_id if guild else 0
+        self.events[shard_id] += 1
+        self.window_events[shard_id] += 1
+
+    def latencies(self):
+        # AutoShardedBot exposes (shard_id, latency) pairs, a plain Bot only has one connection
+        if isinstance(self.bot, commands.AutoShardedBot):
+            return self.bot.latencies
+        return [(0, self.bot.latency)]
+
+    def snapshot(self):
+        """Returns (shard_id, latency_ms, events/min, total events) rows for the current rate window."""
+        elapsed = max(time.monotonic() - self.window_started, 1e-6)
+        rows = []
+        for shard_id, latency in self.latencies():
+            latency_ms = latency * 1000 if math.isfinite(latency) else None
+            rate = self.window_events[shard_id] * 60 / elapsed
+            rows.append((shard_id, latency_ms, rate, self.events[shard_id]))
+        return rows
+
+    @staticmethod
+    def format_row(row):
+        shard_id, latency_ms, rate, total = row
+        latency = f"{latency_ms:.0f}ms" if latency_ms is not None else "n/a"
+        return f"Shard {shard_id}: latency {latency}, {rate:.1f} events/min, {total} total"
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        self.count(message.guild)
+
+    @commands.Cog.listener()
+    async def on_interaction(self, interaction):
+        self.count(interaction.guild)
+
+    @commands.Cog.listener()
+    async def on_shard_ready(self, shard_id):
+        log.info(f"Shard {shard_id} ready")
+
+    @commands.Cog.listener()
+    async def on_shard_resumed(self, shard_id):
+        log.info(f"Shard {shard_id} resumed")
+
+    @commands.Cog.listener()
+    async def on_shard_disconnect(self, shard_id):
+        log.warn(f"Shard {shard_id} disconnected")
+
+    @tasks.loop(minutes=10)
+    async def report_stats(self):
+        for row in self.snapshot():
+            log.info(self.format_row(row))
+        self.window_events.clear()
+        self.window_started = time.monotonic()
+
+    @report_stats.before_loop
+    async def before_report(self):
+        await self.bot.wait_until_ready()
+        self.window_started = time.monotonic()
+
+    @app_commands.command(name="shard_stats", description="Show per-shard latency and event rates")
+    async def shard_stats(self, interaction: discord.Interaction) -> None:
+        owner_id = settings.get().owner_id
+        if not owner_id or interaction.user.id != owner_id:
+            await ack(interaction, "response", lambda: interaction.response.send_message(
+                "❌ You don't have permission to use this command. Only the bot owner can use this command.",
+                ephemeral=True
+            ))
+            return
+
+        lines = [self.format_row(row) for row in self.snapshot()]
+        await ack(interaction, "response", lambda: interaction.response.send_message("\n".join(lines) or "No shards connected.", ephemeral=True))
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(ShardStats(bot))
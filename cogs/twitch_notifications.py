@@ -1,40 +1,34 @@
 # (C) 2025 Hexa Vibes. Licensed under the MIT License.
 
+import asyncio
 import discord
-import os
-import requests
+import guild_settings
+import settings
 from discord import app_commands
 from discord.ext import commands, tasks
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Set, Tuple
 from logger import Logger
+from rest_scheduler import Priority, submit
+from tracing import trace, span, traced
 
 log = Logger("TWITCH")
 class TwitchNotifications(commands.Cog):
     """
-    A cog that monitors Twitch streams and sends Discord notifications when the streamer goes live.
+    A cog that monitors Twitch streams and sends Discord notifications when a watched streamer goes live.
+    Watch targets are the global TWITCH_USERNAME plus every guild's own, all checked with one batched request.
     """
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
-        # Load environment variables
-        self.client_id = os.getenv("TWITCH_CLIENT_ID")
-        self.client_secret = os.getenv("TWITCH_CLIENT_SECRET")
-        self.username = os.getenv("TWITCH_USERNAME")
-
-        # Parse numeric environment variables with error handling
-        try:
-            self.notification_channel_id = int(os.getenv("TWITCH_NOTIFICATION_CHANNELID", "0"))
-        except ValueError:
-            log.error("Invalid channel ID in environment variables")
-            self.notification_channel_id = 0
-
         # API related attributes
         self.access_token: Optional[str] = None
         self.headers: Dict[str, str] = {}
 
-        # State management
-        self.is_live = False
+        # State management, the logins currently live
+        self.live: Set[str] = set()
+
+        settings.subscribe(self._on_settings_reload)
 
         # Validate configuration
         if not self._validate_config():
@@ -44,28 +38,59 @@ class TwitchNotifications(commands.Cog):
         # Start the background task
         self.check_stream_status.start()
 
+    @property
+    def client_id(self) -> Optional[str]:
+        return settings.get().twitch_client_id
+
+    @property
+    def client_secret(self) -> Optional[str]:
+        return settings.get().twitch_client_secret
+
+    @property
+    def targets(self) -> Dict[str, Tuple[int, ...]]:
+        """Watched logins mapped to the channels to notify, cached by the guild settings store."""
+        return guild_settings.store.twitch_targets()
+
     def _validate_config(self) -> bool:
         """Validates the configuration and returns True if valid."""
-        required_vars = [self.client_id, self.client_secret, self.username]
+        # Targets can be added per guild at runtime, so only the credentials are required up front
+        required_vars = [self.client_id, self.client_secret]
         if not all(required_vars):
             log.error("Missing required Twitch API credentials")
             return False
 
-        if self.notification_channel_id == 0:
-            log.error("Invalid notification channel ID")
-            return False
-
         return True
 
+    def _on_settings_reload(self, old: settings.Settings, new: settings.Settings):
+        """Applies a configuration reload without restarting the cog."""
+        if (old.twitch_client_id, old.twitch_client_secret) != (new.twitch_client_id, new.twitch_client_secret):
+            self.access_token = None
+            self.headers = {}
+
+        if not self._validate_config():
+            self.check_stream_status.cancel()
+        elif not self.check_stream_status.is_running():
+            self.check_stream_status.start()
+
     def cog_unload(self):
         """Gracefully stop the task when the cog is unloaded."""
+        settings.unsubscribe(self._on_settings_reload)
         self.check_stream_status.cancel()
 
+    def save_state(self) -> Dict[str, Any]:
+        """Logins that were live at shutdown, so a restart mid-stream doesn't notify again."""
+        return {"live": sorted(self.live)}
+
+    def restore_state(self, state: Dict[str, Any]):
+        self.live.update(state.get("live", []))
+
     def _get_access_token(self) -> bool:
+        # requests takes longer to import than the rest of the cog, only pay for it once Twitch is polled
+        import requests
 
         try:
             response = requests.post(
-                "https://id.twitch.tv/oauth2/token",
+                f"{settings.get().twitch_auth_url}/token",
                 params={
                     "client_id": self.client_id,
                     "client_secret": self.client_secret,
@@ -90,88 +115,133 @@ class TwitchNotifications(commands.Cog):
             self.headers = {}
             return False
 
-    def _make_api_request(self) -> Optional[Dict[str, Any]]:
+    def _make_api_request(self, logins: List[str]) -> Optional[Dict[str, Any]]:
         """
-        Makes a request to the Twitch API to check stream status.
+        Makes requests to the Twitch API to check the stream status of several logins.
+        Helix accepts up to 100 `user_login` parameters per call, so one request covers most setups.
+
+        Args:
+            logins: Twitch logins to check
 
         Returns:
-            Optional[Dict]: API response data or None if failed
+            Optional[Dict]: API response data of every batch or None if failed
         """
-        try:
-            response = requests.get(
-                f"https://api.twitch.tv/helix/streams?user_login={self.username}",
-                headers=self.headers,
-                timeout=10
-            )
-
-            # Handle token expiration
-            if response.status_code == 401:
-                log.warn("Twitch access token expired. Refreshing...")
-                if self._get_access_token():
-                    response = requests.get(
-                        f"https://api.twitch.tv/helix/streams?user_login={self.username}",
-                        headers=self.headers,
-                        timeout=10
-                    )
-                else:
-                    return None
-
-            response.raise_for_status()
-            return response.json()
-
-        except requests.exceptions.RequestException as e:
-            log.error(f"Error making Twitch API request: {e}")
-            return None
+        import requests
+
+        data = []
+        for start in range(0, len(logins), 100):
+            params = [("user_login", login) for login in logins[start:start + 100]]
+            try:
+                response = requests.get(
+                    f"{settings.get().twitch_api_url}/streams",
+                    params=params,
+                    headers=self.headers,
+                    timeout=10
+                )
+
+                # Handle token expiration
+                if response.status_code == 401:
+                    log.warn("Twitch access token expired. Refreshing...")
+                    if self._get_access_token():
+                        response = requests.get(
+                            f"{settings.get().twitch_api_url}/streams",
+                            params=params,
+                            headers=self.headers,
+                            timeout=10
+                        )
+                    else:
+                        return None
+
+                response.raise_for_status()
+                data.extend(response.json().get("data", []))
+
+            except requests.exceptions.RequestException as e:
+                log.error(f"Error making Twitch API request: {e}")
+                return None
+
+        return {"data": data}
 
     @tasks.loop(minutes=1)
     async def check_stream_status(self):
         """Checks the Twitch API every minute to monitor stream status."""
-        # Ensure we have a valid access token
-        if not self.access_token and not self._get_access_token():
+        with trace("twitch.check", targets=len(self.targets)):
+            await self._check_stream_status()
+
+    async def _check_stream_status(self):
+        targets = {}
+        for login, channel_ids in self.targets.items():
+            channel_ids = self._visible_channels(channel_ids)
+            if channel_ids:
+                targets[login] = channel_ids
+        if not targets:
             return
 
+        # requests blocks for up to its timeout, so the calls to Twitch run in a worker thread
+        # Ensure we have a valid access token
+        if not self.access_token:
+            with span("token"):
+                if not await asyncio.to_thread(self._get_access_token):
+                    return
+
         # Make API request
-        api_data = self._make_api_request()
+        with span("fetch", logins=len(targets)):
+            api_data = await asyncio.to_thread(self._make_api_request, list(targets))
         if api_data is None:
             return
 
-        stream_data = api_data.get("data", [])
+        streams = {stream["user_login"].lower(): stream for stream in api_data.get("data", []) if stream.get("user_login")}
 
         # Handle stream state changes
-        if stream_data:
+        for login, stream_info in streams.items():
             # Stream is LIVE
-            if not self.is_live:
-                self.is_live = True
-                stream_info = stream_data[0]
-                await self._send_live_notification(stream_info)
-        else:
-            # Stream is OFFLINE
-            if self.is_live:
-                log.info(f"{self.username} has gone offline")
-                self.is_live = False
-
-    async def _send_live_notification(self, stream_info: Dict[str, Any]):
+            if login not in self.live and login in targets:
+                self.live.add(login)
+                await traced("notify", self._send_live_notification(stream_info, targets[login]))
+
+        for login in self.live - streams.keys():
+            # Stream is OFFLINE (or no longer watched)
+            log.info(f"{login} has gone offline")
+            self.live.discard(login)
+
+    def _visible_channels(self, channel_ids: Tuple[int, ...]) -> Tuple[int, ...]:
+        """
+        When shards are split across processes, only the process holding a notification
+        channel's shard notifies it, so every go-live is announced exactly once per channel.
         """
-        Sends a live notification to the designated Discord channel.
+        if not isinstance(self.bot, commands.AutoShardedBot) or self.bot.shard_ids is None:
+            return channel_ids
+        return tuple(channel_id for channel_id in channel_ids if self.bot.get_channel(channel_id) is not None)
+
+    async def _send_live_notification(self, stream_info: Dict[str, Any], channel_ids: Tuple[int, ...]):
+        """
+        Sends a live notification to every channel watching the streamer.
 
         Args:
             stream_info: Dictionary containing stream information from Twitch API
+            channel_ids: IDs of the channels to notify
         """
-        channel = self.bot.get_channel(self.notification_channel_id)
-        if not channel:
-            log.error(f"Notification channel with ID {self.notification_channel_id} not found")
-            return
-
-        print(f"{self.username} is live! Sending notification...")
+        username = stream_info.get("user_name") or stream_info["user_login"]
+        print(f"{username} is live! Sending notification...")
 
         # Create embed
         embed = self._create_live_embed(stream_info)
 
-        # Send notification
-        await channel.send(
-            content=f"Hey everyone, @here! **{self.username}** just went live!",
-            embed=embed
-        )
+        async def send(channel_id: int):
+            channel = self.bot.get_channel(channel_id)
+            if not channel:
+                log.error(f"Notification channel with ID {channel_id} not found")
+                return
+
+            await submit(Priority.NOTIFICATION, "live_notification", lambda: channel.send(
+                content=f"Hey everyone, @here! **{username}** just went live!",
+                embed=embed
+            ), bucket=f"channel:{channel.id}")
+
+        # Send notifications
+        results = await asyncio.gather(*(send(channel_id) for channel_id in channel_ids), return_exceptions=True)
+        for channel_id, result in zip(channel_ids, results):
+            if isinstance(result, Exception):
+                log.error(f"Could not notify channel {channel_id}: {result}")
 
     def _create_live_embed(self, stream_info: Dict[str, Any]) -> discord.Embed:
         """
@@ -183,15 +253,17 @@ class TwitchNotifications(commands.Cog):
         Returns:
             discord.Embed: Formatted embed for the notification
         """
+        login = stream_info["user_login"]
+        username = stream_info.get("user_name") or login
         embed = discord.Embed(
             title=f"🔴 LIVE: {stream_info.get('title', 'No Title')}",
-            url=f"https://twitch.tv/{self.username}",
+            url=f"https://twitch.tv/{login}",
             color=discord.Color.purple()
         )
 
         embed.set_author(
-            name=f"{self.username} is now streaming!",
-            url=f"https://twitch.tv/{self.username}"
+            name=f"{username} is now streaming!",
+            url=f"https://twitch.tv/{login}"
         )
 
         embed.add_field(
@@ -217,8 +289,10 @@ class TwitchNotifications(commands.Cog):
 
     @check_stream_status.before_loop
     async def before_check(self):
-        """Ensures the bot is ready before starting the loop."""
+        """Ensures the bot is ready before starting the loop, then warms up the access token off the event loop."""
         await self.bot.wait_until_ready()
+        if not self.access_token:
+            await asyncio.to_thread(self._get_access_token)
 
 
 async def setup(bot: commands.Bot):
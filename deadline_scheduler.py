@@ -0,0 +1,107 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from logger import Logger
+
+log = Logger("DEADLINES")
+
+
+class DeadlineScheduler:
+    """
+    Min-heap of (deadline, key) entries driven by a single timer task.
+
+    The timer sleeps until the earliest deadline, pops every entry that is due and hands their
+    keys to `on_due` in one call, so thousands of scheduled items cost one sleeping task.
+    Deadlines are wall clock timestamps since they're derived from persisted records.
+    Scheduling a key again moves it and `cancel` forgets it, the stale heap entry is
+    skipped when it comes up instead of being searched for.
+    Entries due within `slack` seconds of the earliest one fire together with it. If `on_due`
+    raises, its keys that weren't scheduled again fire once more `retry_delay` seconds later.
+    """
+
+    def __init__(self, on_due: Callable[[List[Hashable]], Awaitable[None]], slack: float = 0, retry_delay: float = 60):
+        self.on_due = on_due
+        self.slack = slack
+        self.retry_delay = retry_delay
+        self.heap: List[Tuple[float, int, Hashable]] = []
+        self.deadlines: Dict[Hashable, float] = {}
+        self.counter = itertools.count()
+        self.wakeup: Optional[asyncio.Event] = None
+        self.timer: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.deadlines)
+
+    def schedule(self, key: Hashable, when: float):
+        """Fires `key` at `when`, replacing its previous deadline."""
+        self.deadlines[key] = when
+        entry = (when, next(self.counter), key)
+        heapq.heappush(self.heap, entry)
+        # Only an entry that became the earliest needs the timer to wake up early
+        if self.wakeup is not None and self.heap[0] is entry:
+            self.wakeup.set()
+
+    def cancel(self, key: Hashable):
+        self.deadlines.pop(key, None)
+
+    def get(self, key: Hashable) -> Optional[float]:
+        return self.deadlines.get(key)
+
+    def next_deadline(self) -> Optional[float]:
+        self._drop_stale()
+        return self.heap[0][0] if self.heap else None
+
+    def _drop_stale(self):
+        while self.heap and self.deadlines.get(self.heap[0][2]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+        # Moved and cancelled entries pile up when their deadlines are far away, rebuild once they dominate
+        if len(self.heap) > 2 * len(self.deadlines) + 64:
+            self.heap = [entry for entry in self.heap if self.deadlines.get(entry[2]) == entry[0]]
+            heapq.heapify(self.heap)
+
+    def pop_due(self, now: float) -> List[Hashable]:
+        due = []
+        while True:
+            self._drop_stale()
+            if not self.heap or self.heap[0][0] > now:
+                return due
+            when, _, key = heapq.heappop(self.heap)
+            del self.deadlines[key]
+            due.append(key)
+
+    def start(self):
+        if self.timer is None:
+            self.wakeup = asyncio.Event()
+            self.timer = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            deadline = self.next_deadline()
+            delay = None if deadline is None else deadline - time.time()
+            if delay is None or delay > 0:
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            due = self.pop_due(time.time() + self.slack)
+            try:
+                await self.on_due(due)
+            except Exception as e:
+                retry = [key for key in due if key not in self.deadlines]
+                log.error(f"Handling {len(due)} due deadline(s) failed, retrying {len(retry)} in {self.retry_delay:.0f}s: {e!r}")
+                for key in retry:
+                    self.schedule(key, time.time() + self.retry_delay)
+
+    async def close(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            await asyncio.gather(self.timer, return_exceptions=True)
+            self.timer = None
+            self.wakeup = None
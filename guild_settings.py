@@ -0,0 +1,225 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import asyncio
+import atomic_file
+import json
+import settings
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+from logger import Logger
+
+log = Logger("GUILDS")
+
+# A reaction response is a sticker ID or a text/GIF link
+Response = Union[int, str]
+
+CHANNEL_KINDS = ("submission", "accepted", "rejected", "held")
+
+# Triggers match anywhere in a message, so very short ones would fire on nearly everything
+MIN_TRIGGER_LENGTH = 3
+
+
+@dataclass(frozen=True)
+class GuildConfig:
+    """
+    Effective, immutable configuration of one guild: its own overrides on top of the global settings.
+
+    Global channel IDs only apply to guilds that haven't set any channel themselves, so a partner
+    server that configures its own submission channel never spills into the home server's archives.
+    A guild's first channel edit keeps the global channels that are its own, see `set_channel`.
+    """
+
+    guild_id: Optional[int]
+    submission_channel_id: Optional[int]
+    accepted_channel_id: Optional[int]
+    rejected_channel_id: Optional[int]
+    held_channel_id: Optional[int]
+    # (trigger, responses) in match order; an empty tuple disables the trigger
+    reactions: Tuple[Tuple[str, Tuple[Response, ...]], ...]
+    # (Twitch login, notification channel ID)
+    twitch_targets: Tuple[Tuple[str, int], ...]
+
+
+def default_reactions(config: settings.Settings) -> Dict[str, Tuple[Response, ...]]:
+    """The reaction triggers configured through the environment, in their historical match order."""
+    return {
+        "bwaa": config.bwaa_sticker_ids,
+        "pluh": config.pluh_sticker_ids,
+        "fumo": config.fumo_sticker_ids + config.fumo_gifs,
+        "get real": config.get_real_gifs,
+        "meow": config.meow_sticker_ids,
+    }
+
+
+def normalize_trigger(trigger: str) -> str:
+    """
+    Returns the stored form of a reaction trigger.
+
+    Raises:
+        ValueError: If the trigger is shorter than MIN_TRIGGER_LENGTH once trimmed
+    """
+    trigger = trigger.strip().lower()
+    if len(trigger) < MIN_TRIGGER_LENGTH:
+        raise ValueError(f"Triggers need at least {MIN_TRIGGER_LENGTH} characters")
+    return trigger
+
+
+class GuildSettingsStore:
+    """
+    Per-guild overrides persisted to a local JSON file.
+
+    Resolved GuildConfig objects are cached per guild, so an event costs one dict lookup;
+    an edit only invalidates that guild and a global settings reload invalidates all of them.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.overrides: Dict[int, Dict[str, Any]] = {}
+        self.resolved: Dict[Optional[int], GuildConfig] = {}
+        self._twitch_targets: Optional[Dict[str, Tuple[int, ...]]] = None
+        # Writes run in a thread, the lock keeps two edits from landing out of order
+        self.write_lock = asyncio.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        except (OSError, ValueError) as e:
+            log.error(f"Could not read guild settings from {self.path}: {e}")
+            data = {}
+
+        self.overrides = {int(guild_id): value for guild_id, value in data.items()}
+        self.invalidate()
+
+    async def save(self):
+        # Serialized on the loop so a later edit can't change what's being written
+        text = json.dumps({str(guild_id): value for guild_id, value in self.overrides.items()}, indent=2)
+        async with self.write_lock:
+            await asyncio.to_thread(atomic_file.write_text, self.path, text)
+
+    def invalidate(self, guild_id: Optional[int] = None):
+        if guild_id is None:
+            self.resolved.clear()
+        else:
+            self.resolved.pop(guild_id, None)
+        self._twitch_targets = None
+
+    def get(self, guild_id: Optional[int]) -> GuildConfig:
+        """Returns the effective configuration of a guild (None for DMs)."""
+        config = self.resolved.get(guild_id)
+        if config is None:
+            config = self.resolved[guild_id] = self._resolve(guild_id)
+        return config
+
+    def _resolve(self, guild_id: Optional[int]) -> GuildConfig:
+        base = settings.get()
+        override = self.overrides.get(guild_id, {})
+
+        channels = override.get("channels")
+        if channels is None:
+            channels = {kind: getattr(base, f"{kind}_channel_id") for kind in CHANNEL_KINDS}
+
+        reactions = default_reactions(base)
+        for trigger, responses in override.get("reactions", {}).items():
+            # Skips triggers saved before they were validated, an empty one would match every message
+            if len(trigger.strip()) >= MIN_TRIGGER_LENGTH:
+                reactions[trigger] = tuple(responses)
+
+        return GuildConfig(
+            guild_id=guild_id,
+            submission_channel_id=channels.get("submission"),
+            accepted_channel_id=channels.get("accepted"),
+            rejected_channel_id=channels.get("rejected"),
+            held_channel_id=channels.get("held"),
+            reactions=tuple(reactions.items()),
+            twitch_targets=tuple((login, channel_id) for login, channel_id in override.get("twitch", {}).items()),
+        )
+
+    def twitch_targets(self) -> Dict[str, Tuple[int, ...]]:
+        """Every watched Twitch login (lowercase) mapped to the channels to notify, including the global one."""
+        if self._twitch_targets is None:
+            targets: Dict[str, Tuple[int, ...]] = {}
+            base = settings.get()
+            if base.twitch_username and base.twitch_notification_channel_id:
+                targets[base.twitch_username.lower()] = (base.twitch_notification_channel_id,)
+            for override in self.overrides.values():
+                for login, channel_id in override.get("twitch", {}).items():
+                    if channel_id not in targets.get(login, ()):
+                        targets[login] = targets.get(login, ()) + (channel_id,)
+            self._twitch_targets = targets
+        return self._twitch_targets
+
+    # Editing
+
+    async def _edit(self, guild_id: int, edit):
+        override = self.overrides.setdefault(guild_id, {})
+        edit(override)
+        if not override:
+            del self.overrides[guild_id]
+        self.invalidate(guild_id)
+        await self.save()
+
+    async def set_channel(self, guild_id: int, kind: str, channel_id: Optional[int],
+                          owns: Callable[[int], bool] = lambda channel_id: True):
+        """
+        Sets or clears (None) one of a guild's channels.
+
+        The first channel edit of a guild stops the global channels from applying to it, so the
+        global ones it still uses are copied into its overrides first. `owns` tells whether a global
+        channel belongs to the guild; channels of other servers are left unset instead.
+        """
+        if kind not in CHANNEL_KINDS:
+            raise ValueError(f"Unknown channel kind '{kind}'")
+        inherited = {}
+        if "channels" not in self.overrides.get(guild_id, {}):
+            current = self.get(guild_id)
+            for other in CHANNEL_KINDS:
+                inherited_id = getattr(current, f"{other}_channel_id")
+                inherited[other] = inherited_id if inherited_id is not None and owns(inherited_id) else None
+
+        def edit(override):
+            channels = override.setdefault("channels", inherited)
+            channels[kind] = channel_id
+        await self._edit(guild_id, edit)
+
+    async def set_reaction(self, guild_id: int, trigger: str, responses: Tuple[Response, ...]):
+        """
+        Sets the responses of a trigger for a guild; no responses disables the trigger there.
+
+        Raises:
+            ValueError: If the trigger is too short, see `normalize_trigger`
+        """
+        trigger = normalize_trigger(trigger)
+
+        def edit(override):
+            reactions = override.setdefault("reactions", {})
+            reactions[trigger] = list(responses)
+        await self._edit(guild_id, edit)
+
+    async def add_twitch_target(self, guild_id: int, login: str, channel_id: int):
+        def edit(override):
+            twitch = override.setdefault("twitch", {})
+            twitch[login.lower()] = channel_id
+        await self._edit(guild_id, edit)
+
+    async def remove_twitch_target(self, guild_id: int, login: str) -> bool:
+        removed = login.lower() in self.overrides.get(guild_id, {}).get("twitch", {})
+
+        def edit(override):
+            twitch = override.get("twitch", {})
+            twitch.pop(login.lower(), None)
+            if not twitch:
+                override.pop("twitch", None)
+        await self._edit(guild_id, edit)
+        return removed
+
+    async def reset(self, guild_id: int):
+        await self._edit(guild_id, lambda override: override.clear())
+
+
+store = GuildSettingsStore(settings.get().guild_settings_file)
+settings.subscribe(lambda old, new: store.invalidate())
+get = store.get
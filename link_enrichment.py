@@ -0,0 +1,351 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import asyncio
+import ipaddress
+import socket
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+import aiohttp
+from aiohttp.abc import AbstractResolver, ResolveResult
+import settings
+from logger import Logger
+from tracing import span
+
+log = Logger("ENRICH")
+
+# Known oEmbed endpoints by canonical host; other hosts only get a reachability check
+OEMBED_PROVIDERS = {
+    "youtube.com": "https://www.youtube.com/oembed",
+    "soundcloud.com": "https://soundcloud.com/oembed",
+    "open.spotify.com": "https://open.spotify.com/oembed",
+    "vimeo.com": "https://vimeo.com/api/oembed.json",
+}
+
+# Query parameters that only track where a link was shared from
+TRACKING_PARAMS = {"si", "feature", "fbclid", "gclid", "igshid", "ref", "ref_src"}
+
+# Reachability checks follow redirects by hand so every hop's host is checked
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+# Shown for any failed reachability check, the details are only logged so a submitter
+# can't use the review embed to learn what answers behind the bot
+LINK_CHECK_FAILED = "Link check failed"
+
+
+@dataclass(frozen=True)
+class Enrichment:
+    """What we learned about a submitted link."""
+
+    url: str  # canonical form, or the raw input if it isn't a valid link
+    ok: bool
+    title: Optional[str] = None
+    author: Optional[str] = None
+    provider: Optional[str] = None
+    duration: Optional[int] = None  # seconds, only some providers report it
+    thumbnail: Optional[str] = None
+    error: Optional[str] = None
+
+
+def canonicalize(link: str) -> Optional[str]:
+    """
+    Normalizes a submitted link so the same track always maps to the same cache entry.
+    Returns None if it isn't an http(s) link.
+    """
+    link = link.strip().strip("<>")
+    if "://" not in link:
+        link = f"https://{link}"
+
+    try:
+        parts = urlsplit(link)
+        port = parts.port
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.hostname or "." not in parts.hostname:
+        return None
+
+    host = parts.hostname.lower()
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix) and host.count(".") > 1:
+            host = host[len(prefix):]
+    if host == "music.youtube.com":
+        host = "youtube.com"
+    path = parts.path.rstrip("/") or "/"
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k not in TRACKING_PARAMS and not k.startswith("utm_")]
+
+    # youtu.be/<id> and youtube.com/shorts/<id> are the same video as youtube.com/watch?v=<id>
+    if host == "youtu.be" and path != "/":
+        host, query, path = "youtube.com", [("v", path[1:])] + query, "/watch"
+    elif host == "youtube.com" and path.startswith("/shorts/"):
+        query, path = [("v", path[len("/shorts/"):])] + query, "/watch"
+
+    netloc = f"{host}:{port}" if port else host
+    return urlunsplit((scheme, netloc, path, urlencode(query), ""))
+
+
+def is_public_address(address: str) -> bool:
+    try:
+        return ipaddress.ip_address(address.split("%")[0]).is_global
+    except ValueError:
+        return False
+
+
+class PublicResolver(AbstractResolver):
+    """
+    aiohttp resolver that refuses hostnames resolving to loopback, private, link-local or other
+    non-public addresses. It runs on every connection, so it also covers redirect targets and
+    a DNS answer that changes between checks. IP literals never reach a resolver, check those
+    with `is_public_address`.
+    """
+
+    def __init__(self):
+        self.resolver = aiohttp.DefaultResolver()
+
+    async def resolve(self, host: str, port: int = 0, family: socket.AddressFamily = socket.AF_INET) -> List[ResolveResult]:
+        addresses = await self.resolver.resolve(host, port, family)
+        if not addresses or not all(is_public_address(x["host"]) for x in addresses):
+            raise OSError(f"{host} does not resolve to a public address")
+        return addresses
+
+    async def close(self) -> None:
+        await self.resolver.close()
+
+
+def format_duration(seconds: int) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}" if hours else f"{minutes}:{seconds:02}"
+
+
+class LinkEnricher:
+    """
+    Bounded pool of workers that validates links and fetches their oEmbed metadata.
+
+    Results are kept in a TTL/LRU cache keyed by the canonical link, concurrent lookups of the
+    same link share one request, and requests to a single host are spaced `host_interval` apart.
+    """
+
+    def __init__(self, workers: int = 4, cache_size: int = 512, cache_ttl: float = 3600,
+                 host_interval: float = 1.0, oembed_url: Optional[str] = None, timeout: float = 10):
+        self.concurrency = workers
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.host_interval = host_interval
+        self.oembed_url = oembed_url
+        self.timeout = timeout
+
+        self.cache: "OrderedDict[str, Tuple[float, Enrichment]]" = OrderedDict()
+        self.inflight: Dict[str, asyncio.Future] = {}
+        self.host_next: Dict[str, float] = {}
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers = []
+        self.session: Optional[aiohttp.ClientSession] = None
+        # Reachability checks fetch whatever a submitter typed, so they only connect to public addresses
+        self.probe_session: Optional[aiohttp.ClientSession] = None
+        self.tasks: Dict[int, asyncio.Task] = {}
+
+    def _ensure_started(self):
+        if self.queue is None:
+            self.queue = asyncio.Queue()
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self.probe_session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(resolver=PublicResolver())
+            )
+            self.workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    def depth(self) -> int:
+        return self.queue.qsize() if self.queue else 0
+
+    # Cache
+
+    def cached(self, url: str) -> Optional[Enrichment]:
+        entry = self.cache.get(url)
+        if entry is None:
+            return None
+        expires, result = entry
+        if expires < time.monotonic():
+            del self.cache[url]
+            return None
+        self.cache.move_to_end(url)
+        return result
+
+    def _remember(self, result: Enrichment):
+        self.cache[result.url] = (time.monotonic() + self.cache_ttl, result)
+        self.cache.move_to_end(result.url)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    # Lookups
+
+    async def enrich(self, link: str) -> Enrichment:
+        """Validates, canonicalizes and looks up a link, waiting for a worker if it isn't cached."""
+        url = canonicalize(link)
+        if url is None:
+            return Enrichment(url=link, ok=False, error="Not a valid link")
+
+        result = self.cached(url)
+        if result is not None:
+            return result
+
+        future = self.inflight.get(url)
+        if future is None:
+            self._ensure_started()
+            future = self.inflight[url] = asyncio.get_running_loop().create_future()
+            self.queue.put_nowait(url)
+        with span("enrich", host=urlsplit(url).hostname):
+            return await asyncio.shield(future)
+
+    async def _worker(self):
+        while True:
+            url = await self.queue.get()
+            future = self.inflight.get(url)
+            try:
+                result = await self._lookup(url)
+                if result.ok:
+                    # Failures aren't cached, a dead link may come back up before a reviewer gets to it
+                    self._remember(result)
+            except Exception as e:
+                log.warn(f"Looking up {url} failed: {e!r}")
+                result = Enrichment(url=url, ok=False, error=LINK_CHECK_FAILED)
+            finally:
+                self.inflight.pop(url, None)
+                self.queue.task_done()
+            if future is not None and not future.done():
+                future.set_result(result)
+
+    async def _wait_for_host(self, host: str):
+        # Reserve the next slot for this host, then sleep until it comes up
+        now = time.monotonic()
+        slot = max(now, self.host_next.get(host, 0.0))
+        self.host_next[host] = slot + self.host_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _lookup(self, url: str) -> Enrichment:
+        host = urlsplit(url).hostname
+        endpoint = self.oembed_url or OEMBED_PROVIDERS.get(host)
+        if endpoint is None:
+            return await self._check_reachable(url, host)
+
+        await self._wait_for_host(urlsplit(endpoint).hostname)
+        async with self.session.get(endpoint, params={"url": url, "format": "json"}) as response:
+            if response.status == 404:
+                return Enrichment(url=url, ok=False, error="Not found")
+            if response.status >= 400:
+                return Enrichment(url=url, ok=False, error=f"{host} answered HTTP {response.status}")
+            data = await response.json(content_type=None)
+
+        duration = data.get("duration")
+        return Enrichment(
+            url=url,
+            ok=True,
+            title=data.get("title"),
+            author=data.get("author_name"),
+            provider=data.get("provider_name") or host,
+            duration=int(duration) if isinstance(duration, (int, float)) else None,
+            thumbnail=data.get("thumbnail_url"),
+        )
+
+    async def _check_reachable(self, url: str, host: str) -> Enrichment:
+        target = url
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                target_host = urlsplit(target).hostname or ""
+                literal = target_host.strip("[]")
+                if urlsplit(target).scheme not in ("http", "https") or (_is_ip(literal) and not is_public_address(literal)):
+                    raise ValueError(f"refusing to fetch {target}")
+
+                await self._wait_for_host(target_host)
+                async with self.probe_session.get(target, allow_redirects=False) as response:
+                    status = response.status
+                    location = response.headers.get("Location") if status in REDIRECT_STATUSES else None
+                if location is None:
+                    break
+                target = urljoin(target, location)
+            else:
+                raise ValueError("too many redirects")
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError, ValueError) as e:
+            log.info(f"Link check of {url} failed: {e!r}")
+            return Enrichment(url=url, ok=False, error=LINK_CHECK_FAILED)
+
+        if status >= 400:
+            log.info(f"Link check of {url} failed: {target} answered HTTP {status}")
+            return Enrichment(url=url, ok=False, error=LINK_CHECK_FAILED)
+        return Enrichment(url=url, ok=True, provider=host)
+
+    # Background tasks per submission message
+
+    def track(self, message_id: int, coro: Awaitable):
+        """Runs an enrichment for a submission message in the background."""
+        task = self.tasks[message_id] = asyncio.create_task(coro)
+        task.add_done_callback(lambda _: self.tasks.pop(message_id, None))
+
+    def cancel(self, message_id: int):
+        """Drops a pending enrichment, e.g. because the submission was reviewed first."""
+        task = self.tasks.pop(message_id, None)
+        if task is not None:
+            task.cancel()
+
+    async def drain(self):
+        """Waits for the pending submission enrichments to finish."""
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+
+    # Carried across restarts, so recent submissions don't hit the providers again
+
+    def save_state(self):
+        now, wall = time.monotonic(), time.time()
+        return [[asdict(result), wall + expires - now] for expires, result in self.cache.values() if expires > now]
+
+    def restore_state(self, state):
+        now, wall = time.monotonic(), time.time()
+        for result, expires_at in state:
+            if expires_at > wall:
+                self.cache[result["url"]] = (now + expires_at - wall, Enrichment(**result))
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    async def close(self):
+        for task in list(self.tasks.values()):
+            task.cancel()
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.tasks.values(), *self.workers, return_exceptions=True)
+        self.workers = []
+        self.tasks.clear()
+        for future in self.inflight.values():
+            future.cancel()
+        self.inflight.clear()
+        self.queue = None
+        for session in (self.session, self.probe_session):
+            if session is not None:
+                await session.close()
+        self.session = self.probe_session = None
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.split("%")[0])
+        return True
+    except ValueError:
+        return False
+
+
+def _apply_settings(old, new):
+    enricher.cache_size = new.enrichment_cache_size
+    enricher.cache_ttl = new.enrichment_cache_ttl
+    enricher.host_interval = new.enrichment_host_interval
+    enricher.oembed_url = new.oembed_url
+
+
+enricher = LinkEnricher(
+    workers=settings.get().enrichment_workers,
+    cache_size=settings.get().enrichment_cache_size,
+    cache_ttl=settings.get().enrichment_cache_ttl,
+    host_interval=settings.get().enrichment_host_interval,
+    oembed_url=settings.get().oembed_url
+)
+settings.subscribe(_apply_settings)
@@ -0,0 +1,163 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+import settings
+from logger import Logger
+
+log = Logger("WATCHDOG")
+
+
+class _AsyncioLogHandler(logging.Handler):
+    # asyncio reports slow callbacks through `logging`, which the bot doesn't configure
+    def emit(self, record: logging.LogRecord):
+        log.warn(f"asyncio: {record.getMessage()}")
+
+
+class LoopWatchdog:
+    """
+    Catches code that blocks the event loop.
+
+    A task on the loop sleeps for `tick` seconds over and over and records how late it woke up.
+    A separate thread watches that heartbeat; once it's `threshold` seconds overdue the loop is
+    still stuck, so the thread grabs the loop thread's current stack (the offending code) and logs
+    it and appends it to `stall_file`. With `loop_debug`, asyncio's own slow callback warnings
+    (any callback over `threshold`) are logged as well.
+    """
+
+    def __init__(self, threshold: float = 0.25, tick: float = 0.1, stall_file: Optional[str] = None,
+                 loop_debug: bool = False):
+        self.threshold = threshold
+        self.tick = tick
+        self.stall_file = stall_file
+        self.loop_debug = loop_debug
+
+        self.heartbeat = time.monotonic()
+        self.max_lag = 0.0
+        self.stalls = 0
+        # Set by `start`, from then on the threshold decides whether the loop is watched
+        self.enabled = False
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread: Optional[int] = None
+        self.task: Optional[asyncio.Task] = None
+        self.thread: Optional[threading.Thread] = None
+        self.stopped = threading.Event()
+
+    def start(self):
+        """Watches the running loop whenever the threshold is above 0, including after a reload raises it."""
+        self.enabled = True
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread = threading.get_ident()
+        self.apply()
+
+    def apply(self):
+        """Starts or stops watching to match the current settings. Runs on the loop thread."""
+        if not self.enabled:
+            return
+        self.apply_loop_debug()
+        if self.threshold and self.task is None:
+            self.heartbeat = time.monotonic()
+            self.task = self.loop.create_task(self._tick())
+            # Every thread gets its own event, one still winding down never sees the next one's
+            self.stopped = threading.Event()
+            self.thread = threading.Thread(target=self._watch, args=(self.stopped,), name="loop-watchdog", daemon=True)
+            self.thread.start()
+            log.info(f"Watching for event loop stalls over {self.threshold * 1000:.0f}ms")
+        elif not self.threshold and self.task is not None:
+            self._stop()
+            log.info("Stopped watching for event loop stalls")
+
+    def _stop(self):
+        # The thread notices within one tick, nobody has to wait for it
+        self.stopped.set()
+        self.task.cancel()
+        self.task = None
+        self.thread = None
+
+    def apply_loop_debug(self):
+        if self.loop is None:
+            return
+        if self.threshold:
+            self.loop.slow_callback_duration = self.threshold
+        self.loop.set_debug(self.loop_debug)
+        asyncio_log = logging.getLogger("asyncio")
+        if self.loop_debug and not any(isinstance(h, _AsyncioLogHandler) for h in asyncio_log.handlers):
+            asyncio_log.addHandler(_AsyncioLogHandler(logging.WARNING))
+            asyncio_log.propagate = False
+
+    async def _tick(self):
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.tick)
+            now = time.monotonic()
+            self.heartbeat = now
+
+            lag = now - started - self.tick
+            self.max_lag = max(self.max_lag, lag)
+            if self.threshold and lag > self.threshold:
+                log.warn(f"Event loop lagged {lag * 1000:.0f}ms")
+
+    def _watch(self, stopped: threading.Event):
+        # Runs in its own thread, so it keeps going while the loop is stuck
+        captured = None
+        while not stopped.wait(self.tick):
+            heartbeat = self.heartbeat
+            overdue = time.monotonic() - heartbeat - self.tick
+            if self.threshold and overdue > self.threshold and captured != heartbeat:
+                # One capture per stall, taken while the offending code is still running
+                captured = heartbeat
+                self.stalls += 1
+                self._capture(overdue)
+
+    def _capture(self, overdue: float):
+        frame = sys._current_frames().get(self.loop_thread)
+        stack = traceback.format_stack(frame) if frame is not None else []
+        # Skip the event loop's own frames, the callback it's running is what matters
+        callback = next((i + 1 for i in range(len(stack) - 1, -1, -1) if f"asyncio{os.sep}events.py" in stack[i]), 0)
+        log.warn(f"Event loop blocked for {overdue * 1000:.0f}ms so far, loop thread is at:\n{''.join(stack[callback:]).rstrip()}")
+
+        if not self.stall_file:
+            return
+        try:
+            directory = os.path.dirname(self.stall_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.stall_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps({
+                    "time": time.time(),
+                    "blocked_ms": round(overdue * 1000, 1),
+                    "threshold_ms": round(self.threshold * 1000, 1),
+                    "stack": [line.rstrip() for line in stack],
+                }) + "\n")
+        except OSError as e:
+            log.error(f"Failed to write stall to {self.stall_file}: {e}")
+
+    async def close(self):
+        self.enabled = False
+        if self.task is not None:
+            task, thread = self.task, self.thread
+            self._stop()
+            await asyncio.gather(task, return_exceptions=True)
+            await asyncio.to_thread(thread.join, 1)
+
+
+def _apply_settings(old, new):
+    watchdog.threshold = new.watchdog_threshold
+    watchdog.stall_file = new.stall_file
+    watchdog.loop_debug = new.loop_debug
+    watchdog.apply()
+
+
+watchdog = LoopWatchdog(
+    threshold=settings.get().watchdog_threshold,
+    stall_file=settings.get().stall_file,
+    loop_debug=settings.get().loop_debug
+)
+settings.subscribe(_apply_settings)
@@ -0,0 +1,130 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import os
+import sqlite3
+import time
+from array import array
+from typing import Dict, List, Tuple
+
+# Counted outcomes of a matched trigger, one counter each per (trigger, channel, hour) slot
+MATCHED, REPLIED, COOLDOWN = range(3)
+OUTCOMES = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reaction_stats (
+    trigger TEXT NOT NULL,
+    channel_id INTEGER NOT NULL,
+    hour INTEGER NOT NULL,
+    matched INTEGER NOT NULL DEFAULT 0,
+    replied INTEGER NOT NULL DEFAULT 0,
+    cooldown INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (trigger, channel_id, hour)
+)
+"""
+
+UPSERT = """
+INSERT INTO reaction_stats (trigger, channel_id, hour, matched, replied, cooldown) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (trigger, channel_id, hour) DO UPDATE SET
+    matched = matched + excluded.matched,
+    replied = replied + excluded.replied,
+    cooldown = cooldown + excluded.cooldown
+"""
+
+Row = Tuple[str, int, int, int, int, int]
+
+
+class ReactionStats:
+    """
+    In-memory trigger counters, flushed to SQLite in batches.
+
+    Counting is on the message hot path, so it only does a dict lookup and an array increment:
+    each (trigger, channel, hour) key owns a slot of three counters in one flat array.
+    `take()` swaps the buffers out and `write()` upserts them, meant to run in a worker thread.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.triggers: Dict[str, int] = {}
+        self.trigger_names: List[str] = []
+        self._reset()
+
+    def _reset(self):
+        self.slots: Dict[Tuple[int, int, int], int] = {}
+        self.counts = array("I")
+
+    def _slot(self, trigger: str, channel_id: int, hour: int) -> int:
+        trigger_index = self.triggers.get(trigger)
+        if trigger_index is None:
+            trigger_index = self.triggers[trigger] = len(self.trigger_names)
+            self.trigger_names.append(trigger)
+
+        key = (trigger_index, channel_id, hour)
+        slot = self.slots.get(key)
+        if slot is None:
+            slot = self.slots[key] = len(self.counts)
+            self.counts.extend((0,) * OUTCOMES)
+        return slot
+
+    def record(self, trigger: str, channel_id: int, outcome: int):
+        self.counts[self._slot(trigger, channel_id, int(time.time()) // 3600) + outcome] += 1
+
+    def pending(self) -> int:
+        return len(self.slots)
+
+    def take(self) -> List[Row]:
+        """Returns the buffered counters as rows and starts a new buffer."""
+        slots, counts = self.slots, self.counts
+        self._reset()
+        return [
+            (self.trigger_names[trigger_index], channel_id, hour, *counts[slot:slot + OUTCOMES])
+            for (trigger_index, channel_id, hour), slot in slots.items()
+        ]
+
+    def give_back(self, rows: List[Row]):
+        """Merges rows that failed to write back into the buffer."""
+        for trigger, channel_id, hour, *outcomes in rows:
+            slot = self._slot(trigger, channel_id, hour)
+            for outcome, count in enumerate(outcomes):
+                self.counts[slot + outcome] += count
+
+    # Blocking, run these with asyncio.to_thread
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(self.path)
+        db.execute(SCHEMA)
+        return db
+
+    def write(self, rows: List[Row]):
+        db = self._connect()
+        try:
+            with db:
+                db.executemany(UPSERT, rows)
+        finally:
+            db.close()
+
+    def top_triggers(self, since_hour: int, limit: int = 10) -> List[Tuple[str, int, int, int]]:
+        """(trigger, matched, replied, cooldown) since `since_hour`, most matched first."""
+        db = self._connect()
+        try:
+            return db.execute(
+                "SELECT trigger, SUM(matched), SUM(replied), SUM(cooldown) FROM reaction_stats WHERE hour >= ? "
+                "GROUP BY trigger ORDER BY SUM(matched) DESC LIMIT ?",
+                (since_hour, limit)
+            ).fetchall()
+        finally:
+            db.close()
+
+    def top_channels(self, since_hour: int, limit: int = 5) -> List[Tuple[int, int, int]]:
+        """(channel_id, matched, replied) since `since_hour`, most matched first."""
+        db = self._connect()
+        try:
+            return db.execute(
+                "SELECT channel_id, SUM(matched), SUM(replied) FROM reaction_stats WHERE hour >= ? "
+                "GROUP BY channel_id ORDER BY SUM(matched) DESC LIMIT ?",
+                (since_hour, limit)
+            ).fetchall()
+        finally:
+            db.close()
@@ -0,0 +1,235 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import asyncio
+import itertools
+import time
+from collections import defaultdict, deque
+from enum import IntEnum
+from typing import Awaitable, Callable, Optional, TypeVar
+import discord
+import settings
+from logger import Logger
+from tracing import span
+
+log = Logger("REST")
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    """Outbound call classes, lower runs first."""
+    ACK = 0           # interaction responses and followups (3 second deadline)
+    MODERATION = 1    # submission posts, archive moves, deletions, DMs
+    NOTIFICATION = 2  # Twitch live notifications
+    FUN = 3           # reaction replies, the first to be shed
+
+
+# Workers only ACK calls may use, so an interaction response never waits behind other calls
+RESERVED_WORKERS = 1
+
+
+class LoadShed(Exception):
+    """Raised to the caller when a low priority call was dropped under load."""
+
+
+class _Job:
+    __slots__ = ("priority", "seq", "name", "bucket", "factory", "future", "queued")
+
+    def __init__(self, priority, seq, name, bucket, factory, future):
+        self.priority = priority
+        self.seq = seq
+        self.name = name
+        self.bucket = bucket
+        self.factory = factory
+        self.future = future
+        self.queued = time.monotonic()
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class RestScheduler:
+    """
+    Shared queue that every cog submits its outbound Discord REST calls to.
+
+    A fixed pool of workers takes jobs in priority order. Jobs sharing a bucket (a channel,
+    an interaction, a DM) run one at a time, like Discord's per-route rate limits, and
+    wait off the queue so they never hold a worker that another bucket could use.
+    Only ACK jobs may occupy the last `RESERVED_WORKERS` workers, and FUN jobs
+    are shed once the queue is too deep or they've waited too long.
+    """
+
+    def __init__(self, concurrency: int = 8, shed_depth: int = 50, shed_age: float = 5.0):
+        self.concurrency = concurrency
+        self.shed_depth = shed_depth
+        self.shed_age = shed_age
+
+        self.queue: Optional[asyncio.PriorityQueue] = None
+        self.workers = []
+        self.seq = itertools.count()
+        self.busy_buckets = set()
+        self.parked = defaultdict(deque)
+        # Jobs other than ACKs waiting for one of the unreserved workers
+        self.capped_running = 0
+        self.capped_parked = deque()
+        self.paused_until = {}
+        self.shed = 0
+
+    def _ensure_started(self):
+        if self.queue is None:
+            self.queue = asyncio.PriorityQueue()
+            self.workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    def depth(self) -> int:
+        parked = sum(len(jobs) for jobs in self.parked.values()) + len(self.capped_parked)
+        return (self.queue.qsize() if self.queue else 0) + parked
+
+    async def submit(self, priority: Priority, name: str, factory: Callable[[], Awaitable[T]],
+                     bucket: Optional[str] = None) -> T:
+        """
+        Queues `factory()` and waits for its result. The span covers queueing and the call itself.
+
+        Args:
+            priority: Priority class of the call
+            name: Short label used for tracing and logs
+            factory: Zero argument callable returning the awaitable to run
+            bucket: Rate limit bucket key, e.g. `channel:<id>`; None runs unserialized
+
+        Raises:
+            LoadShed: If a FUN job was dropped
+        """
+        self._ensure_started()
+        if priority == Priority.FUN and self.depth() >= self.shed_depth:
+            self.shed += 1
+            raise LoadShed(name)
+
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait(_Job(priority, next(self.seq), name, bucket, factory, future))
+        with span(name, priority=priority.name):
+            return await future
+
+    async def _worker(self):
+        while True:
+            job = await self.queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self.queue.task_done()
+
+    async def _run(self, job: _Job):
+        if job.future.done():
+            return
+        if job.priority == Priority.FUN and time.monotonic() - job.queued > self.shed_age:
+            self.shed += 1
+            job.future.set_exception(LoadShed(job.name))
+            return
+
+        capped = job.priority != Priority.ACK
+        if capped:
+            if self.capped_running >= max(self.concurrency - RESERVED_WORKERS, 1):
+                # Park until an unreserved worker frees up
+                self.capped_parked.append(job)
+                return
+            self.capped_running += 1
+
+        bucket = job.bucket
+        if bucket is not None:
+            if bucket in self.busy_buckets:
+                # Park until the bucket's current call finishes
+                self.parked[bucket].append(job)
+                if capped:
+                    self._release_capped()
+                return
+            self.busy_buckets.add(bucket)
+
+        try:
+            pause = self.paused_until.pop(bucket, 0) - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            result = await job.factory()
+        except discord.HTTPException as e:
+            if e.status == 429:
+                self._pause(bucket, e)
+            if not job.future.done():
+                job.future.set_exception(e)
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            # A worker cancelled mid-call (CancelledError) must not leave its caller waiting forever
+            if not job.future.done():
+                job.future.cancel()
+            if bucket is not None:
+                self.busy_buckets.discard(bucket)
+                parked = self.parked.get(bucket)
+                if parked:
+                    self.queue.put_nowait(parked.popleft())
+                if not parked:
+                    self.parked.pop(bucket, None)
+            if capped:
+                self._release_capped()
+
+    def _release_capped(self):
+        self.capped_running -= 1
+        if self.capped_parked:
+            self.queue.put_nowait(self.capped_parked.popleft())
+
+    def _pause(self, bucket: Optional[str], error: discord.HTTPException):
+        if bucket is None:
+            return
+        try:
+            retry_after = float(error.response.headers.get("Retry-After", 1))
+        except (AttributeError, TypeError, ValueError):
+            retry_after = 1.0
+        self.paused_until[bucket] = time.monotonic() + retry_after
+        log.warn(f"Bucket {bucket} rate limited, pausing {retry_after:.1f}s")
+
+    async def drain(self):
+        """Waits until every queued and parked job has run."""
+        if self.queue is not None:
+            await self.queue.join()
+
+    async def close(self):
+        """Cancels the workers; running, queued and parked jobs are failed with CancelledError."""
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        if self.queue is not None:
+            while not self.queue.empty():
+                job = self.queue.get_nowait()
+                job.future.cancel()
+        for job in itertools.chain(self.capped_parked, *self.parked.values()):
+            job.future.cancel()
+        self.parked.clear()
+        self.capped_parked.clear()
+        self.busy_buckets.clear()
+        self.capped_running = 0
+        self.queue = None
+
+
+def _apply_settings(old, new):
+    scheduler.shed_depth = new.rest_shed_depth
+    scheduler.shed_age = new.rest_shed_age
+
+
+scheduler = RestScheduler(
+    concurrency=settings.get().rest_concurrency,
+    shed_depth=settings.get().rest_shed_depth,
+    shed_age=settings.get().rest_shed_age
+)
+settings.subscribe(_apply_settings)
+submit = scheduler.submit
+
+
+def ack(interaction: discord.Interaction, name: str, factory: Callable[[], Awaitable[T]]) -> Awaitable[T]:
+    """Submits an interaction response or followup, serialized per interaction."""
+    return submit(Priority.ACK, name, factory, bucket=f"interaction:{interaction.id}")
+
+
+def moderate(name: str, factory: Callable[[], Awaitable[T]], bucket: Optional[str] = None) -> Awaitable[T]:
+    """Submits a moderation call (submission posts, archive moves, deletions, DMs)."""
+    return submit(Priority.MODERATION, name, factory, bucket=bucket)
@@ -0,0 +1,46 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import atomic_file
+import json
+import os
+import time
+from typing import Any, Dict
+from logger import Logger
+
+log = Logger("STATE")
+
+# Runtime state carried across a graceful restart. Components opt in with two methods:
+# `save_state()` returns a JSON serializable value and `restore_state(value)` takes it back.
+# The snapshot is written on shutdown and deleted once restored, so a crash never brings
+# back state from an older run.
+
+
+def save(path: str, states: Dict[str, Any]):
+    """Writes the states of every component, keyed by component name."""
+    atomic_file.write_json(path, {"saved_at": time.time(), "states": states})
+
+
+def load(path: str, max_age: float) -> Dict[str, Any]:
+    """
+    Reads and removes the snapshot. Returns no state if it's missing, unreadable or older
+    than `max_age` seconds, since e.g. a stream could have ended and restarted in the meantime.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        log.error(f"Could not read the state snapshot from {path}: {e}")
+        return {}
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    age = time.time() - data.get("saved_at", 0)
+    if age > max_age:
+        log.warn(f"Ignoring a state snapshot from {age:.0f}s ago")
+        return {}
+    return data.get("states", {})
@@ -0,0 +1,277 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from dotenv import dotenv_values
+from logger import Logger
+
+log = Logger("SETTINGS")
+
+
+class SettingsError(ValueError):
+    """Raised when the environment contains values that can't be parsed."""
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Validated, immutable snapshot of the bot configuration.
+
+    Read it once per event with `settings.get()` and use that snapshot throughout,
+    a reload swaps the whole object rather than mutating it.
+    Fields marked startup-only are read while the client is built and need a restart to change.
+    """
+
+    # Discord
+    token: Optional[str]
+    app_id: Optional[int]
+    owner_id: Optional[int]
+    submission_channel_id: Optional[int]
+    accepted_channel_id: Optional[int]
+    rejected_channel_id: Optional[int]
+    held_channel_id: Optional[int]
+
+    # Reactions
+    bwaa_sticker_ids: Tuple[int, ...]
+    meow_sticker_ids: Tuple[int, ...]
+    pluh_sticker_ids: Tuple[int, ...]
+    fumo_sticker_ids: Tuple[int, ...]
+    fumo_gifs: Tuple[str, ...]
+    get_real_gifs: Tuple[str, ...]
+
+    # Twitch
+    twitch_client_id: Optional[str]
+    twitch_client_secret: Optional[str]
+    twitch_username: Optional[str]
+    twitch_notification_channel_id: Optional[int]
+    twitch_api_url: str
+    twitch_auth_url: str
+
+    # Per-guild overrides, edited with /guild_config
+    guild_settings_file: str
+
+    # Submission records, looked up by the IDs in the review buttons
+    submissions_file: str  # startup-only
+    submission_retention_days: float
+
+    # Review queue reminders and summaries (0 disables)
+    review_reminder_hours: float
+    review_summary_hours: float
+    reviewer_role_id: Optional[int]
+
+    # Archive digest for rejected/held submissions
+    archive_digest: bool
+    archive_digest_size: int
+    archive_digest_interval: float
+    archive_digest_file: str  # startup-only
+
+    # Submission link enrichment
+    link_enrichment: bool
+    enrichment_workers: int  # startup-only
+    enrichment_cache_size: int
+    enrichment_cache_ttl: float
+    enrichment_host_interval: float
+    oembed_url: Optional[str]
+
+    # Graceful shutdown
+    shutdown_timeout: float
+    state_file: str
+    state_max_age: float
+
+    # Reaction analytics
+    reaction_stats_file: str  # startup-only
+    reaction_stats_interval: float  # startup-only
+
+    # Outbound REST scheduler
+    rest_concurrency: int  # startup-only
+    rest_shed_depth: int
+    rest_shed_age: float
+
+    # Startup-only
+    memory_profile: str
+    sharded: bool
+    shard_count: Optional[int]
+    shard_ids: Optional[Tuple[int, ...]]
+    command_hash_file: str
+    force_sync: bool
+
+    # Event loop watchdog
+    watchdog_threshold: float
+    stall_file: str
+    loop_debug: bool
+
+    # Tracing
+    trace_file: str
+    trace_sample_rate: float
+
+    @classmethod
+    def from_env(cls, environ=None) -> "Settings":
+        """
+        Parses the settings from environment variables.
+
+        Raises:
+            SettingsError: Listing every variable that failed to parse
+        """
+        parser = _Parser(os.environ if environ is None else environ)
+        settings = cls(
+            token=parser.text("TOKEN"),
+            app_id=parser.integer("APPID"),
+            owner_id=parser.integer("OWNER_ID"),
+            submission_channel_id=parser.integer("SUBMISSION_CHANNELID"),
+            accepted_channel_id=parser.integer("ACCEPTED_CHANNELID"),
+            rejected_channel_id=parser.integer("REJECTED_CHANNELID"),
+            held_channel_id=parser.integer("HELD_CHANNELID"),
+            bwaa_sticker_ids=parser.ids("BWAA_STICKERIDS"),
+            meow_sticker_ids=parser.ids("MEOW_STICKERIDS"),
+            pluh_sticker_ids=parser.ids("PLUH_STICKERIDS"),
+            fumo_sticker_ids=parser.ids("FUMO_STICKERIDS"),
+            fumo_gifs=parser.items("FUMO_GIFS"),
+            get_real_gifs=parser.items("GET_REAL_GIFS"),
+            twitch_client_id=parser.text("TWITCH_CLIENT_ID"),
+            twitch_client_secret=parser.text("TWITCH_CLIENT_SECRET"),
+            twitch_username=parser.text("TWITCH_USERNAME"),
+            twitch_notification_channel_id=parser.integer("TWITCH_NOTIFICATION_CHANNELID"),
+            twitch_api_url=(parser.text("TWITCH_API_URL") or "https://api.twitch.tv/helix").rstrip("/"),
+            twitch_auth_url=(parser.text("TWITCH_AUTH_URL") or "https://id.twitch.tv/oauth2").rstrip("/"),
+            guild_settings_file=parser.text("GUILD_SETTINGS_FILE") or "data/guilds.json",
+            submissions_file=parser.text("SUBMISSIONS_FILE") or "data/submissions.sqlite3",
+            submission_retention_days=parser.number("SUBMISSION_RETENTION_DAYS") or 90.0,
+            review_reminder_hours=max(parser.number("REVIEW_REMINDER_HOURS"), 0.0) if parser.text("REVIEW_REMINDER_HOURS") else 72.0,
+            review_summary_hours=max(parser.number("REVIEW_SUMMARY_HOURS"), 0.0) if parser.text("REVIEW_SUMMARY_HOURS") else 24.0,
+            reviewer_role_id=parser.integer("REVIEWER_ROLEID"),
+            archive_digest=parser.flag("ARCHIVE_DIGEST"),
+            archive_digest_size=min(max(parser.integer("ARCHIVE_DIGEST_SIZE") or 10, 1), 10),
+            archive_digest_interval=parser.number("ARCHIVE_DIGEST_INTERVAL") or 300.0,
+            archive_digest_file=parser.text("ARCHIVE_DIGEST_FILE") or "data/archive_digest.json",
+            link_enrichment=parser.flag("LINK_ENRICHMENT"),
+            enrichment_workers=parser.integer("ENRICHMENT_WORKERS") or 4,
+            enrichment_cache_size=parser.integer("ENRICHMENT_CACHE_SIZE") or 512,
+            enrichment_cache_ttl=parser.number("ENRICHMENT_CACHE_TTL") or 3600.0,
+            enrichment_host_interval=parser.number("ENRICHMENT_HOST_INTERVAL") or 1.0,
+            oembed_url=parser.text("OEMBED_URL"),
+            shutdown_timeout=parser.number("SHUTDOWN_TIMEOUT") or 8.0,
+            state_file=parser.text("STATE_FILE") or "data/state.json",
+            state_max_age=parser.number("STATE_MAX_AGE") or 900.0,
+            reaction_stats_file=parser.text("REACTION_STATS_FILE") or "data/reaction_stats.sqlite3",
+            reaction_stats_interval=parser.number("REACTION_STATS_INTERVAL") or 60.0,
+            rest_concurrency=parser.integer("REST_CONCURRENCY") or 8,
+            rest_shed_depth=parser.integer("REST_SHED_DEPTH") or 50,
+            rest_shed_age=parser.number("REST_SHED_AGE") or 5.0,
+            memory_profile=parser.text("MEMORY_PROFILE") or "default",
+            sharded=parser.flag("SHARDED"),
+            shard_count=parser.integer("SHARD_COUNT"),
+            shard_ids=parser.ids("SHARD_IDS") or None,
+            command_hash_file=parser.text("COMMAND_HASH_FILE") or "data/command_tree.sha256",
+            force_sync=parser.flag("FORCE_SYNC"),
+            watchdog_threshold=max(parser.number("WATCHDOG_THRESHOLD"), 0.0) if parser.text("WATCHDOG_THRESHOLD") else 0.25,
+            stall_file=parser.text("STALL_FILE") or "data/stalls.jsonl",
+            loop_debug=parser.flag("LOOP_DEBUG"),
+            trace_file=parser.text("TRACE_FILE") or "data/traces.jsonl",
+            trace_sample_rate=min(max(parser.number("TRACE_SAMPLE_RATE"), 0.0), 1.0),
+        )
+        if parser.errors:
+            raise SettingsError("; ".join(parser.errors))
+        return settings
+
+
+class _Parser:
+    def __init__(self, environ):
+        self.environ = environ
+        self.errors: List[str] = []
+
+    def text(self, name) -> Optional[str]:
+        value = (self.environ.get(name) or "").strip()
+        return value or None
+
+    def integer(self, name) -> Optional[int]:
+        value = self.text(name)
+        if value is None:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            self.errors.append(f"{name} must be an integer, got '{value}'")
+            return None
+
+    def number(self, name) -> float:
+        value = self.text(name)
+        if value is None:
+            return 0.0
+        try:
+            return float(value)
+        except ValueError:
+            self.errors.append(f"{name} must be a number, got '{value}'")
+            return 0.0
+
+    def flag(self, name) -> bool:
+        return (self.text(name) or "").lower() in ("1", "true", "yes")
+
+    def items(self, name) -> Tuple[str, ...]:
+        return tuple(x.strip() for x in (self.text(name) or "").split(",") if x.strip())
+
+    def ids(self, name) -> Tuple[int, ...]:
+        ids = []
+        for value in self.items(name):
+            try:
+                ids.append(int(value))
+            except ValueError:
+                self.errors.append(f"{name} must be a comma separated list of IDs, got '{value}'")
+        return tuple(ids)
+
+
+_current: Optional[Settings] = None
+_subscribers: List[Callable[[Settings, Settings], None]] = []
+
+
+def _environ() -> Dict[str, str]:
+    """
+    A fresh read of `.env` under the process environment, which wins both at startup and on
+    reload, so a reload never swaps a deployed value for a stale one from `.env`.
+    `os.environ` is never modified, so a key deleted from `.env` is gone on the next reload.
+    """
+    dotenv = {name: value for name, value in dotenv_values().items() if value is not None}
+    return {**dotenv, **os.environ}
+
+
+def get() -> Settings:
+    """Returns the current settings, loading them (and `.env`) on first use."""
+    global _current
+    if _current is None:
+        _current = Settings.from_env(_environ())
+    return _current
+
+
+def reload() -> Settings:
+    """
+    Re-reads `.env` and the environment and atomically swaps in the new settings.
+    On a parse error the current settings stay in place and SettingsError is raised.
+    """
+    new = swap(Settings.from_env(_environ()))
+    log.info("Settings reloaded")
+    return new
+
+
+def swap(new: Settings) -> Settings:
+    """Atomically replaces the current settings and notifies subscribers."""
+    global _current
+    old, _current = _current or new, new
+
+    for callback in _subscribers:
+        try:
+            callback(old, new)
+        except Exception as e:
+            log.error(f"Settings reload callback failed: {e}")
+
+    return new
+
+
+def subscribe(callback: Callable[[Settings, Settings], None]):
+    """Registers `callback(old, new)` to run after every successful reload."""
+    _subscribers.append(callback)
+
+
+def unsubscribe(callback: Callable[[Settings, Settings], None]):
+    """Removes a callback registered with `subscribe`."""
+    if callback in _subscribers:
+        _subscribers.remove(callback)
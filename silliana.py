@@ -2,26 +2,293 @@
 
 import asyncio
 import discord
+import hashlib
+import json
 import os
+import runtime_state
+import settings
+import signal
+import submissions
+import time
+import weakref
 from discord.ext import commands
-from dotenv import load_dotenv
+from archive_digest import digest
+from cache_profiles import client_options
+from link_enrichment import enricher
 from logger import Logger
+from loop_watchdog import watchdog
+from rest_scheduler import scheduler
+from tracing import tracer
 
 INTENTS = discord.Intents.default()
 INTENTS.message_content = True
 INTENTS.guilds = True
 INTENTS.guild_messages = True
 
+EXTENSIONS = [
+    "cogs.reacts",
+    "cogs.forms",
+    "cogs.review_queue",
+    "cogs.twitch_notifications",
+    "cogs.shards",
+    "cogs.admin",
+]
+
 log = Logger("SILLIANA")
 
-load_dotenv()
+class StartupTimer:
+    # Records how long each startup phase took, reported once the bot is ready. The command sync
+    # phase is labelled synced/skipped/failed, so a deploy's logs show what the sync cost that start
+    def __init__(self):
+        self.phases = []
+        self.last = time.perf_counter()
+        self.started = self.last
+        self.reported = False
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self):
+        self.reported = True
+        breakdown = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in self.phases)
+        log.info(f"Startup to ready took {self.last - self.started:.2f}s ({breakdown})")
+
+startup = StartupTimer()
+
+config = settings.get()
+
+startup.mark("env")
+
+def shard_options():
+    # Opt-in sharding; SHARD_COUNT/SHARD_IDS split the shards across processes, otherwise Discord picks the count
+    if not config.sharded:
+        return {}
+    options = {}
+    if config.shard_count:
+        options["shard_count"] = config.shard_count
+    if config.shard_ids:
+        options["shard_ids"] = list(config.shard_ids)
+    return options
+
+class Silliana(commands.AutoShardedBot if config.sharded else commands.Bot):
+    command_sync = "pending"
+    draining = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Tasks running event handlers, view/modal callbacks and app commands, waited for on shutdown
+        self.handler_tasks = set()
+        # Tasks that read the gateway, learned from the connect/resumed events they dispatch
+        self.gateway_tasks = weakref.WeakSet()
+
+    def track_handlers(self):
+        # Every handler task is created by a gateway task while it parses an event, whichever discord.py
+        # helper creates it, so the task factory keeps the tasks spawned by a gateway task
+        loop = asyncio.get_running_loop()
+        default_factory = loop.get_task_factory()
+
+        def factory(loop, coro, **kwargs):
+            task = default_factory(loop, coro, **kwargs) if default_factory else asyncio.Task(coro, loop=loop, **kwargs)
+            if asyncio.current_task(loop) in self.gateway_tasks:
+                self.handler_tasks.add(task)
+                task.add_done_callback(self.handler_tasks.discard)
+            return task
+
+        loop.set_task_factory(factory)
+
+    async def setup_hook(self):
+        # Runs once per process, unlike on_ready which fires again on every reconnect
+        startup.mark("login")
+
+        # Opened here rather than on import, so importing the bot never creates the database
+        submissions.store.load()
+
+        watchdog.start()
+        self.track_handlers()
+
+        await self.load_extensions()
+        startup.mark("extensions")
+
+        self.restore_state()
+        startup.mark("state")
+
+        # Add persistent views; the fixed custom ID review/posted views only serve messages sent before the dynamic items
+        from cogs.forms import SubmissionButton, PostedButton, ReviewButton, PostedItem, shared_review_view
+        self.add_view(SubmissionButton())
+        self.add_view(shared_review_view())
+        self.add_view(PostedButton())
+        self.add_dynamic_items(ReviewButton, PostedItem)
+        startup.mark("views")
+
+        await self.sync_commands()
+        startup.mark(f"command sync ({self.command_sync})")
+
+        digest.start(self)
+
+        # Hot reload the configuration on SIGHUP and shut down gracefully on SIGTERM/SIGINT (not available on Windows)
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGHUP, reload_settings)
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                loop.add_signal_handler(sig, self.on_signal, sig)
+        except (AttributeError, NotImplementedError):
+            pass
 
-TOKEN = os.getenv("TOKEN")
-APPID = os.getenv("APPID")
+    def dispatch(self, event_name, /, *args, **kwargs):
+        # While draining, new messages are dropped; interactions are still answered since Discord only waits 3 seconds
+        if self.draining and event_name == "message":
+            return
+        if event_name in ("connect", "resumed"):
+            # Dispatched by the task reading the gateway (one per shard) while it parses READY/RESUMED
+            self.gateway_tasks.add(asyncio.current_task())
+        super().dispatch(event_name, *args, **kwargs)
 
-bot = commands.Bot(
+    def stateful(self):
+        # Everything that carries runtime state across a graceful restart
+        components = dict(self.cogs)
+        components["LinkEnricher"] = enricher
+        return {name: component for name, component in components.items() if hasattr(component, "save_state")}
+
+    def restore_state(self):
+        states = runtime_state.load(settings.get().state_file, settings.get().state_max_age)
+        for name, component in self.stateful().items():
+            if name in states:
+                try:
+                    component.restore_state(states[name])
+                except Exception as e:
+                    log.error(f"Could not restore the state of {name}: {e}")
+        if states:
+            log.info(f"Restored runtime state of {', '.join(sorted(states))}")
+
+    def save_state(self):
+        states = {}
+        for name, component in self.stateful().items():
+            try:
+                states[name] = component.save_state()
+            except Exception as e:
+                log.error(f"Could not save the state of {name}: {e}")
+        try:
+            runtime_state.save(settings.get().state_file, states)
+            log.info(f"Saved runtime state of {', '.join(sorted(states))}")
+        except OSError as e:
+            log.error(f"Could not write the state snapshot: {e}")
+
+    def on_signal(self, sig):
+        if self.draining:
+            # A second signal means the operator doesn't want to wait, skip what's left of the drain
+            log.warn(f"{sig.name} received while draining, closing now")
+            self.shutdown_task.cancel()
+            self.save_state()
+            self.close_task = asyncio.create_task(self.close())
+            return
+        # Keep a reference so the shutdown task isn't garbage collected halfway
+        self.shutdown_task = asyncio.create_task(self.shutdown(sig.name))
+
+    async def shutdown(self, reason):
+        # Stop taking new work, let in-flight work finish within the deadline, then keep what we'd otherwise lose
+        if self.draining:
+            return
+        self.draining = True
+        timeout = settings.get().shutdown_timeout
+        log.info(f"{reason} received, draining for up to {timeout:.0f}s")
+        started = time.monotonic()
+        deadline = started + timeout
+
+        async def drain(name, awaitable):
+            try:
+                await asyncio.wait_for(awaitable, max(deadline - time.monotonic(), 0))
+            except asyncio.TimeoutError:
+                log.warn(f"Shutdown deadline reached while draining {name}")
+            except Exception as e:
+                log.error(f"Error while draining {name}: {e}")
+
+        async def handlers_done():
+            # Interactions are still answered while draining, so wait for the ones started meanwhile too
+            while self.handler_tasks:
+                await asyncio.gather(*self.handler_tasks, return_exceptions=True)
+
+        await drain("event handlers", handlers_done())
+        await drain("link enrichment", enricher.drain())
+        await drain("archive digest", digest.flush_all())
+        await drain("REST queue", scheduler.drain())
+        await drain("submission records", submissions.store.flush())
+        log.info(f"Drained in {time.monotonic() - started:.2f}s, {scheduler.depth()} REST call(s) left")
+
+        self.save_state()
+        await self.close()
+
+    async def close(self):
+        await super().close()
+        await submissions.store.close()
+        await digest.close()
+        await enricher.close()
+        await scheduler.close()
+        await tracer.close()
+        await watchdog.close()
+
+    async def load_extensions(self):
+        # Importing a cog blocks the loop either way, so they load one after the other;
+        # one failing cog must not take the others down with it
+        for name in EXTENSIONS:
+            started = time.perf_counter()
+            try:
+                await self.load_extension(name)
+            except Exception as e:
+                log.error(f"Failed to load {name}: {e}")
+            else:
+                log.info(f"Loaded {name} in {time.perf_counter() - started:.2f}s")
+
+    def command_tree_hash(self):
+        # Stable hash of everything we'd send to Discord on sync
+        payload = sorted(
+            (command.to_dict(self.tree) for command in self.tree.get_commands()),
+            key=lambda command: command["name"]
+        )
+        data = json.dumps([config.app_id, payload], sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    async def sync_commands(self):
+        # Only hit the (heavily rate limited) global sync endpoint when the tree changed
+        tree_hash = self.command_tree_hash()
+        try:
+            with open(config.command_hash_file, "r", encoding="utf-8") as f:
+                synced_hash = f.read().strip()
+        except OSError:
+            synced_hash = None
+
+        if tree_hash == synced_hash and not config.force_sync:
+            log.info("Command tree unchanged, skipping sync")
+            self.command_sync = "skipped"
+            return
+
+        try:
+            synced = await self.tree.sync()
+            log.info(f"Synced {len(synced)} command(s)")
+            self.command_sync = "synced"
+        except Exception as e:
+            log.error(f"Failed to sync commands: {e}")
+            self.command_sync = "failed"
+            return
+
+        try:
+            os.makedirs(os.path.dirname(config.command_hash_file) or ".", exist_ok=True)
+            with open(config.command_hash_file, "w", encoding="utf-8") as f:
+                f.write(tree_hash)
+        except OSError as e:
+            log.warn(f"Could not persist command tree hash: {e}")
+
+def reload_settings():
+    try:
+        settings.reload()
+    except settings.SettingsError as e:
+        log.error(f"Invalid configuration, keeping the current settings: {e}")
+
+bot = Silliana(
     command_prefix=None,
-    intents=INTENTS
+    **client_options(config.memory_profile, INTENTS),
+    **shard_options()
 )
 
 @bot.event
@@ -37,26 +304,13 @@ async def on_ready():
     await bot.change_presence(activity=activity)
     log.info("Bot presence set!")
 
-    # Add persistent views
-    from cogs.forms import SubmissionButton
-    bot.add_view(SubmissionButton())
-    from cogs.forms import SubmissionReviewButtons, PostedButton
-    bot.add_view(SubmissionReviewButtons())
-    bot.add_view(PostedButton())
-
-    # Sync slash commands automatically
-    try:
-        synced = await bot.tree.sync()
-        log.info(f"Synced {len(synced)} command(s)")
-    except Exception as e:
-        log.error(f"Failed to sync commands: {e}")
+    if not startup.reported:
+        startup.mark("connect")
+        startup.report()
 
 async def main():
-    await bot.load_extension("cogs.reacts")
-    await bot.load_extension("cogs.forms")
-    await bot.load_extension("cogs.twitch_notifications")
-
-    await bot.start(TOKEN)
+    async with bot:
+        await bot.start(config.token)
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,255 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Set, Tuple
+import settings
+from logger import Logger
+
+log = Logger("SUBMISSIONS")
+
+PENDING = "pending"
+
+DAY = 24 * 3600
+# Seconds a changed record waits before it's written, changes in the meantime share the write
+SAVE_DELAY = 1.0
+RETRY_DELAY = 30.0
+PRUNE_INTERVAL = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (id INTEGER PRIMARY KEY, record TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+UPSERT = "INSERT INTO submissions (id, record) VALUES (?, ?) ON CONFLICT (id) DO UPDATE SET record = excluded.record"
+
+
+@dataclass
+class Submission:
+    """A music submission and where it is in review. Button custom IDs carry its `id`."""
+
+    id: int
+    guild_id: Optional[int]
+    submitter_id: int
+    artist: str
+    song: str
+    link: str
+    created_at: float
+    channel_id: Optional[int] = None
+    message_id: Optional[int] = None
+    status: str = PENDING
+    reviewer_id: Optional[int] = None
+    reviewed_at: Optional[float] = None
+    posted_at: Optional[float] = None
+    # Reminder periods covered so far, the next reminder is due after another REVIEW_REMINDER_HOURS
+    reminders: int = 0
+
+    @property
+    def pending(self) -> bool:
+        return self.status == PENDING
+
+
+class SubmissionStore:
+    """
+    Submission records, looked up by ID when a button is clicked instead of re-parsing the message embed.
+
+    Records live in memory. A change only marks the record dirty, and dirty records are written
+    to SQLite from a worker thread `SAVE_DELAY` seconds later, so saving never blocks the event loop.
+    Reviewed records are dropped `retention` seconds after their review.
+    Nothing touches the disk until `load` is called, the bot does that in its setup hook.
+    """
+
+    def __init__(self, path: str, retention: float = 90 * DAY):
+        self.path = path
+        self.retention = retention
+        self.records: Dict[int, Submission] = {}
+        self.next_id = 1
+        # Submissions a reviewer is handling right now, kept in memory only
+        self.claims: Set[int] = set()
+
+        self.dirty: Set[int] = set()
+        self.flush_task: Optional[asyncio.Task] = None
+        # Writes run in a thread, the lock keeps two batches from landing out of order
+        self.write_lock = asyncio.Lock()
+        self.pruned_at = 0.0
+
+    def load(self):
+        try:
+            db = self._connect()
+            try:
+                rows = db.execute("SELECT record FROM submissions").fetchall()
+                next_id = db.execute("SELECT value FROM meta WHERE key = 'next_id'").fetchone()
+            finally:
+                db.close()
+        except (OSError, sqlite3.Error) as e:
+            log.error(f"Could not read submissions from {self.path}: {e}")
+            rows, next_id = [], None
+
+        self.records = {record["id"]: Submission(**record) for record in (json.loads(row[0]) for row in rows)}
+        # IDs are never reused, posted buttons of pruned submissions still carry theirs
+        self.next_id = max(next_id[0] if next_id else 1, max(self.records, default=0) + 1)
+        self.prune()
+
+    def save(self, *submission_ids: int):
+        """Marks records as changed (or removed, if they're gone) and schedules a write."""
+        if not submission_ids:
+            return
+        self.dirty.update(submission_ids)
+        self._schedule(SAVE_DELAY)
+
+    def _schedule(self, delay: float):
+        if self.flush_task is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Outside the bot (scripts, tests) there's no loop to write from, write right away
+            self.write(*self.take())
+            return
+        self.flush_task = loop.create_task(self._flush_later(delay))
+
+    async def _flush_later(self, delay: float):
+        await asyncio.sleep(delay)
+        self.flush_task = None
+        await self.flush()
+
+    def take(self) -> Tuple[List[Tuple[int, Optional[str]]], int]:
+        """Snapshots the dirty records as (id, JSON or None if removed) rows and starts a new batch."""
+        dirty, self.dirty = self.dirty, set()
+        rows = []
+        for submission_id in dirty:
+            submission = self.records.get(submission_id)
+            rows.append((submission_id, json.dumps(asdict(submission)) if submission else None))
+        return rows, self.next_id
+
+    async def flush(self):
+        if time.time() - self.pruned_at > PRUNE_INTERVAL:
+            self.prune()
+        async with self.write_lock:
+            rows, next_id = self.take()
+            if not rows:
+                return
+            try:
+                await asyncio.to_thread(self.write, rows, next_id)
+            except (OSError, sqlite3.Error) as e:
+                log.error(f"Could not write {len(rows)} submission(s), retrying in {RETRY_DELAY:.0f}s: {e}")
+                # Records that changed again meanwhile are already dirty with their newer state
+                self.dirty.update(submission_id for submission_id, _ in rows)
+                self._schedule(RETRY_DELAY)
+
+    async def close(self):
+        """Writes what's still pending, call it before the loop stops."""
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+            self.flush_task = None
+        await self.flush()
+
+    def prune(self):
+        """Forgets reviewed submissions older than the retention period."""
+        now = self.pruned_at = time.time()
+        expired = [x.id for x in self.records.values() if x.reviewed_at is not None and x.reviewed_at < now - self.retention]
+        for submission_id in expired:
+            del self.records[submission_id]
+        if expired:
+            log.info(f"Dropping {len(expired)} submission(s) reviewed over {self.retention / DAY:.0f} days ago")
+            self.dirty.update(expired)
+            self._schedule(SAVE_DELAY)
+
+    # Blocking, run these with asyncio.to_thread
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        db = sqlite3.connect(self.path)
+        db.executescript(SCHEMA)
+        return db
+
+    def write(self, rows: List[Tuple[int, Optional[str]]], next_id: int):
+        db = self._connect()
+        try:
+            with db:
+                db.executemany(UPSERT, [row for row in rows if row[1] is not None])
+                db.executemany("DELETE FROM submissions WHERE id = ?", [(row[0],) for row in rows if row[1] is None])
+                db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('next_id', ?)", (next_id,))
+        finally:
+            db.close()
+
+    def get(self, submission_id: int) -> Optional[Submission]:
+        return self.records.get(submission_id)
+
+    def pending(self) -> List[Submission]:
+        return [x for x in self.records.values() if x.pending and x.message_id is not None]
+
+    def create(self, guild_id: Optional[int], submitter_id: int, artist: str, song: str, link: str) -> Submission:
+        submission = Submission(
+            id=self.next_id,
+            guild_id=guild_id,
+            submitter_id=submitter_id,
+            artist=artist,
+            song=song,
+            link=link,
+            created_at=time.time(),
+        )
+        self.next_id += 1
+        self.records[submission.id] = submission
+        self.save(submission.id)
+        return submission
+
+    def discard(self, submission_id: int):
+        """Forgets a submission whose message never made it out."""
+        if self.records.pop(submission_id, None) is not None:
+            self.save(submission_id)
+
+    def attach_message(self, submission_id: int, channel_id: int, message_id: int):
+        submission = self.records[submission_id]
+        submission.channel_id = channel_id
+        submission.message_id = message_id
+        self.save(submission_id)
+
+    def claim(self, submission_id: int) -> bool:
+        """Reserves a pending submission for one reviewer until it's marked reviewed or released."""
+        submission = self.records.get(submission_id)
+        if submission is None or not submission.pending or submission_id in self.claims:
+            return False
+        self.claims.add(submission_id)
+        return True
+
+    def release(self, submission_id: int):
+        self.claims.discard(submission_id)
+
+    def mark_reviewed(self, submission_id: int, status: str, reviewer_id: int) -> Submission:
+        self.claims.discard(submission_id)
+        submission = self.records[submission_id]
+        submission.status = status
+        submission.reviewer_id = reviewer_id
+        submission.reviewed_at = time.time()
+        self.save(submission_id)
+        return submission
+
+    def reviewed(self, since: float) -> List[Submission]:
+        return [x for x in self.records.values() if x.reviewed_at is not None and x.reviewed_at >= since]
+
+    def mark_reminded(self, reminders: Dict[int, int]):
+        """Sets how many reminder periods each submission has been reminded of."""
+        for submission_id, count in reminders.items():
+            self.records[submission_id].reminders = count
+        self.save(*reminders)
+
+    def mark_posted(self, submission_id: int):
+        submission = self.records.get(submission_id)
+        if submission is not None:
+            submission.posted_at = time.time()
+            self.save(submission_id)
+
+
+def _apply_settings(old, new):
+    store.retention = new.submission_retention_days * DAY
+
+
+store = SubmissionStore(settings.get().submissions_file, retention=settings.get().submission_retention_days * DAY)
+settings.subscribe(_apply_settings)
@@ -0,0 +1,32 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import os
+import tempfile
+import pytest
+import settings
+
+# The modules create their singletons on import, keep them away from a real .env and data/
+_data = tempfile.mkdtemp(prefix="silliana-tests-")
+ENV = {
+    "GUILD_SETTINGS_FILE": os.path.join(_data, "guilds.json"),
+    "ARCHIVE_DIGEST_FILE": os.path.join(_data, "digest.json"),
+    "SUBMISSIONS_FILE": os.path.join(_data, "submissions.sqlite3"),
+    "REACTION_STATS_FILE": os.path.join(_data, "reaction-stats.sqlite3"),
+    "STATE_FILE": os.path.join(_data, "state.json"),
+    "COMMAND_HASH_FILE": os.path.join(_data, "command_tree.sha256"),
+    "STALL_FILE": os.path.join(_data, "stalls.jsonl"),
+    "TRACE_FILE": os.path.join(_data, "traces.jsonl"),
+}
+settings.swap(settings.Settings.from_env(ENV))
+
+
+@pytest.fixture
+def env_settings():
+    """Swaps in settings built from the test environment plus the given variables, restored afterwards."""
+    previous = settings.get()
+
+    def swap(**env):
+        return settings.swap(settings.Settings.from_env({**ENV, **env}))
+
+    yield swap
+    settings.swap(previous)
@@ -0,0 +1,111 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import asyncio
+import os
+import types
+import discord
+from archive_digest import MAX_EMBED_CHARS, MAX_EMBEDS, ArchiveDigest, _batch
+from rest_scheduler import scheduler
+
+
+def entry(title: str, description_length: int = 0) -> dict:
+    return discord.Embed(title=title, description="x" * description_length).to_dict()
+
+
+class Channel:
+    def __init__(self, channel_id: int, error: Exception = None):
+        self.id = channel_id
+        self.error = error
+        self.sent = []
+
+    async def send(self, embeds):
+        if self.error is not None:
+            raise self.error
+        self.sent.append([embed.title for embed in embeds])
+
+
+def run(coro):
+    async def main():
+        try:
+            return await asyncio.wait_for(coro, 5)
+        finally:
+            # The shared REST scheduler is bound to this test's loop
+            await scheduler.close()
+
+    return asyncio.run(main())
+
+
+def test_batch_caps_embed_count():
+    embeds = _batch([entry(str(i)) for i in range(MAX_EMBEDS + 5)])
+    assert [x.title for x in embeds] == [str(i) for i in range(MAX_EMBEDS)]
+
+
+def test_batch_caps_characters():
+    # Four of these fit in 6000 characters, the fifth doesn't
+    size = MAX_EMBED_CHARS // 4 - 10
+    embeds = _batch([entry(str(i), size) for i in range(6)])
+    assert len(embeds) == 4
+    assert sum(len(x) for x in embeds) <= MAX_EMBED_CHARS
+
+
+def test_batch_always_takes_the_first_entry():
+    # An entry over the limit on its own still goes out, alone, rather than blocking the buffer
+    embeds = _batch([entry("big", MAX_EMBED_CHARS), entry("next")])
+    assert [x.title for x in embeds] == ["big"]
+
+
+def test_flush_splits_into_messages(tmp_path):
+    digest = ArchiveDigest(os.path.join(tmp_path, "digest.json"), size=100)
+    channel = Channel(1)
+
+    async def main():
+        for i in range(MAX_EMBEDS * 2 + 3):
+            await digest.add(channel, discord.Embed(title=str(i)))
+        await digest.flush(channel.id, channel)
+
+    run(main())
+    assert [len(message) for message in channel.sent] == [MAX_EMBEDS, MAX_EMBEDS, 3]
+    assert digest.pending() == 0
+    assert ArchiveDigest(digest.path).pending() == 0
+
+
+def test_full_batch_flushes_in_background(tmp_path):
+    digest = ArchiveDigest(os.path.join(tmp_path, "digest.json"), size=3)
+    channel = Channel(1)
+
+    async def main():
+        for i in range(3):
+            await digest.add(channel, discord.Embed(title=str(i)))
+        # add() returns before anything was sent
+        assert channel.sent == [] and len(digest.flushing) == 1
+        await asyncio.gather(*digest.flushing)
+
+    run(main())
+    assert channel.sent == [["0", "1", "2"]]
+
+
+def test_unreachable_channel_is_dropped(tmp_path):
+    response = types.SimpleNamespace(status=404, reason="Not Found")
+    digest = ArchiveDigest(os.path.join(tmp_path, "digest.json"), size=100)
+    gone = Channel(1, discord.NotFound(response, "Unknown Channel"))
+
+    async def main():
+        await digest.add(gone, discord.Embed(title="lost"))
+        await digest.flush(gone.id, gone)
+
+    run(main())
+    assert digest.pending() == 0
+    assert ArchiveDigest(digest.path).pending() == 0
+
+
+def test_failed_send_stays_buffered(tmp_path):
+    digest = ArchiveDigest(os.path.join(tmp_path, "digest.json"), size=100)
+    flaky = Channel(1, OSError("connection reset"))
+
+    async def main():
+        await digest.add(flaky, discord.Embed(title="kept"))
+        await digest._flush_logged(flaky.id, flaky)
+
+    run(main())
+    assert digest.pending() == 1
+    assert ArchiveDigest(digest.path).pending() == 1
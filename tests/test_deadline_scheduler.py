@@ -0,0 +1,107 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import asyncio
+import time
+from deadline_scheduler import DeadlineScheduler
+
+
+async def nothing(keys):
+    pass
+
+
+def test_pop_due_in_deadline_order():
+    deadlines = DeadlineScheduler(nothing)
+    for key, when in (("c", 30), ("a", 10), ("b", 20), ("later", 100)):
+        deadlines.schedule(key, when)
+    assert deadlines.pop_due(50) == ["a", "b", "c"]
+    assert deadlines.next_deadline() == 100
+    assert len(deadlines) == 1
+
+
+def test_moved_and_cancelled_entries_are_skipped():
+    deadlines = DeadlineScheduler(nothing)
+    deadlines.schedule("moved", 10)
+    deadlines.schedule("cancelled", 20)
+    deadlines.schedule("kept", 30)
+    deadlines.schedule("moved", 40)
+    deadlines.cancel("cancelled")
+
+    assert deadlines.next_deadline() == 30
+    assert deadlines.pop_due(35) == ["kept"]
+    assert deadlines.pop_due(100) == ["moved"]
+    assert deadlines.pop_due(1000) == []
+    assert not deadlines.heap
+
+
+def test_stale_entries_dont_pile_up():
+    deadlines = DeadlineScheduler(nothing)
+    # Rescheduling far-off deadlines leaves a stale entry behind every time
+    for i in range(1000):
+        deadlines.schedule(i % 10, 1_000_000 + i)
+    deadlines.next_deadline()
+    assert len(deadlines) == 10
+    assert len(deadlines.heap) <= 2 * len(deadlines) + 64
+
+
+def test_slack_fires_nearby_deadlines_together():
+    fired = []
+
+    async def on_due(keys):
+        fired.append(sorted(keys))
+
+    async def main():
+        deadlines = DeadlineScheduler(on_due, slack=0.5)
+        now = time.time()
+        deadlines.schedule("a", now + 0.05)
+        deadlines.schedule("b", now + 0.3)
+        deadlines.schedule("c", now + 5)
+        deadlines.start()
+        await asyncio.sleep(0.2)
+        await deadlines.close()
+
+    asyncio.run(main())
+    assert fired == [["a", "b"]]
+
+
+def test_earlier_deadline_wakes_the_timer():
+    fired = []
+
+    async def on_due(keys):
+        fired.extend(keys)
+
+    async def main():
+        deadlines = DeadlineScheduler(on_due)
+        deadlines.schedule("late", time.time() + 60)
+        deadlines.start()
+        await asyncio.sleep(0.01)
+        deadlines.schedule("soon", time.time() + 0.02)
+        await asyncio.sleep(0.1)
+        await deadlines.close()
+
+    asyncio.run(main())
+    assert fired == ["soon"]
+
+
+def test_failed_handler_retries_its_keys():
+    calls = []
+
+    async def on_due(keys):
+        calls.append(sorted(keys))
+        if len(calls) == 1:
+            # A key the handler already moved keeps its new deadline
+            deadlines.schedule("moved", time.time() + 60)
+            raise OSError("Discord is down")
+
+    deadlines = DeadlineScheduler(on_due, retry_delay=0.05)
+
+    async def main():
+        now = time.time()
+        deadlines.schedule("a", now)
+        deadlines.schedule("moved", now)
+        deadlines.start()
+        await asyncio.sleep(0.2)
+        await deadlines.close()
+
+    asyncio.run(main())
+    assert calls == [["a", "moved"], ["a"]]
+    assert deadlines.get("moved") is not None
@@ -0,0 +1,53 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import asyncio
+import os
+import pytest
+from guild_settings import GuildSettingsStore
+
+HOME = 1
+PARTNER = 2
+HOME_CHANNELS = {"submission": 10, "accepted": 11, "rejected": 12, "held": 13}
+
+
+@pytest.fixture
+def store(tmp_path, env_settings):
+    env_settings(**{f"{kind.upper()}_CHANNELID": str(channel_id) for kind, channel_id in HOME_CHANNELS.items()})
+    return GuildSettingsStore(os.path.join(tmp_path, "guilds.json"))
+
+
+def channels(store, guild_id):
+    config = store.get(guild_id)
+    return {kind: getattr(config, f"{kind}_channel_id") for kind in HOME_CHANNELS}
+
+
+def test_first_channel_edit_keeps_the_guilds_global_channels(store):
+    asyncio.run(store.set_channel(HOME, "held", 20, owns=lambda channel_id: channel_id in HOME_CHANNELS.values()))
+    assert channels(store, HOME) == {"submission": 10, "accepted": 11, "rejected": 12, "held": 20}
+    # And it's persisted that way
+    assert channels(GuildSettingsStore(store.path), HOME) == channels(store, HOME)
+
+
+def test_first_channel_edit_drops_other_servers_channels(store):
+    asyncio.run(store.set_channel(PARTNER, "submission", 30, owns=lambda channel_id: False))
+    assert channels(store, PARTNER) == {"submission": 30, "accepted": None, "rejected": None, "held": None}
+    assert channels(store, HOME) == HOME_CHANNELS
+
+
+def test_cleared_channel_stays_cleared(store):
+    async def main():
+        await store.set_channel(HOME, "rejected", None)
+        await store.set_channel(HOME, "held", 20)
+
+    asyncio.run(main())
+    assert channels(store, HOME) == {"submission": 10, "accepted": 11, "rejected": None, "held": 20}
+
+
+def test_reset_goes_back_to_the_global_channels(store):
+    async def main():
+        await store.set_channel(HOME, "held", 20)
+        await store.reset(HOME)
+
+    asyncio.run(main())
+    assert channels(store, HOME) == HOME_CHANNELS
+    assert GuildSettingsStore(store.path).overrides == {}
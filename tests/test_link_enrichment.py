@@ -0,0 +1,75 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import asyncio
+import pytest
+from link_enrichment import LINK_CHECK_FAILED, LinkEnricher, PublicResolver, canonicalize, is_public_address
+
+
+@pytest.mark.parametrize("link, expected", [
+    ("https://www.youtube.com/watch?v=abc&si=xyz", "https://youtube.com/watch?v=abc"),
+    ("<https://youtu.be/abc?si=xyz>", "https://youtube.com/watch?v=abc"),
+    ("https://youtube.com/shorts/abc", "https://youtube.com/watch?v=abc"),
+    ("https://music.youtube.com/watch?v=abc&feature=share", "https://youtube.com/watch?v=abc"),
+    ("HTTPS://M.SoundCloud.com/artist/track/", "https://soundcloud.com/artist/track"),
+    ("open.spotify.com/track/abc?utm_source=copy", "https://open.spotify.com/track/abc"),
+    ("https://example.com:8443/a?b=1#frag", "https://example.com:8443/a?b=1"),
+    # Dropping the prefix would leave a bare TLD
+    ("https://www.com/", "https://www.com/"),
+])
+def test_canonicalize(link, expected):
+    assert canonicalize(link) == expected
+
+
+@pytest.mark.parametrize("link", [
+    "ftp://example.com/song.mp3",
+    "javascript:alert(1)",
+    "https://localhost/song",
+    "https://example.com:99999/",
+    "not a link",
+])
+def test_canonicalize_rejects(link):
+    assert canonicalize(link) is None
+
+
+@pytest.mark.parametrize("address, public", [
+    ("8.8.8.8", True),
+    ("2606:4700:4700::1111", True),
+    ("127.0.0.1", False),
+    ("10.1.2.3", False),
+    ("192.168.0.1", False),
+    ("169.254.169.254", False),
+    ("::1", False),
+    ("fe80::1%eth0", False),
+    ("example.com", False),
+])
+def test_is_public_address(address, public):
+    assert is_public_address(address) == public
+
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1/",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://[::1]:8080/",
+    "file:///etc/passwd",
+])
+def test_check_reachable_refuses_private_targets(url):
+    async def main():
+        # Refused before any request is made, so no session is needed
+        enricher = LinkEnricher()
+        result = await enricher._check_reachable(url, "example.com")
+        assert not result.ok
+        assert result.error == LINK_CHECK_FAILED
+
+    asyncio.run(main())
+
+
+def test_public_resolver_refuses_localhost():
+    async def main():
+        resolver = PublicResolver()
+        try:
+            with pytest.raises(OSError):
+                await resolver.resolve("localhost", 80)
+        finally:
+            await resolver.close()
+
+    asyncio.run(main())
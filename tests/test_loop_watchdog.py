@@ -0,0 +1,35 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import asyncio
+import time
+from loop_watchdog import LoopWatchdog
+
+
+def test_reload_starts_and_stops_watching():
+    async def main():
+        watchdog = LoopWatchdog(threshold=0, tick=0.01)
+        watchdog.start()
+        assert watchdog.task is None and watchdog.thread is None
+
+        # What the settings subscriber does when a reload raises the threshold
+        watchdog.threshold = 0.05
+        watchdog.apply()
+        assert watchdog.task is not None and watchdog.thread.is_alive()
+        thread = watchdog.thread
+
+        time.sleep(0.15)  # blocks the loop on purpose
+        await asyncio.sleep(0.05)
+        assert watchdog.stalls == 1
+
+        watchdog.threshold = 0
+        watchdog.apply()
+        assert watchdog.task is None
+        await asyncio.sleep(0.05)
+        assert not thread.is_alive()
+
+        watchdog.threshold = 0.05
+        watchdog.apply()
+        await watchdog.close()
+        assert watchdog.task is None and watchdog.thread is None
+
+    asyncio.run(main())
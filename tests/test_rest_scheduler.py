@@ -0,0 +1,126 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import asyncio
+import pytest
+from rest_scheduler import Priority, RestScheduler
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 5))
+
+
+async def blocked(release: asyncio.Event, started: list, name: str):
+    started.append(name)
+    await release.wait()
+    return name
+
+
+def test_low_priority_never_takes_the_reserved_worker():
+    async def main():
+        scheduler = RestScheduler(concurrency=3)
+        release, started = asyncio.Event(), []
+        fun = [asyncio.create_task(scheduler.submit(Priority.FUN, f"fun{i}", lambda i=i: blocked(release, started, f"fun{i}")))
+               for i in range(4)]
+        await asyncio.sleep(0.01)
+        # Two unreserved workers run FUN jobs, the other two wait parked
+        assert sorted(started) == ["fun0", "fun1"]
+        assert len(scheduler.capped_parked) == 2
+
+        # The reserved worker is free for an ack
+        assert await scheduler.submit(Priority.ACK, "ack", lambda: asyncio.sleep(0, "acked")) == "acked"
+
+        release.set()
+        assert await asyncio.gather(*fun) == ["fun0", "fun1", "fun2", "fun3"]
+        assert scheduler.capped_running == 0 and not scheduler.capped_parked
+        await scheduler.close()
+
+    run(main())
+
+
+def test_moderation_never_takes_the_reserved_worker():
+    async def main():
+        scheduler = RestScheduler(concurrency=8)
+        release, started = asyncio.Event(), []
+        moderation = [asyncio.create_task(scheduler.submit(Priority.MODERATION, f"move{i}", lambda i=i: blocked(release, started, f"move{i}")))
+                      for i in range(8)]
+        await asyncio.sleep(0.01)
+        assert len(started) == 7 and len(scheduler.capped_parked) == 1
+
+        # The ack starts right away instead of waiting for a moderation call to finish
+        queued = asyncio.get_running_loop().time()
+        assert await scheduler.submit(Priority.ACK, "ack", lambda: asyncio.sleep(0, "acked")) == "acked"
+        assert asyncio.get_running_loop().time() - queued < 0.1
+
+        release.set()
+        await asyncio.gather(*moderation)
+        assert len(started) == 8 and scheduler.capped_running == 0
+        await scheduler.close()
+
+    run(main())
+
+
+def test_bucket_jobs_run_one_at_a_time():
+    async def main():
+        scheduler = RestScheduler(concurrency=4)
+        running, peak = 0, 0
+
+        async def call(i):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.005)
+            running -= 1
+            return i
+
+        results = await asyncio.gather(*(scheduler.submit(Priority.MODERATION, "send", lambda i=i: call(i), bucket="channel:1")
+                                         for i in range(5)))
+        assert results == [0, 1, 2, 3, 4]
+        assert peak == 1
+        assert not scheduler.parked and not scheduler.busy_buckets
+        await scheduler.close()
+
+    run(main())
+
+
+def test_parked_low_job_behind_busy_bucket_frees_its_slot():
+    async def main():
+        scheduler = RestScheduler(concurrency=3)
+        release, started = asyncio.Event(), []
+        first = asyncio.create_task(scheduler.submit(Priority.NOTIFICATION, "a", lambda: blocked(release, started, "a"), bucket="channel:1"))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(scheduler.submit(Priority.NOTIFICATION, "b", lambda: blocked(release, started, "b"), bucket="channel:1"))
+        await asyncio.sleep(0.01)
+        # b waits on the bucket, not on a low priority slot
+        assert started == ["a"]
+        assert len(scheduler.parked["channel:1"]) == 1
+        assert scheduler.capped_running == 1
+
+        release.set()
+        assert await asyncio.gather(first, second) == ["a", "b"]
+        assert scheduler.capped_running == 0
+        await scheduler.close()
+
+    run(main())
+
+
+def test_close_cancels_running_and_parked_jobs():
+    async def main():
+        scheduler = RestScheduler(concurrency=3)
+        never, started = asyncio.Event(), []
+        running = [asyncio.create_task(scheduler.submit(Priority.FUN, f"running{i}", lambda i=i: blocked(never, started, f"running{i}"),
+                                                        bucket=f"b{i}"))
+                   for i in range(2)]
+        await asyncio.sleep(0.01)
+        capped_parked = asyncio.create_task(scheduler.submit(Priority.FUN, "low", lambda: blocked(never, started, "low")))
+        bucket_parked = asyncio.create_task(scheduler.submit(Priority.ACK, "parked", lambda: blocked(never, started, "parked"), bucket="b0"))
+        await asyncio.sleep(0.01)
+        assert sorted(started) == ["running0", "running1"]
+        assert len(scheduler.capped_parked) == 1 and len(scheduler.parked["b0"]) == 1
+
+        await scheduler.close()
+        for task in (*running, capped_parked, bucket_parked):
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        assert scheduler.depth() == 0 and scheduler.capped_running == 0
+
+    run(main())
@@ -0,0 +1,36 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import pytest
+import settings
+from tests.conftest import ENV
+
+
+@pytest.fixture
+def dotenv(monkeypatch, env_settings):
+    """Stands in for the `.env` file, restoring the test settings afterwards."""
+    values = dict(ENV)
+    monkeypatch.setattr(settings, "dotenv_values", lambda: dict(values))
+    for name in ("REST_SHED_DEPTH", "REVIEWER_ROLEID"):
+        monkeypatch.delenv(name, raising=False)
+    return values
+
+
+def test_environment_wins_at_startup_and_on_reload(dotenv, monkeypatch):
+    dotenv["REST_SHED_DEPTH"] = "20"
+    monkeypatch.setenv("REST_SHED_DEPTH", "80")
+
+    monkeypatch.setattr(settings, "_current", None)
+    assert settings.get().rest_shed_depth == 80
+    assert settings.reload().rest_shed_depth == 80
+
+
+def test_reload_picks_up_dotenv_changes(dotenv):
+    dotenv["REST_SHED_DEPTH"] = "20"
+    dotenv["REVIEWER_ROLEID"] = "7"
+    assert settings.reload().rest_shed_depth == 20
+    assert settings.get().reviewer_role_id == 7
+
+    dotenv["REST_SHED_DEPTH"] = "30"
+    del dotenv["REVIEWER_ROLEID"]
+    assert settings.reload().rest_shed_depth == 30
+    assert settings.get().reviewer_role_id is None
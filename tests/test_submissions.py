@@ -0,0 +1,183 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import asyncio
+import os
+import time
+import types
+import pytest
+import submissions
+from submissions import DAY, SubmissionStore
+
+
+def open_store(path: str) -> SubmissionStore:
+    store = SubmissionStore(path)
+    store.load()
+    return store
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = open_store(os.path.join(tmp_path, "submissions.sqlite3"))
+    monkeypatch.setattr(submissions, "store", store)
+    return store
+
+
+def create(store: SubmissionStore) -> submissions.Submission:
+    submission = store.create(1, 2, "Artist", "Song", "https://example.com/song")
+    store.attach_message(submission.id, 3, 4)
+    return submission
+
+
+def test_claim_is_exclusive_until_released(store):
+    submission = create(store)
+    assert store.claim(submission.id)
+    assert not store.claim(submission.id)
+    store.release(submission.id)
+    assert store.claim(submission.id)
+
+
+def test_reviewed_submission_cant_be_claimed(store):
+    submission = create(store)
+    assert store.claim(submission.id)
+    store.mark_reviewed(submission.id, "accepted", 5)
+    assert submission.id not in store.claims
+    assert not store.claim(submission.id)
+    assert not store.claim(12345)
+
+
+class Reviews:
+    """Stands in for the message edits and archive posts of a review, slow enough for clicks to overlap."""
+
+    def __init__(self, fail: bool = False, fail_after_post: bool = False):
+        self.fail = fail
+        self.fail_after_post = fail_after_post
+        self.applied = []
+        self.replies = []
+
+    async def apply(self, interaction, status, color, rejection_reason, submission):
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise OSError("message edit failed")
+        self.applied.append((interaction.user.id, status))
+        if self.fail_after_post:
+            # What _apply_review does right after the archive post
+            from cogs.forms import SubmissionReviewButtons
+            SubmissionReviewButtons._record(interaction, status, submission)
+            raise OSError("deleting the original message failed")
+
+    async def defer(self, interaction):
+        pass
+
+    async def reply(self, interaction, message):
+        self.replies.append((interaction.user.id, message))
+
+
+def interaction(user_id: int):
+    return types.SimpleNamespace(
+        id=user_id,
+        user=types.SimpleNamespace(id=user_id),
+        client=types.SimpleNamespace(dispatch=lambda *args: None),
+    )
+
+
+def review_view(reviews: Reviews, monkeypatch):
+    from cogs.forms import SubmissionReviewButtons
+    view = SubmissionReviewButtons()
+    monkeypatch.setattr(view, "_apply_review", reviews.apply)
+    monkeypatch.setattr(SubmissionReviewButtons, "_defer", staticmethod(reviews.defer))
+    monkeypatch.setattr(SubmissionReviewButtons, "_reply", staticmethod(reviews.reply))
+    return view
+
+
+def test_concurrent_reviews_apply_once(store, monkeypatch):
+    submission = create(store)
+    reviews = Reviews()
+
+    async def main():
+        view = review_view(reviews, monkeypatch)
+        await asyncio.gather(
+            view._handle_review(interaction(10), "accepted", 0, submission=submission),
+            view._handle_review(interaction(11), "denied", 0, submission=submission),
+        )
+
+    asyncio.run(main())
+    assert reviews.applied == [(10, "accepted")]
+    assert reviews.replies == [(11, "Another reviewer is handling this submission right now.")]
+    assert submission.status == "accepted" and submission.reviewer_id == 10
+    assert not store.claims
+
+
+def test_failed_review_releases_claim(store, monkeypatch):
+    submission = create(store)
+    reviews = Reviews(fail=True)
+
+    async def main():
+        view = review_view(reviews, monkeypatch)
+        await view._handle_review(interaction(10), "accepted", 0, submission=submission)
+
+    asyncio.run(main())
+    assert reviews.replies == [(10, "An error occurred while reviewing the submission. It is still pending, please try again.")]
+    assert submission.pending
+    assert store.claim(submission.id)
+
+
+def test_failure_after_the_archive_post_keeps_the_review(store, monkeypatch):
+    submission = create(store)
+    reviews = Reviews(fail_after_post=True)
+
+    async def main():
+        view = review_view(reviews, monkeypatch)
+        await view._handle_review(interaction(10), "denied", 0, submission=submission)
+        # A second click must not post it to the archive again
+        await view._handle_review(interaction(11), "denied", 0, submission=submission)
+
+    asyncio.run(main())
+    assert reviews.applied == [(10, "denied")]
+    assert submission.status == "denied" and submission.reviewer_id == 10
+    assert not store.claims
+    assert reviews.replies == [
+        (10, "The submission was marked as denied, but an error occurred while finishing the review."),
+        (11, "This submission was already marked as denied by <@10>."),
+    ]
+
+
+def test_store_is_opened_explicitly(tmp_path):
+    path = os.path.join(tmp_path, "data", "submissions.sqlite3")
+    SubmissionStore(path)
+    assert not os.path.exists(path)
+
+
+def test_records_persist_and_ids_are_not_reused(store):
+    first = create(store)
+    second = create(store)
+    store.discard(second.id)
+    store.mark_reviewed(first.id, "accepted", 5)
+
+    reloaded = open_store(store.path)
+    assert list(reloaded.records) == [first.id]
+    assert reloaded.get(first.id).status == "accepted"
+    assert create(reloaded).id == second.id + 1
+
+
+def test_prune_drops_old_reviews(store):
+    old, recent, pending = create(store), create(store), create(store)
+    store.mark_reviewed(old.id, "accepted", 5)
+    store.mark_reviewed(recent.id, "denied", 5)
+    old.reviewed_at = time.time() - 91 * DAY
+    store.save(old.id)
+
+    store.prune()
+    assert set(store.records) == {recent.id, pending.id}
+    assert set(open_store(store.path).records) == {recent.id, pending.id}
+
+
+def test_saves_on_the_loop_are_batched(store):
+    async def main():
+        submission = create(store)
+        store.mark_reviewed(submission.id, "accepted", 5)
+        # Nothing is written until the flush, which the bot also runs on shutdown
+        assert open_store(store.path).get(submission.id) is None
+        await store.close()
+        assert open_store(store.path).get(submission.id).status == "accepted"
+
+    asyncio.run(main())
@@ -0,0 +1,175 @@
+# (C) 2025 Hexa Vibes. Licensed under the MIT License.
+
+import asyncio
+import contextvars
+import json
+import os
+import random
+import settings
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
+from logger import Logger
+
+log = Logger("TRACING")
+
+T = TypeVar("T")
+
+# Seconds finished traces wait in memory before the writer thread appends them to the file
+FLUSH_INTERVAL = 1.0
+# Finished traces kept while the file can't be written, newer ones are dropped past this
+MAX_PENDING = 10000
+
+_current_trace: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar("silliana_trace", default=None)
+
+
+class Trace:
+    """A single traced operation (one interaction, one Twitch poll, ...) and its spans."""
+
+    def __init__(self, name: str, attrs: Dict[str, Any]):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.attrs = attrs
+        # Wall clock only dates the spans, offsets and durations come from perf_counter
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+
+    def add_span(self, name: str, start: float, duration: float, error: Optional[str], attrs: Dict[str, Any]):
+        span = {
+            "trace_id": self.trace_id,
+            "trace": self.name,
+            "span": name,
+            "time": round(self.started_at + start - self.started, 6),
+            "offset_ms": round((start - self.started) * 1000, 3),
+            "duration_ms": round(duration * 1000, 3),
+        }
+        if error:
+            span["error"] = error
+        if attrs:
+            span["attrs"] = attrs
+        self.spans.append(span)
+
+
+class Tracer:
+    """
+    Lightweight span recorder that writes finished traces to a local JSONL file.
+
+    Only a `sample_rate` fraction of traces is recorded; spans opened outside a
+    sampled trace are no-ops, so the untraced path costs a context variable lookup.
+    A finished trace is only queued in memory, a writer thread appends the queue to the
+    file every `FLUSH_INTERVAL` seconds, so the traced code never waits on disk.
+    """
+
+    def __init__(self, path: Optional[str] = None, sample_rate: float = 0.0):
+        self.path = path
+        self.sample_rate = sample_rate
+
+        # Traces finish on the loop and in worker threads alike, hence a lock rather than the loop
+        self.lock = threading.Lock()
+        self.pending: List[Tuple[str, Trace]] = []
+        self.dropped = 0
+        self.thread: Optional[threading.Thread] = None
+        self.stopped = threading.Event()
+
+    @contextmanager
+    def trace(self, name: str, **attrs):
+        """Starts a new trace for the current task and writes it out when the block exits."""
+        if not self.path or random.random() >= self.sample_rate:
+            yield None
+            return
+
+        trace = Trace(name, attrs)
+        token = _current_trace.set(trace)
+        start = time.perf_counter()
+        error = None
+        try:
+            yield trace
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            _current_trace.reset(token)
+            trace.add_span(name, start, time.perf_counter() - start, error, attrs)
+            self._write(trace)
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Times a step of the current trace. Does nothing if no sampled trace is active."""
+        trace = _current_trace.get()
+        if trace is None:
+            yield
+            return
+
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            trace.add_span(name, start, time.perf_counter() - start, error, attrs)
+
+    async def traced(self, name: str, awaitable: Awaitable[T], **attrs) -> T:
+        """Awaits `awaitable` inside a span, e.g. `await traced("delete", message.delete())`."""
+        with self.span(name, **attrs):
+            return await awaitable
+
+    def _write(self, trace: Trace):
+        with self.lock:
+            if len(self.pending) >= MAX_PENDING:
+                self.dropped += 1
+                return
+            # The file is picked now, a trace finished before a settings reload goes to the old one
+            self.pending.append((self.path, trace))
+            if self.thread is None and not self.stopped.is_set():
+                self.thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        while not self.stopped.wait(FLUSH_INTERVAL):
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        """Appends the queued traces to their files. Blocking, the writer thread calls it."""
+        with self.lock:
+            pending, self.pending = self.pending, []
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            log.warn(f"Dropped {dropped} trace(s), the trace file couldn't keep up")
+
+        by_path: Dict[str, List[Trace]] = {}
+        for path, trace in pending:
+            by_path.setdefault(path, []).append(trace)
+        for path, traces in by_path.items():
+            try:
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(span) + "\n" for trace in traces for span in trace.spans))
+            except OSError as e:
+                log.error(f"Failed to write {len(traces)} trace(s) to {path}: {e}")
+
+    async def close(self):
+        """Stops the writer thread once it has written what's still queued."""
+        self.stopped.set()
+        if self.thread is not None:
+            await asyncio.to_thread(self.thread.join, 5)
+            self.thread = None
+
+
+def _apply_settings(old, new):
+    tracer.path = new.trace_file
+    tracer.sample_rate = new.trace_sample_rate
+
+
+tracer = Tracer(path=settings.get().trace_file, sample_rate=settings.get().trace_sample_rate)
+settings.subscribe(_apply_settings)
+trace = tracer.trace
+span = tracer.span
+traced = tracer.traced